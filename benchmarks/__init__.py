@@ -0,0 +1,4 @@
+#!/usr/bin/env python
+
+"""Benchmarks measuring the build, layout and render throughput of compot.
+Run them with ``python -m benchmarks``."""
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+
+"""Runs the benchmarks on a ``HeadlessBackend``, writes the results as JSON
+and compares them against a baseline.
+
+Example:
+
+.. code-block:: bash
+
+   # Record a baseline before changing anything.
+   python -m benchmarks --output benchmarks/baseline.json
+   # Fail if any benchmark got more than 10% slower.
+   python -m benchmarks --baseline benchmarks/baseline.json --threshold 0.1
+   # Also measure how much memory every frame allocates.
+   python -m benchmarks ticking_dashboard --allocations
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+import compot
+from compot import CompotProgram
+from compot.backends import HeadlessBackend
+from compot.composable import COMPOSABLE_MEMOS, MEASUREMENT_CACHE, \
+    Reconciler
+from compot.profiling import PROFILER
+from benchmarks.scenarios import SCENARIOS, Scenario
+
+SIZES = ((80, 24), (160, 48), (240, 70))
+MODES = ('cold', 'retained')
+
+
+def run_scenario(scenario: Scenario, w: int, h: int, mode: str,
+                 frames: int, allocations: bool = False) -> Dict[str, float]:
+    """Renders ``frames`` frames of ``scenario`` and returns the frame rate
+    and the per-frame latencies in milliseconds.
+
+    In the ``cold`` mode every frame is built and rendered from scratch with
+    empty caches. In the ``retained`` mode frames go through a
+    ``Reconciler``, like in ``MainWindow``.
+
+    With ``allocations`` set, as many frames are then rendered again with
+    ``tracemalloc`` tracing, which slows them down too much to be timed. The
+    mean of the peak memory allocated by every frame is returned in KiB, as
+    well as the mean memory every frame allocated that was still in use
+    when it ended.
+    """
+    latencies: List[float] = []
+    peaks: List[int] = []
+    kept: List[int] = []
+    with CompotProgram(HeadlessBackend(h, w)):
+        reconciler = Reconciler()
+
+        def render(frame: int) -> None:
+            if mode == 'cold':
+                COMPOSABLE_MEMOS.clear()
+                MEASUREMENT_CACHE.clear()
+                scenario(frame, w, h).build().render(batch=True)
+            else:
+                MEASUREMENT_CACHE.new_frame()
+                reconciler.render(scenario(frame, w, h))
+
+        for frame in range(frames):
+            start = time.perf_counter()
+            render(frame)
+            latencies.append((time.perf_counter() - start) * 1e3)
+
+        for frame in range(frames, 2 * frames if allocations else 0):
+            tracemalloc.start()
+            try:
+                render(frame)
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            peaks.append(peak)
+            kept.append(current)
+
+    latencies.sort()
+    results = {
+        'fps': 1e3 * len(latencies) / sum(latencies),
+        'mean_ms': statistics.fmean(latencies),
+        'p50_ms': latencies[len(latencies) // 2],
+        'p95_ms': latencies[min(int(len(latencies) * 0.95),
+                                len(latencies) - 1)],
+        'max_ms': latencies[-1],
+    }
+    if allocations:
+        results['alloc_peak_kib'] = statistics.fmean(peaks) / 1024
+        results['alloc_kept_kib'] = statistics.fmean(kept) / 1024
+    return results
+
+
+def run(names: List[str], frames: int, profile: bool = False,
+        allocations: bool = False) -> Dict[str, Any]:
+    results = {}
+    for name in names:
+        for w, h in SIZES:
+            for mode in MODES:
+                key = f'{name}/{w}x{h}/{mode}'
+                PROFILER.reset()
+                results[key] = result = run_scenario(
+                    SCENARIOS[name], w, h, mode, frames, allocations)
+                line = (f'{key:<36} {result["fps"]:>10.1f} fps '
+                        f'{result["p95_ms"]:>9.3f} ms p95')
+                if allocations:
+                    line += f' {result["alloc_peak_kib"]:>9.1f} KiB peak'
+                print(line, file=sys.stderr)
+                if profile:
+                    print(PROFILER.summary(limit=10), file=sys.stderr)
+
+    return {
+        'meta': {
+            'compot': compot.__VERSION__,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'frames': frames,
+        },
+        'results': results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[Tuple[str, float, float]]:
+    """Returns the ``(name, baseline, current)`` mean latencies of every
+    benchmark that got slower than ``threshold`` allows."""
+    regressions = []
+    for key, current in results['results'].items():
+        if (previous := baseline['results'].get(key)) is None:
+            continue
+        if current['mean_ms'] > previous['mean_ms'] * (1 + threshold):
+            regressions.append((key, previous['mean_ms'],
+                                current['mean_ms']))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', nargs='*',
+                        help='the scenarios to run, all by default, out of '
+                             + ', '.join(SCENARIOS))
+    parser.add_argument('--frames', type=int, default=60,
+                        help='the number of frames per benchmark')
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--baseline', help='compare against this file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='the tolerated slowdown, 0.1 being 10%%')
+    parser.add_argument('--profile', action='store_true',
+                        help='print where the time of every benchmark went, '
+                             'which slows the benchmarks down')
+    parser.add_argument('--allocations', action='store_true',
+                        help='also measure the memory allocated per frame')
+    args = parser.parse_args()
+    if unknown := set(args.scenarios) - SCENARIOS.keys():
+        parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+
+    if args.profile:
+        PROFILER.enable()
+    results = run(args.scenarios or list(SCENARIOS), args.frames,
+                  args.profile, args.allocations)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        regressions = compare(results, json.load(baseline_file),
+                              args.threshold)
+    for key, previous, current in regressions:
+        print(f'REGRESSION {key}: {previous:.3f} ms -> {current:.3f} ms',
+              file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
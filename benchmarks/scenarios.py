@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""The trees the benchmarks render. Every scenario is a function of the
+frame index and the screen size returning the ``ComposableT`` to render, so
+that consecutive frames change a little, like a live dashboard does."""
+
+from typing import Callable, Dict
+
+from compot import MeasurementSpec
+from compot.composable import ComposableCursed, ComposableGraph, \
+    ComposableT
+from compot.widgets import Column, LogBuffer, LogView, ProgressBar, \
+    ProgressBarGrid, Row, StatusBar, Text
+
+Scenario = Callable[[int, int, int], ComposableT]
+
+
+def wide_row(frame: int, w: int, h: int) -> ComposableT:
+    """A single ``Row`` of a thousand ``Text`` children."""
+    return Row(
+        tuple(Text(f'{i}|') for i in range(999)) + (Text(f'{frame}'), ),
+        measurement=MeasurementSpec.xywh(0, 0, w, 1))
+
+
+def deep_nesting(frame: int, w: int, h: int) -> ComposableT:
+    """Alternating ``Column`` and ``Row`` chains, ``h`` levels deep."""
+    node = Text(f'Leaf {frame}')
+    for depth in range(h):
+        node = Row((Text('>'), node)) if depth % 2 \
+            else Column((Text(f'Level {depth}'), node))
+    return Column((node, ), measurement=MeasurementSpec.xywh(0, 0, w, h))
+
+
+def _measure_grid(*args, offered, **kwargs):
+    return offered
+
+
+@ComposableCursed(_measure_grid)
+def _PlacedProgressBars(progresses, columns,
+                       measurement=MeasurementSpec.INJECTED()):
+    ms = measurement
+    bar_w = ms.w // columns
+    # Every bar is placed by hand, as a Row gives its whole width to the
+    # first ProgressBar.
+    return ComposableGraph(None, [
+        ProgressBar(p, measurement=MeasurementSpec.xywh(
+            ms.x + (i % columns) * bar_w, ms.y + i // columns, bar_w, 1
+        )).build()
+        for i, p in enumerate(progresses[:columns * ms.h])
+    ])
+
+
+def progressbar_grid(frame: int, w: int, h: int) -> ComposableT:
+    """A screen full of ``ProgressBar`` objects, four per line, with one bar
+    moving per frame."""
+    progresses = [((i * 7) % 97) / 100 for i in range(4 * h)]
+    progresses[frame % len(progresses)] = (frame % 97) / 100
+    return _PlacedProgressBars(progresses, 4,
+                              measurement=MeasurementSpec.xywh(0, 0, w, h))
+
+
+def progressbar_grid_bulk(frame: int, w: int, h: int) -> ComposableT:
+    """The bars of ``progressbar_grid`` drawn by one ``ProgressBarGrid``."""
+    progresses = [((i * 7) % 97) / 100 for i in range(4 * h)]
+    progresses[frame % len(progresses)] = (frame % 97) / 100
+    return ProgressBarGrid(progresses, 4,
+                           measurement=MeasurementSpec.xywh(0, 0, w, h))
+
+
+def statusbar_screen(frame: int, w: int, h: int) -> ComposableT:
+    """A ``Column`` of ``StatusBar`` objects with a ticking counter."""
+    return Column(tuple(
+        StatusBar((
+            Text(f'Service {i}'),
+            Text(f'{frame if i == 0 else i} req/s'),
+            Text('OK'),
+        ))
+        for i in range(h)
+    ), measurement=MeasurementSpec.xywh(0, 0, w, h))
+
+
+def ticking_dashboard(frame: int, w: int, h: int) -> ComposableT:
+    """A thousand ``Text`` cells in fifty ``Row`` objects, a handful of which
+    tick every frame, some of them changing length."""
+    return Column(tuple(
+        Row(tuple(
+            Text(f'{frame % (10 ** (1 + frame // 30 % 3))}'
+                 if (row * 20 + cell) % 257 == 0 else f'{row}:{cell}')
+            for cell in range(20)
+        ))
+        for row in range(50)
+    ), measurement=MeasurementSpec.xywh(0, 0, w, h))
+
+
+_LOG = LogBuffer(capacity=100_000)
+
+
+def log_tail(frame: int, w: int, h: int) -> ComposableT:
+    """A ``LogView`` following a log a thousand lines are appended to
+    every frame, ie. 60k lines a second at 60 frames a second."""
+    _LOG.extend(f'{frame:>8} {i:>4} GET /api/v1/items 200 {i * 7 % 97}ms'
+                for i in range(1000))
+    return LogView(_LOG, measurement=MeasurementSpec.xywh(0, 0, w, h))
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    'wide_row': wide_row,
+    'deep_nesting': deep_nesting,
+    'progressbar_grid': progressbar_grid,
+    'progressbar_grid_bulk': progressbar_grid_bulk,
+    'statusbar_screen': statusbar_screen,
+    'log_tail': log_tail,
+    'ticking_dashboard': ticking_dashboard,
+}
@@ -2,23 +2,29 @@
 
 import curses
 from dataclasses import dataclass
-from typing import Any, Tuple
+from operator import itemgetter
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 from enum import IntEnum
 
+from compot.backends import Backend, CursesBackend, active_backend, \
+    on_backend_change, use_backend
+
 __VERSION__ = '0.2.4'
 
 
-@dataclass
-class Measurement:
+class Measurement(NamedTuple):
     """Represents a Measurement of an object in terms of ``w``idth and
-    ``h``eight in characters.
+    ``h``eight in characters. Measurements are immutable tuples.
     """
     w: int
     h: int
 
     @staticmethod
-    def inf():
-        return Measurement(int(1e6), int(1e6))
+    def inf() -> 'Measurement':
+        return _INF
+
+
+_INF = Measurement(int(1e6), int(1e6))
 
 
 class LayoutSpec(IntEnum):
@@ -38,25 +44,16 @@ class MeasurementSpec(tuple):
     position of an object. Usually, you don't need to use this directly as all
     your widgets will handle it themselves.
     """
+    __slots__ = ()
+
     @staticmethod
     def INJECTED():
-        return MeasurementSpec.xywh(0, 0, 0, 0)
-
-    @property
-    def y(self):
-        return self[2]
-
-    @property
-    def x(self):
-        return self[3]
-
-    @property
-    def h(self):
-        return self[0]
+        return _INJECTED
 
-    @property
-    def w(self):
-        return self[1]
+    y = property(itemgetter(2))
+    x = property(itemgetter(3))
+    h = property(itemgetter(0))
+    w = property(itemgetter(1))
 
     @property
     def curses(self):
@@ -70,6 +67,9 @@ class MeasurementSpec(tuple):
         return f'({self.x}, {self.y}, {self.w}, {self.h})'
 
 
+_INJECTED = MeasurementSpec.xywh(0, 0, 0, 0)
+
+
 class Colors:
     """This enum defines all functional colors used in the program."""
     OK = 8
@@ -128,8 +128,14 @@ class ColorPairs(IntEnum):
 
     @staticmethod
     def get(color: 'ColorPairs') -> int:
-        """Returns the target color for curses."""
-        return curses.color_pair(color)
+        """Returns the target color for curses. The result is cached until
+        the backend changes."""
+        try:
+            return _COLOR_PAIR_ATTRS[color]
+        except KeyError:
+            attr = _COLOR_PAIR_ATTRS[color] = \
+                active_backend().color_pair(color)
+            return attr
 
     @staticmethod
     def init_curses():
@@ -145,61 +151,51 @@ class ColorPairs(IntEnum):
         curses.init_pair(ColorPairs.ERROR, Colors.ERROR, Colors.BG)
 
 
+_COLOR_PAIR_ATTRS: Dict[ColorPairs, int] = {}
+on_backend_change(lambda backend: _COLOR_PAIR_ATTRS.clear())
+
+
 @dataclass
 class StyleSpec:
     color: ColorPairs
 
 
-def wrapper(fxn: 'Composable', framerate: float = 60) -> Any:
+def wrapper(fxn: 'Composable', framerate: float = 60,
+            backend: Optional[Backend] = None) -> Any:
     """This function is a wrapper around curses.wrapper which starts the extra
     features available in this framework. Ensure you use this function instead
     of curses.wrapper.
+
+    ``backend`` defaults to a ``CursesBackend`` whose ``getch`` waits one
+    frame at ``framerate``, see ``CompotProgram``.
     """
-    # Initialize the curses-related settings.
-    stdscr = curses.initscr()
-    curses.noecho()
-    curses.cbreak()
-    stdscr.keypad(True)
-    curses.curs_set(0)
-    curses.start_color()
-    stdscr.timeout(int(1000 / 60))
-
-    try:
-        # Initialize the compots framework settings.
-        Colors.init_curses()
-        ColorPairs.init_curses()
-
-        ret = fxn(stdscr)
-    finally:
-        # Deconstruct everything
-        curses.curs_set(1)
-        curses.nocbreak()
-        stdscr.keypad(False)
-        curses.echo()
-        curses.endwin()
-
-    return ret
+    if backend is None:
+        backend = CursesBackend(timeout=int(1000 / framerate))
+    with CompotProgram(backend) as prog:
+        return fxn(prog.stdscr)
 
 
 class CompotProgram:
-    def __init__(self) -> None:
-        self.stdscr = curses.initscr()
-        curses.noecho()
-        curses.cbreak()
-        self.stdscr.keypad(True)
-        curses.curs_set(0)
-        self.stdscr.timeout(int(1000 / 60))
-
-        curses.start_color()
-        Colors.init_curses()
-        ColorPairs.init_curses()
+    """Starts a ``Backend``, makes it the active one and initializes the
+    compot colors. Use it as a context manager, or call ``close`` to restore
+    the terminal.
+
+    Parameters:
+        backend (Backend): The backend to render with. If ``None``, a
+            ``CursesBackend`` rendering onto the terminal is used.
+    """
+    def __init__(self, backend: Optional[Backend] = None) -> None:
+        self.backend = backend if backend is not None else CursesBackend()
+        self.stdscr = self.backend.start()
+        self._previous_backend = use_backend(self.backend)
+
+        if self.backend.has_colors:
+            Colors.init_curses()
+            ColorPairs.init_curses()
 
     def close(self) -> None:
-        curses.curs_set(1)
-        self.stdscr.keypad(False)
-        curses.nocbreak()
-        curses.echo()
-        curses.endwin()
+        self.backend.stop()
+        use_backend(self._previous_backend)
 
     def __enter__(self) -> 'CompotProgram':
         return self
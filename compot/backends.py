@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+
+"""This module defines the backends compot renders with.
+
+A ``Backend`` owns the screen: it creates the windows widgets are drawn
+into, updates the terminal and reads keys. ``CursesBackend`` renders onto a
+real terminal while ``HeadlessBackend`` renders into an in-memory screen
+that can be read back, which is useful for tests and benchmarks.
+
+The active backend is set with ``use_backend``, which ``CompotProgram`` does
+for you.
+"""
+
+import curses
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from compot.framebuffer import FrameBuffer
+from compot.windows import WINDOW_POOL
+
+
+class Backend(ABC):
+    """The interface every backend implements.
+
+    ``has_colors`` tells ``CompotProgram`` whether the curses colors should
+    be initialized once the backend has started.
+    """
+    has_colors = False
+
+    @abstractmethod
+    def start(self) -> Any:
+        """Starts the backend and returns the screen window, ie. the
+        equivalent of ``stdscr``."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stops the backend, restoring the terminal if there is one."""
+
+    @abstractmethod
+    def newwin(self, h: int, w: int, y: int, x: int) -> Any:
+        """Creates a window. This mirrors ``curses.newwin``."""
+
+    @abstractmethod
+    def doupdate(self) -> None:
+        """Pushes every staged window to the screen. This mirrors
+        ``curses.doupdate``."""
+
+    @abstractmethod
+    def color_pair(self, pair: int) -> int:
+        """Returns the attribute of a color pair. This mirrors
+        ``curses.color_pair``."""
+
+    def resize(self) -> None:
+        """Called when the screen was resized."""
+
+    def fileno(self) -> Optional[int]:
+        """Returns the file descriptor keys are read from, if there is one.
+        Event loops wait for it to be readable instead of polling
+        ``getch``."""
+        return None
+
+
+class CursesBackend(Backend):
+    """Renders onto the terminal with ``curses``.
+
+    Parameters:
+        framebuffer (bool): If set, widgets draw into an off-screen
+            ``FrameBuffer`` and only the cells that changed since the previous
+            frame are written to the terminal.
+        timeout (int): The ``getch`` timeout of the screen in milliseconds.
+    """
+    has_colors = True
+
+    def __init__(self, framebuffer: bool = False,
+                 timeout: int = int(1000 / 60)) -> None:
+        self.framebuffer = framebuffer
+        self.timeout = timeout
+        self.stdscr: Any = None
+        self.buffer: Optional[FrameBuffer] = None
+
+    def start(self) -> Any:
+        self.stdscr = curses.initscr()
+        curses.noecho()
+        curses.cbreak()
+        self.stdscr.keypad(True)
+        curses.curs_set(0)
+        self.stdscr.timeout(self.timeout)
+        curses.start_color()
+
+        if self.framebuffer:
+            self.buffer = FrameBuffer(*self.stdscr.getmaxyx(),
+                                      screen=self.stdscr)
+        return self.stdscr
+
+    def stop(self) -> None:
+        curses.curs_set(1)
+        self.stdscr.keypad(False)
+        curses.nocbreak()
+        curses.echo()
+        curses.endwin()
+
+    def newwin(self, h: int, w: int, y: int, x: int) -> Any:
+        if self.buffer is not None:
+            return self.buffer.newwin(h, w, y, x)
+        return curses.newwin(h, w, y, x)
+
+    def doupdate(self) -> None:
+        if self.buffer is not None:
+            self.buffer.present()
+        else:
+            curses.doupdate()
+
+    def color_pair(self, pair: int) -> int:
+        return curses.color_pair(pair)
+
+    def resize(self) -> None:
+        if self.buffer is not None:
+            self.buffer.resize(*self.stdscr.getmaxyx())
+
+    def fileno(self) -> Optional[int]:
+        return sys.stdin.fileno()
+
+
+class HeadlessScreen:
+    """The ``stdscr`` of a ``HeadlessBackend``. It draws straight into the
+    backend's buffer and returns the keys fed with
+    ``HeadlessBackend.push_keys`` from ``getch``. Like with curses, ``getch``
+    waits for the ``timeout`` if there is no key, but it never blocks
+    indefinitely."""
+    def __init__(self, backend: 'HeadlessBackend') -> None:
+        self._backend = backend
+        self._delay = 0
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        buffer = self._backend.buffer
+        return (buffer.h, buffer.w)
+
+    def getbegyx(self) -> Tuple[int, int]:
+        return (0, 0)
+
+    def getch(self) -> int:
+        keys = self._backend.keys
+        if not keys and self._delay > 0:
+            time.sleep(self._delay / 1000)
+        return keys.popleft() if keys else -1
+
+    def addnstr(self, y: int, x: int, text: str, n: int,
+                attr: int = 0) -> None:
+        self._backend.buffer.draw(y, x, text[:n], attr)
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
+        self._backend.buffer.draw(y, x, text, attr)
+
+    def erase(self) -> None:
+        buffer = self._backend.buffer
+        buffer.fill(0, 0, buffer.h, buffer.w)
+
+    clear = erase
+
+    def timeout(self, delay: int) -> None:
+        self._delay = delay
+
+    def keypad(self, flag: bool) -> None:
+        pass
+
+    def touchwin(self) -> None:
+        pass
+
+    def noutrefresh(self) -> None:
+        pass
+
+    def refresh(self) -> None:
+        self._backend.doupdate()
+
+
+class HeadlessBackend(Backend):
+    """Renders into an in-memory ``h`` by ``w`` screen without a terminal.
+
+    The screen can be read back with ``rows`` and ``attrs``, keys can be fed
+    to ``getch`` with ``push_keys`` and the number of presented frames and
+    written cells are counted in ``frames`` and ``cells_written``.
+
+    Example:
+
+    .. code-block:: python
+
+       with CompotProgram(HeadlessBackend(1, 20)) as prog:
+           Text('Hello').build(
+               measurement=MeasurementSpec.xywh(0, 0, 20, 1)).render()
+           prog.backend.rows()  # ['Hello               ']
+    """
+    def __init__(self, h: int = 24, w: int = 80) -> None:
+        self.buffer = FrameBuffer(h, w)
+        self.screen = HeadlessScreen(self)
+        self.keys: 'deque[int]' = deque()
+        self.frames = 0
+        self.cells_written = 0
+
+    def start(self) -> HeadlessScreen:
+        return self.screen
+
+    def stop(self) -> None:
+        pass
+
+    def newwin(self, h: int, w: int, y: int, x: int) -> Any:
+        return self.buffer.newwin(h, w, y, x)
+
+    def doupdate(self) -> None:
+        self.buffer.present()
+        self.frames += 1
+        self.cells_written += self.buffer.cells_written
+
+    def color_pair(self, pair: int) -> int:
+        # This is what curses.color_pair computes for the default pairs.
+        return (pair << 8) & curses.A_COLOR
+
+    def resize(self, h: Optional[int] = None,
+               w: Optional[int] = None) -> None:
+        """Resizes the screen, clearing it."""
+        self.buffer.resize(h or self.buffer.h, w or self.buffer.w)
+
+    def push_keys(self, keys: Union[str, Iterable[int]]) -> None:
+        """Queues keys to be returned by ``getch``."""
+        for key in keys:
+            self.keys.append(ord(key) if isinstance(key, str) else key)
+
+    def rows(self) -> List[str]:
+        """Returns the screen as one string per row."""
+        return self.buffer.rows()
+
+    def attrs(self, y: int) -> List[int]:
+        """Returns the attribute of every cell of the row ``y``."""
+        w = self.buffer.w
+        return list(self.buffer.attrs[y * w:(y + 1) * w])
+
+
+_ACTIVE: List[Backend] = [CursesBackend()]
+_LISTENERS: List[Callable[[Backend], None]] = []
+
+
+def active_backend() -> Backend:
+    """Returns the backend widgets currently render with."""
+    return _ACTIVE[0]
+
+
+def use_backend(backend: Backend) -> Backend:
+    """Makes ``backend`` the active backend and returns the previous one.
+    Functions registered with ``on_backend_change`` are called afterwards."""
+    previous, _ACTIVE[0] = _ACTIVE[0], backend
+    WINDOW_POOL.use(backend.newwin)
+    for listener in _LISTENERS:
+        listener(backend)
+    return previous
+
+
+def on_backend_change(listener: Callable[[Backend], None]) -> None:
+    """Registers ``listener`` to be called whenever the backend changes, eg.
+    to drop caches holding windows of the old backend."""
+    _LISTENERS.append(listener)
@@ -4,19 +4,30 @@
 used to create widgets and compose widgets from other widgets."""
 
 import _curses
-from dataclasses import dataclass
-from typing import Callable, Any, Dict, List, Optional, Tuple
-from compot.datastructures import GeneralTree
+import inspect
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Callable, Any, Dict, Hashable, List, Optional, \
+    Sequence, Set, Tuple, Union
+from compot.backends import active_backend, on_backend_change
+from compot.datastructures import CacheStats, GeneralTree, Visit
+from compot.display_list import DisplayList, Rect, execute
+from compot.layout import Axis, Constraints, Flex, LinearLayout, NO_FLEX, \
+    NodeLayout, as_flex, layout_linear
+from compot.profiling import PROFILER
+from compot.windows import WINDOW_POOL
 from compot import MeasurementSpec, Measurement
 
 
-@dataclass
 class ComposableT:
     """A ComposableT is a data structure that holds all the information
-    required to construct a ``ComposableGraph`` object. This ``dataclass``
-    holds the name of the requested ``Composable``, the arguments that were
-    passed, the measurement strategy and the ``build`` function (which is in
-    reality the function that actually builds the ``ComposableGraph``.
+    required to construct a ``ComposableGraph`` object. This object holds the
+    name of the requested ``Composable``, the arguments that were passed, the
+    measurement strategy and the ``builder`` (which is in reality the object
+    that actually builds the ``ComposableGraph``, shared by every
+    ``ComposableT`` of the same composable).
 
     Due to how ``compot`` works, upon invoking a ``Composable`` function, this
     object is returned rather than the graph itself. In other words:
@@ -32,12 +43,81 @@ class ComposableT:
 
        # The graph can be accessed with
        my_composable.build()
+
+    ``flex`` is how the ``Row`` or ``Column`` holding the composable sizes
+    it, see ``compot.layout.Flex``.
+
+    A ``ComposableT`` is not modified once created, ``replace`` returns a
+    modified copy.
     """
-    name: str
-    args: Tuple[Any, ...]
-    kwargs: Dict[str, Any]
-    measurement_strategy: Callable[[Any], Measurement]
-    build: Callable[[], 'ComposableGraph']
+    __slots__ = ('name', 'args', 'kwargs', 'measurement_strategy', 'builder',
+                 'flex', '_key', '_key_frame')
+
+    def __init__(self, name: str, args: Tuple[Any, ...],
+                 kwargs: Dict[str, Any],
+                 measurement_strategy: Callable[[Any], Measurement],
+                 builder: Callable[['ComposableT', Tuple[Any, ...],
+                                    Dict[str, Any]], 'ComposableGraph'],
+                 flex: Flex = NO_FLEX) -> None:
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.measurement_strategy = measurement_strategy
+        self.builder = builder
+        self.flex = flex
+        self._key: Any = False
+        self._key_frame: Optional[int] = None
+
+    def build(self, *args: Any, **kwargs: Any) -> 'ComposableGraph':
+        """Builds the ``ComposableGraph`` of this ``ComposableT``. The
+        arguments, usually the ``measurement`` injected by a parent, are
+        added to those the composable was called with."""
+        return self.builder(self, args, kwargs)
+
+    def replace(self, **changes: Any) -> 'ComposableT':
+        """Returns a copy of this ``ComposableT`` with the given fields
+        changed, like ``dataclasses.replace``."""
+        fields = {name: getattr(self, name)
+                  for name in ComposableT.__slots__[:-2]}
+        fields.update(changes)
+        return ComposableT(**fields)
+
+    @property
+    def key(self) -> Optional[Hashable]:
+        """A hashable value identifying what this ``ComposableT`` renders. Two
+        ``ComposableT`` objects with equal keys build identical graphs. This
+        is ``None`` if the arguments cannot be made hashable.
+
+        The key is computed once. If the arguments, or those of the
+        descendants, hold values that can change in place, like lists or
+        ``Versioned`` objects, it is only kept until the next frame of
+        ``MEASUREMENT_CACHE`` starts."""
+        if (key := self._key) is not False:
+            if (frame := self._key_frame) is None:
+                return key
+            if frame == MEASUREMENT_CACHE.frame:
+                _KEYING.mutable = True
+                return key
+
+        mutable, _KEYING.mutable = _KEYING.mutable, False
+        try:
+            key = (self.name, self.measurement_strategy,
+                   _freeze(self.args), _freeze_kwargs(self.kwargs),
+                   self.flex)
+        except TypeError:
+            key = None
+        self._key = key
+        self._key_frame = MEASUREMENT_CACHE.frame if _KEYING.mutable else None
+        _KEYING.mutable |= mutable
+        return key
+
+    def measure(self,
+                offered: Union[Measurement, Constraints] = Measurement.inf()
+                ) -> Measurement:
+        """Measures this ``ComposableT`` within the ``offered`` space or
+        ``Constraints``. Prefer this over calling ``measurement_strategy``
+        directly as the result is shared through ``MEASUREMENT_CACHE``."""
+        return MEASUREMENT_CACHE.measure(self, offered)
 
     def __repr__(self) -> str:
         args = ', '.join(repr(a) for a in ar) \
@@ -54,69 +134,397 @@ ComposableCallable = Callable
 
 ComposableFunction = Callable[[Any, Any], ComposableT]
 
+
+class Versioned:
+    """The base of the mutable objects given to composables, like the state
+    of a widget, that change what the composables render. They are keyed on
+    their identity and their ``version``, which must be incremented on every
+    such change.
+
+    Other objects that are not hashable by value are keyed on their identity
+    alone, so a composable, or any ``Row`` or ``Column`` holding it, that is
+    built again after such an object changed in place is reused as it was.
+    """
+    version = 0
+
+
+class _Keying(threading.local):
+    # Whether a value that can change in place was frozen into the key being
+    # computed.
+    mutable = False
+
+_KEYING = _Keying()
+
+
+# The types whose values are frozen as they are.
+_ATOMS = frozenset((str, int, float, bool, type(None)))
+
+
+def _freeze(value: Any) -> Hashable:
+    """Returns a hashable stand-in for ``value`` that compares equal whenever
+    the values would render the same.
+
+    Containers are converted to tuples, mutable ``dataclass`` instances to
+    their type and field values, ``ComposableT`` objects to their ``key`` and
+    ``Versioned`` objects to themselves and their version. Anything else must
+    be hashable on its own, otherwise a ``TypeError`` is raised. Freezing a
+    value that can change in place is recorded in ``_KEYING``.
+    """
+    # Most arguments are plain strings and numbers, or tuples of them.
+    if (kind := type(value)) in _ATOMS:
+        return value
+    if kind is tuple and all(map(_ATOMS.__contains__, map(type, value))):
+        return value
+    if kind is ComposableT:
+        if (key := value.key) is None:
+            raise TypeError(f'{value.name} cannot be frozen.')
+        return key
+    if isinstance(value, (str, int, float, type(None), Constraints, Flex)):
+        return value
+    if isinstance(value, Versioned):
+        _KEYING.mutable = True
+        return (value, value.version)
+    if isinstance(value, tuple):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, list):
+        _KEYING.mutable = True
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        _KEYING.mutable = True
+        return _freeze_kwargs(value)
+    if isinstance(value, frozenset):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, set):
+        _KEYING.mutable = True
+        return frozenset(_freeze(v) for v in value)
+    if is_dataclass(value) and not isinstance(value, type):
+        if value.__dataclass_params__.frozen:
+            # Frozen dataclasses compare and hash by value already.
+            hash(value)
+            return value
+        _KEYING.mutable = True
+        return (type(value),
+                tuple(_freeze(getattr(value, f.name)) for f in fields(value)))
+
+    hash(value)
+    return value
+
+
+def _freeze_kwargs(kwargs: Dict[str, Any]) -> Hashable:
+    """Freezes the items of ``kwargs``, a dictionary that is not modified
+    once made, such as the keyword arguments of a call."""
+    if not kwargs:
+        return ()
+    return tuple(sorted((k, _freeze(v)) for k, v in kwargs.items()))
+
+
 class ComposableMemos:
-    """This class holds memoized Composables. The goal of this class is to
-    provide a seamless interface.
-
-    Todo:
-        Realistically the implementation of this class is a good bit dumb (and
-        I'm being really polite to myself here).
-
-        There are two ways to envision memoization in compot that I currently
-        see. One way is to do this in ``ComposableGraph``, however, that would
-        require the graph to be a bit rewritten and, more importantly, would
-        mean that each ``ComposableCursed`` would also have to be rewritten to
-        facilitate the graph conditionally rebuilding children only if they
-        aren't memoized. The problem with this is that currently all
-        ``ComposableCursed`` objects actually call the ``build`` method of a
-        ``ComposableT`` meaning that some changes to all widgets would be
-        necessary.
-
-        The other way is to keep an implementation that tracks each memoized
-        type say (Text) and memoizes new instances unconditionally, keeping it
-        in a CircularArray. The neat thing about this is that we end up caching
-        not only Texts that have the same args and kwargs, but also their
-        previous instances which could be very useful if a Text morphs from one
-        state into another repeatedly. Imagine something like:
-
-        .. code-block:: python
-
-           @Composable
-           def BlinkingText(state):
-                if state.is_blinked:
-                    return Text(state.text.is_on_text)
-                else:
-                    return Text(state.text.is_off_text)
-
-        In this somewhat forced example you can see that it would be very
-        useful for the Text to keep its previous state. I presume caching
-        values like this would become very useful for when elements repeat
-        their state (any sort of animation).
+    """This class holds memoized ``ComposableGraph`` objects of
+    ``ComposableCursed`` widgets created with ``memo=True``.
+
+    Entries are keyed on the name of the composable, its arguments, the values
+    of its keyword arguments and the ``MeasurementSpec`` injected by its
+    parent, so a widget that is built again with identical inputs reuses the
+    previously built graph (and all its curses windows) instead of drawing
+    itself again.
+
+    The memos are a bounded LRU cache. Once ``maxsize`` entries are stored the
+    least recently used one is evicted. Setting ``maxsize`` to ``0`` disables
+    memoization altogether. Widgets whose arguments cannot be made hashable
+    are simply built every time and counted as a bypass in ``stats``.
     """
-    ACCESS_COUNT_THRESHOLD = 100
+    DEFAULT_MAXSIZE = 1024
 
-    def __init__(self) -> None:
-        self._access_count = 0
-        self._dict: Dict[int, Any] = {}
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self._dict: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._maxsize = maxsize
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._dict)
 
-    def get_memo(self, c_name, c_args, c_kwargs) -> Any:
-        self._access_count += 1
-        if self._access_count > self.__class__.ACCESS_COUNT_THRESHOLD:
-            self.clear()
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
 
-        return self._dict.get(self.c_hash(c_name, c_args, c_kwargs))
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError('The memo size cannot be negative.')
+        self._maxsize = maxsize
+        self._trim()
 
-    def c_hash(self, c_name, c_args, c_kwargs):
-        return hash((c_name, c_args, frozenset(c_kwargs)))
+    def c_hash(self, composable: 'ComposableT', c_args, c_kwargs
+               ) -> Optional[Hashable]:
+        """Returns the key the given ``build`` call is stored under or
+        ``None`` if the call cannot be memoized.
 
-    def put_memo(self, c_name, c_args, c_kwargs, memo) -> None:
-        self._dict[self.c_hash(c_name, c_args, c_kwargs)] = memo
+        Only the size of an injected ``MeasurementSpec`` is part of the key,
+        its position is given by ``origin``. A memoized graph can then be
+        moved rather than built again.
+        """
+        if (key := composable.key) is None:
+            return None
+        try:
+            return (key, _freeze(c_args), tuple(sorted(
+                (k, (v.w, v.h) if isinstance(v, MeasurementSpec)
+                    else _freeze(v))
+                for k, v in c_kwargs.items())))
+        except TypeError:
+            return None
+
+    @staticmethod
+    def origin(c_kwargs) -> Tuple[int, int]:
+        """Returns the position of the ``MeasurementSpec`` injected with
+        ``c_kwargs``."""
+        if isinstance(ms := c_kwargs.get('measurement'), MeasurementSpec):
+            return (ms.x, ms.y)
+        return (0, 0)
+
+    def get_memo(self, key: Optional[Hashable]) -> Any:
+        if key is None or self._maxsize == 0:
+            self.stats.bypasses += 1
+            return None
+
+        try:
+            memo = self._dict[key]
+        except KeyError:
+            self.stats.misses += 1
+            return None
+
+        self._dict.move_to_end(key)
+        self.stats.hits += 1
+        return memo
+
+    def put_memo(self, key: Optional[Hashable], memo) -> None:
+        if key is None or self._maxsize == 0:
+            return
+
+        self._dict[key] = memo
+        self._dict.move_to_end(key)
+        self._trim()
+
+    def _trim(self) -> None:
+        while len(self._dict) > self._maxsize:
+            self._dict.popitem(last=False)
+            self.stats.evictions += 1
 
     def clear(self):
         self._dict.clear()
-        self._access_count = 0
 
 COMPOSABLE_MEMOS = ComposableMemos()
+# Memoized graphs hold windows of the backend they were rendered with.
+on_backend_change(lambda backend: COMPOSABLE_MEMOS.clear())
+
+
+class _Builds(threading.local):
+    """The number of builds in progress on a thread."""
+    count = 0
+
+
+class MeasurementCache:
+    """This class caches the results of measurement strategies.
+
+    Parents measure their children while laying out, and ``FIT_CONTENT``
+    parents measure their grandchildren on top of that, so the same
+    ``ComposableT`` tends to be measured many times with the same offered
+    ``Measurement``. Results are keyed on the structure of the ``ComposableT``
+    (see ``ComposableT.key``) and the ``Constraints`` it is measured with, an
+    offered ``Measurement`` standing for loose constraints.
+
+    ``ComposableT`` objects whose arguments cannot be hashed are keyed on
+    their identity instead, which is only valid for the current frame. Every
+    top-level build starts a new frame, as does ``new_frame``, which drops
+    those entries and, by default, every other one, so that objects changed
+    in place between frames are measured again. With ``cross_frame`` set,
+    structurally keyed entries survive between frames in a LRU of ``maxsize``
+    entries.
+
+    The ``LinearLayout`` of the children of a ``Row`` or a ``Column`` is also
+    kept for the frame, so that it is computed once while the container is
+    measured and reused when it is built.
+
+    Measurements missing from the cache are looked up in the ``NodeLayout``
+    objects of the live nodes built by a ``Reconciler``, which are not
+    dropped by ``new_frame`` as they last as long as their nodes. While a
+    ``Reconciler`` is building, every measurement is recorded in the layout
+    of the node being built, unless a measurement strategy made it. Tight
+    constraints are never measured.
+    """
+    DEFAULT_MAXSIZE = 4096
+
+    def __init__(self,
+                 maxsize: int = DEFAULT_MAXSIZE,
+                 cross_frame: bool = False) -> None:
+        self._dict: 'OrderedDict[Hashable, Measurement]' = OrderedDict()
+        self._frame_dict: Dict[Tuple[int, int, int],
+                               Tuple['ComposableT', Measurement]] = {}
+        self._retained: Dict[Hashable, 'weakref.ref[NodeLayout]'] = {}
+        self._layouts: Dict[Tuple[int, Constraints, Axis, bool, bool],
+                            Tuple[Sequence[Any], LinearLayout]] = {}
+        self.maxsize = maxsize
+        self.cross_frame = cross_frame
+        self.stats = CacheStats()
+        self._builds = _Builds()
+        # The number of the current frame.
+        self.frame = 0
+
+    def __len__(self) -> int:
+        return len(self._dict) + len(self._frame_dict)
+
+    def measure(self, composable: 'ComposableT',
+                offered: Union[Measurement, Constraints]) -> Measurement:
+        """Returns the measurement of ``composable`` for the ``offered``
+        space or ``Constraints``, running its measurement strategy only on a
+        cache miss."""
+        if not isinstance(offered, Constraints):
+            offered = Constraints.loose(offered)
+        elif offered.is_tight:
+            return offered.biggest
+        if (key := composable.key) is None:
+            return self.__measure_by_identity(composable, offered)
+
+        key = (key, offered)
+        reconciler = Reconciler.active()
+        if (measurement := self._dict.get(key)) is not None:
+            self._dict.move_to_end(key)
+            self.stats.hits += 1
+        else:
+            if (ref := self._retained.get(key)) is not None \
+                    and (layout := ref()) is not None:
+                self.stats.hits += 1
+                measurement = layout.measurements[key]
+            elif reconciler is None:
+                self.stats.misses += 1
+                measurement = _measure(
+                    composable.name, composable.measurement_strategy,
+                    composable.args, offered, composable.kwargs)
+            else:
+                self.stats.misses += 1
+                reconciler.measuring += 1
+                try:
+                    measurement = _measure(
+                        composable.name, composable.measurement_strategy,
+                        composable.args, offered, composable.kwargs)
+                finally:
+                    reconciler.measuring -= 1
+            self._dict[key] = measurement
+            while len(self._dict) > self.maxsize:
+                self._dict.popitem(last=False)
+                self.stats.evictions += 1
+
+        # Measurements made by measurement strategies are recorded by the
+        # children that make them again when they are built.
+        if reconciler is not None and not reconciler.measuring:
+            reconciler.record(key, measurement)
+        return measurement
+
+    def __measure_by_identity(self, composable: 'ComposableT',
+                              offered: Constraints) -> Measurement:
+        key = (id(composable), offered)
+        try:
+            measurement = self._frame_dict[key][1]
+        except KeyError:
+            self.stats.misses += 1
+            measurement = _measure(
+                composable.name, composable.measurement_strategy,
+                composable.args, offered, composable.kwargs)
+            # The composable is stored alongside its measurement to keep it
+            # alive, otherwise its id could be reused within the frame.
+            self._frame_dict[key] = (composable, measurement)
+            return measurement
+
+        self.stats.hits += 1
+        return measurement
+
+    def layout_linear(self, children: Sequence['ComposableT'],
+                      constraints: Constraints, axis: Axis,
+                      fill: bool = False,
+                      space_between: bool = False) -> LinearLayout:
+        """Returns ``compot.layout.layout_linear`` of ``children``, which is
+        only computed once per frame. The sizes of the children are recorded
+        by a ``Reconciler`` building their container as if they had been
+        measured again."""
+        key = (id(children), constraints, axis, fill, space_between)
+        if (cached := self._layouts.get(key)) is not None:
+            layout = cached[1]
+            if (reconciler := Reconciler.active()) is not None \
+                    and not reconciler.measuring:
+                for child, (_, _, w, h), child_constraints in zip(
+                        children, layout.placements, layout.constraints):
+                    if not child_constraints.is_tight \
+                            and (child_key := child.key) is not None:
+                        reconciler.record((child_key, child_constraints),
+                                          Measurement(w, h))
+            return layout
+
+        layout = layout_linear(children, constraints, axis, fill,
+                               space_between)
+        # The children are kept alive so that their id is not reused within
+        # the frame.
+        self._layouts[key] = (children, layout)
+        return layout
+
+    def reference(self, layout: NodeLayout) -> 'weakref.ref[NodeLayout]':
+        """Returns a weak reference to ``layout`` to ``retain`` its
+        measurements with. They are forgotten once ``layout`` is
+        collected."""
+        measurements, retained = layout.measurements, self._retained
+
+        def forget(ref: 'weakref.ref[NodeLayout]') -> None:
+            for key in measurements:
+                if retained.get(key) is ref:
+                    del retained[key]
+        return weakref.ref(layout, forget)
+
+    def retain(self, key: Hashable, ref: 'weakref.ref[NodeLayout]') -> None:
+        """Keeps the measurement recorded under ``key`` in the layout ``ref``
+        refers to available, until a later one replaces it."""
+        self._retained[key] = ref
+
+    def start_build(self) -> None:
+        """Called when a build starts. A top-level build starts a new
+        frame."""
+        if not self._builds.count:
+            self.new_frame()
+        self._builds.count += 1
+
+    def end_build(self) -> None:
+        self._builds.count -= 1
+
+    def new_frame(self) -> None:
+        """Drops all the measurements that are only valid for one frame."""
+        self.frame += 1
+        self._frame_dict.clear()
+        self._layouts.clear()
+        if not self.cross_frame:
+            self._dict.clear()
+
+    def clear(self) -> None:
+        self._frame_dict.clear()
+        self._layouts.clear()
+        self._dict.clear()
+        self._retained.clear()
+
+MEASUREMENT_CACHE = MeasurementCache()
+
+
+def _measure(name: str, measurement_strategy: Callable, args: Tuple,
+             constraints: Constraints, kwargs: Dict[str, Any]) -> Measurement:
+    """Runs ``measurement_strategy``, offering it the largest size
+    ``constraints`` allow and constraining its result. It is timed when
+    ``PROFILER`` is enabled."""
+    offered = constraints.biggest
+    if not PROFILER.enabled:
+        return constraints.constrain(
+            measurement_strategy(*args, offered=offered, **kwargs))
+
+    started = PROFILER.start()
+    try:
+        return constraints.constrain(
+            measurement_strategy(*args, offered=offered, **kwargs))
+    finally:
+        PROFILER.stop('measure', name, started)
 
 
 def Composable(composable: ComposableFunction) -> Callable:
@@ -141,12 +549,178 @@ def Composable(composable: ComposableFunction) -> Callable:
     This code example wraps the ``Row`` elements that are built from your
     ``content`` in another ``Row``, such that the outer ``Row`` spaces between
     the elements as much as it can.
+
+    The ``flex`` keyword argument is not passed to the function, it sets the
+    ``flex`` of the ``ComposableT`` it returns.
     """
-    def wrapper(*args: Any, **kwargs: Any) -> ComposableT:
-        return composable(*args, **kwargs)
+    def wrapper(*args: Any, flex: Any = None, **kwargs: Any) -> ComposableT:
+        composable_t = compose(*args, **kwargs)
+        if flex is not None:
+            composable_t = composable_t.replace(flex=as_flex(flex))
+        return composable_t
+
+    def compose(*args: Any, **kwargs: Any) -> ComposableT:
+        if not PROFILER.enabled:
+            return composable(*args, **kwargs)
+
+        started = PROFILER.start()
+        try:
+            return composable(*args, **kwargs)
+        finally:
+            PROFILER.stop('compose', composable.__name__, started)
     return wrapper
 
 
+class _CursedBuilder:
+    """Builds the ``ComposableT`` objects of a ``ComposableCursed``
+    composable, see ``ComposableT.build``. A single builder is shared by all
+    of them."""
+    __slots__ = ('composable', 'name', 'measurement_strategy', 'memo',
+                 'takes_constraints')
+
+    def __init__(self, composable: ComposableF,
+                 measurement_strategy: MeasurementStrat, memo: bool) -> None:
+        self.composable = composable
+        self.name = composable.__name__
+        self.measurement_strategy = measurement_strategy
+        self.memo = memo
+        self.takes_constraints = \
+            'constraints' in inspect.signature(composable).parameters
+
+    def __call__(self, composable_t: ComposableT, cargs: Tuple[Any, ...],
+                 ckwargs: Dict[str, Any]) -> 'ComposableGraph':
+        MEASUREMENT_CACHE.start_build()
+        try:
+            if not PROFILER.enabled:
+                return self.build_reconciled(composable_t, cargs, ckwargs)
+
+            started = PROFILER.start()
+            try:
+                return self.build_reconciled(composable_t, cargs, ckwargs)
+            finally:
+                PROFILER.stop('build', self.name, started)
+        finally:
+            MEASUREMENT_CACHE.end_build()
+
+    def build_reconciled(self, composable_t: ComposableT,
+                         cargs: Tuple[Any, ...],
+                         ckwargs: Dict[str, Any]) -> 'ComposableGraph':
+        memo = self.memo
+        reconciler = Reconciler.active()
+        previous = reconciler.previous() if reconciler is not None else None
+        # A subtree built again by the same call is kept without computing
+        # its key, unless that key holds values that can change in place.
+        if previous is not None and previous.source is not None \
+                and previous.source[0] is composable_t \
+                and composable_t._key_frame is None \
+                and previous.source[1:] == (cargs, ckwargs):
+            return reconciler.keep(previous)
+
+        key = COMPOSABLE_MEMOS.c_hash(composable_t, cargs, ckwargs) \
+            if memo or reconciler is not None \
+            else None
+        origin = ComposableMemos.origin(ckwargs)
+        node_key = (key, origin) if key is not None else None
+
+        if reconciler is not None:
+            if node_key is not None and previous is not None \
+                    and previous.key == node_key:
+                return reconciler.keep(previous)
+            # A subtree that only moved is moved rather than built.
+            if node_key is not None and previous is not None \
+                    and previous.key is not None \
+                    and previous.key[0] == key \
+                    and (built := self.relocate(previous, origin)) \
+                    is not None:
+                reconciler.stats.hits += 1
+                return built
+            reconciler.stats.misses += 1
+
+        if memo:
+            if (built := self.reuse_memo(key, origin)) is not None:
+                return built
+
+        if reconciler is None:
+            built, _, _ = self.build_fresh(composable_t, cargs, ckwargs)
+        else:
+            reconciler.descend(previous)
+            try:
+                built, constraints, size = \
+                    self.build_fresh(composable_t, cargs, ckwargs)
+            finally:
+                layout = reconciler.ascend()
+            layout.constraints, layout.size = constraints, size
+            built.layout = layout
+
+        built.key = node_key
+        built.name = self.name
+        if node_key is not None:
+            built.source = (composable_t, cargs, ckwargs)
+        if memo:
+            COMPOSABLE_MEMOS.put_memo(key, built)
+        return built
+
+    @staticmethod
+    def reuse_memo(key: Optional[Hashable], origin: Tuple[int, int]
+                   ) -> Optional['ComposableGraph']:
+        if (built := COMPOSABLE_MEMOS.get_memo(key)) is None:
+            return None
+
+        if built.key[1] == origin:
+            built.touch()
+            return built
+
+        if (built := _CursedBuilder.relocate(built, origin)) is not None:
+            COMPOSABLE_MEMOS.put_memo(key, built)
+        return built
+
+    @staticmethod
+    def relocate(built: 'ComposableGraph', origin: Tuple[int, int]
+                 ) -> Optional['ComposableGraph']:
+        (_, (x, y)) = built.key
+        try:
+            return built.relocated(origin[0] - x, origin[1] - y)
+        except ValueError:
+            return None
+
+    def build_fresh(self, composable_t: ComposableT, cargs: Tuple[Any, ...],
+                    ckwargs: Dict[str, Any]
+                    ) -> Tuple['ComposableGraph', Constraints, Measurement]:
+        """Measures and builds ``composable_t``. Returns the graph with the
+        constraints it was built with and its size."""
+        new_kwargs = {**composable_t.kwargs, **ckwargs}
+        constraints = new_kwargs.pop('constraints', None)
+        try:
+            old_measurements = new_kwargs['measurement']
+        except KeyError as k_err:
+            raise ValueError(
+                f'{self.name} was called without a measurement. This likely '
+                'means you are using a top-level widget without specifying '
+                'its measurements.') from k_err
+        if constraints is None:
+            constraints = Constraints.loose(old_measurements)
+        if constraints.is_tight:
+            measurements = constraints.biggest
+        elif cargs or len(ckwargs) > ('measurement' in ckwargs) \
+                + ('constraints' in ckwargs):
+            measurements = _measure(
+                self.name, self.measurement_strategy,
+                composable_t.args + cargs, constraints, new_kwargs)
+        else:
+            measurements = composable_t.measure(constraints)
+        new_kwargs['measurement'] = MeasurementSpec.xywh(
+            old_measurements.x,
+            old_measurements.y,
+            min(measurements.w, old_measurements.w),
+            min(measurements.h, old_measurements.h)
+        )
+        if self.takes_constraints:
+            new_kwargs['constraints'] = constraints
+
+        return (self.composable(*composable_t.args, **new_kwargs),
+                constraints, measurements)
+
+
 def ComposableCursed(
     measurement_strategy: Callable,
     memo: bool = False
@@ -157,69 +731,409 @@ def ComposableCursed(
 
     Please consult the documentation for more information.
 
+    The measurement strategy is offered the largest size the composable may
+    take and its result is constrained to the ``Constraints`` the composable
+    is measured with. Parents may build a composable with the ``constraints``
+    they measured it with along with its ``measurement``, which then only
+    clips the measured size. Tight constraints set the size without measuring
+    it. Composables taking a ``constraints`` parameter are given them, to lay
+    their children out like they did while being measured.
+
     Parameters:
         measurement_strategy: The function used to measure the composable.
         memo (bool): A flag indicating whether this object should be memoized.
     """
     def factory(composable: ComposableF) -> Callable:
-        def wrapper(*args: Any, **kwargs: Any) -> ComposableT:
-            def build_composable(*cargs: Any, **ckwargs):
-                pushed_args = args + cargs
-                pushed_kwargs = {**kwargs, **ckwargs}
-                try:
-                    old_measurements = pushed_kwargs['measurement']
-                except KeyError as k_err:
-                    raise ValueError(
-                        f'{composable.__name__} was called without a '
-                        'measurement. This likely means you are using a '
-                        'top-level widget without specifying its '
-                        'measurements.') from k_err
-                measurements = measurement_strategy(
-                    *pushed_args, offered=old_measurements, **pushed_kwargs)
-                new_kwargs = {
-                    **pushed_kwargs,
-                    'measurement': MeasurementSpec.xywh(
-                        old_measurements.x,
-                        old_measurements.y,
-                        measurements.w,
-                        measurements.h
-                    )
-                }
-                new_args = args
-
-                built = composable(*new_args, **new_kwargs)
-                return built
+        builder = _CursedBuilder(composable, measurement_strategy, memo)
 
-            composable_t = ComposableT(
-                name=composable.__name__,
-                args=args,
-                kwargs=kwargs,
-                measurement_strategy=measurement_strategy,
-                build=build_composable,
-            )
-            return composable_t
+        def wrapper(*args: Any, flex: Any = None,
+                    **kwargs: Any) -> ComposableT:
+            return ComposableT(builder.name, args, kwargs,
+                               measurement_strategy, builder, as_flex(flex))
 
         return wrapper
     return factory
 
 
-class ComposableGraph:
-    """Represents a graph that holds all the curses windows to be rendered."""
+class ComposableGraph(GeneralTree['_curses._CursesWindow']):
+    """Represents a graph that holds all the curses windows to be rendered.
+
+    Widgets describe what they draw with a ``DisplayList`` of ``ops``. The
+    window a node is drawn into is only created, from ``WINDOW_POOL``, the
+    first time the node is rendered. Nodes may also be given a ready-made
+    window instead.
+
+    Every node remembers the ``key`` of the build call that created it, which
+    the ``Reconciler`` uses to decide whether the node can be reused, along
+    with the ``source`` of that call, ie. the ``ComposableT`` and the
+    arguments it was built with, and whether it is ``dirty``, ie. whether it
+    was not rendered since it was built. A clean node always has a clean
+    subtree. ``name`` is the name of the composable that built the node, as
+    reported by ``PROFILER``.
+    ``layout`` is the ``NodeLayout`` of nodes built by a ``Reconciler``.
+
+    Unlike trees, graphs compare by identity.
+    """
+    __slots__ = ('ops', 'key', 'source', 'name', 'dirty', 'layout',
+                 '__display_list', '__weakref__')
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+    __repr__ = object.__repr__
+
     def __init__(self,
                  me: Optional['_curses._CursesWindow'],
-                 children: List['ComposableGraph'] = []) -> None:
-        # Man generics suck in python
-        self.__ds_tree = GeneralTree['_curses._CursesWindow'](me, children)
+                 children: List['ComposableGraph'] = [],
+                 ops: DisplayList = DisplayList()) -> None:
+        super().__init__(me, children)
+        self.ops = ops
+        self.key: Optional[Hashable] = None
+        self.source: Optional[Tuple[ComposableT, Tuple[Any, ...],
+                                    Dict[str, Any]]] = None
+        self.name: Optional[str] = None
+        self.dirty = True
+        self.layout: Optional[NodeLayout] = None
+        self.__display_list: Optional[DisplayList] = None
 
     def __str__(self) -> str:
-        return (f'ComposableGraph<node={self.__ds_tree.node}, '
+        return (f'ComposableGraph<node={self.node}, '
                 f'children={self.apply(lambda t: str(t))}>')
 
-    def apply(self, predicate):
-        return self.__ds_tree.apply(predicate)
+    @property
+    def window(self) -> Optional['_curses._CursesWindow']:
+        return self.node
+
+    def display_list(self) -> DisplayList:
+        """Returns the ops of the whole graph flattened in drawing order.
+        The result is cached, graphs are not modified once built."""
+        for graph in self.postorder(
+                prune=lambda graph: graph.__display_list is not None):
+            if graph.__display_list is None:
+                display_list = graph.ops
+                for child in graph.children:
+                    display_list += child.__display_list
+                graph.__display_list = display_list
+        return self.__display_list
+
+    def relocated(self, dx: int, dy: int) -> 'ComposableGraph':
+        """Returns a copy of the graph moved by ``dx`` columns and ``dy``
+        rows. Raises ``ValueError`` if the graph holds windows that were not
+        made from its ops, as those cannot be moved. Graphs of any depth can
+        be relocated."""
+        # The copied children of every graph being copied.
+        copies: List[List[ComposableGraph]] = [[]]
+
+        def enter(graph: ComposableGraph) -> None:
+            if graph.window is not None and not graph.ops:
+                raise ValueError('Only graphs made of ops can be relocated.')
+            copies.append([])
+
+        def leave(graph: ComposableGraph) -> None:
+            copy = ComposableGraph(None, copies.pop(),
+                                   graph.ops.translate(dx, dy))
+            if graph.key is not None:
+                key, (x, y) = graph.key
+                copy.key = (key, (x + dx, y + dy))
+            copy.name = graph.name
+            copy.layout = graph.layout
+            copies[-1].append(copy)
+
+        self.visit(enter, leave)
+        return copies[0][0]
+
+    def touch(self):
+        """Marks every window in the graph as changed so that the next
+        ``render`` redraws it even if its contents were not modified."""
+        for graph in self.preorder():
+            if window := graph.node:
+                window.touchwin()
+            graph.dirty = True
+
+    def render(self, only_dirty: bool = False, batch: bool = False,
+               doupdate: Optional[Callable[[], None]] = None,
+               erase: Sequence[Rect] = ()) -> int:
+        """Renders the graph onto the screen.
+
+        Parameters:
+            only_dirty (bool): If set, subtrees that were already rendered
+                are skipped.
+            batch (bool): If set, every window is only staged with
+                ``noutrefresh`` and the terminal is updated once with
+                ``doupdate`` of the active backend at the end, rather than
+                once per window.
+            doupdate: Replaces the ``doupdate`` of the active backend for
+                batched renders.
+            erase (Sequence[Rect]): Rectangles of the screen blanked before
+                the graph is drawn, eg. the ones nodes that are gone were
+                drawn in.
+
+        Returns:
+            int: The number of physical screen updates performed.
+        """
+        if not PROFILER.enabled:
+            return self.__render(only_dirty, batch, doupdate, erase)
+        try:
+            return self.__render(only_dirty, batch, doupdate, erase)
+        finally:
+            PROFILER.end_frame()
+
+    def __render(self, only_dirty: bool, batch: bool,
+                 doupdate: Optional[Callable[[], None]],
+                 erase: Sequence[Rect]) -> int:
+        if not batch:
+            stage = lambda w: w.refresh()
+            return _erase(erase, stage) + self._stage(only_dirty, stage)
+
+        stage = lambda w: w.noutrefresh()
+        if _erase(erase, stage) + self._stage(only_dirty, stage) == 0:
+            return 0
+        if not PROFILER.enabled:
+            (doupdate or active_backend().doupdate)()
+            return 1
+
+        started = PROFILER.start()
+        try:
+            (doupdate or active_backend().doupdate)()
+        finally:
+            PROFILER.stop('render', 'doupdate', started)
+        return 1
+
+    def _stage(self, only_dirty: bool, stage: Callable[[Any], None]) -> int:
+        """Stages the windows of the graph in drawing order, walking it with
+        ``visit``, and returns how many were staged."""
+        staged = 0
+        prune = Visit.PRUNE
+
+        def enter(graph: ComposableGraph) -> Optional[Visit]:
+            nonlocal staged
+            if only_dirty and not graph.dirty:
+                return prune
+            if graph.ops and graph.node is None:
+                graph.__materialize()
+            graph.dirty = False
+            if window := graph.node:
+                stage(window)
+                staged += 1
+            return None
+
+        if not PROFILER.enabled:
+            self.visit(enter)
+            return staged
+
+        # Every node is timed along with its subtree.
+        starts: List[Optional[Tuple[str, float]]] = []
+
+        def enter_timed(graph: ComposableGraph) -> Optional[Visit]:
+            if only_dirty and not graph.dirty:
+                starts.append(None)
+                return prune
+            starts.append((graph.name or 'ComposableGraph', PROFILER.start()))
+            return enter(graph)
+
+        def leave(graph: ComposableGraph) -> None:
+            if (start := starts.pop()) is not None:
+                PROFILER.stop('render', *start)
+
+        try:
+            self.visit(enter_timed, leave)
+        finally:
+            # The nodes a failed render was in are left all the same.
+            while starts:
+                leave(self)
+        return staged
+
+    def __materialize(self) -> None:
+        x, y, w, h = self.ops.bounds
+        window = WINDOW_POOL.acquire(h, w, y, x)
+        execute(self.ops, window, -x, -y)
+        WINDOW_POOL.bind(self, window)
+        self.node = window
+
+
+def _window_rect(window: Any) -> Rect:
+    (h, w), (y, x) = window.getmaxyx(), window.getbegyx()
+    return Rect(x, y, w, h)
+
+
+def _erase(rects: Sequence[Rect], stage: Callable[[Any], None]) -> int:
+    """Stages a blank window over every one of ``rects`` and returns how many
+    were staged."""
+    for x, y, w, h in rects:
+        window = WINDOW_POOL.acquire(h, w, y, x)
+        stage(window)
+        WINDOW_POOL.release(window)
+    return len(rects)
+
+
+class Reconciler:
+    """A ``Reconciler`` keeps the ``ComposableGraph`` of the previous frame
+    around and reuses its subtrees when building the next one.
+
+    While a ``Reconciler`` is building, every ``build`` call is compared to
+    the node in the same position of the previous graph. If the composable
+    name, arguments, keyword arguments and measurement are all equal, the old
+    node is reused as is, without being built or rendered again. A node that
+    only moved, eg. because a sibling before it grew, is relocated rather
+    than built. Only the subtrees that changed are built and redrawn, so the
+    cost of a frame is proportional to what changed rather than to the size
+    of the tree.
+
+    The cells of the nodes of the previous frame that are not kept, because
+    they changed, moved or are gone, are blanked before the new frame is
+    drawn, so nothing they drew is left behind, unless a node of the new
+    frame is drawn over exactly the same cells. Nodes are assumed not to
+    overlap one another.
+
+    Every node it builds keeps its ``NodeLayout``, from which
+    ``MEASUREMENT_CACHE`` measures the next frames. Changing a composable
+    then only runs the measurement strategies of the composable and of its
+    ancestors, which lay their other children out from their cached sizes.
+    Above the nearest ancestor whose size did not change, nothing moves, so
+    only the subtree of that ancestor and the ancestors themselves are built
+    again.
+
+    Example:
+
+    .. code-block:: python
+
+       reconciler = Reconciler()
+       while True:
+           reconciler.render(
+               MyView(state),
+               measurement=MeasurementSpec.xywh(0, 0, w, h))
+
+    ``stats.hits`` counts reused subtrees and ``stats.misses`` counts nodes
+    that were built. ``flushes`` holds the number of physical screen updates
+    the last ``render`` performed. ``doupdate`` is forwarded to
+    ``ComposableGraph.render``.
+    """
+    __active = threading.local()
+
+    def __init__(self) -> None:
+        self.graph: Optional[ComposableGraph] = None
+        self.stats = CacheStats()
+        self.flushes = 0
+        self.doupdate: Optional[Callable[[], None]] = None
+        self._cursors: List[List[Any]] = []
+        self._layouts: List[Tuple[NodeLayout,
+                                  'weakref.ref[NodeLayout]']] = []
+        # The ids of the nodes of the previous frame kept in the new one.
+        self._kept: Set[int] = set()
+        # The number of measurement strategies running.
+        self.measuring = 0
+
+    @staticmethod
+    def active() -> Optional['Reconciler']:
+        """Returns the ``Reconciler`` building on this thread, if any."""
+        return getattr(Reconciler.__active, 'reconciler', None)
+
+    def build(self, composable: ComposableT, *args: Any,
+              **kwargs: Any) -> ComposableGraph:
+        """Builds ``composable`` reusing what it can from the previous
+        frame. The arguments are forwarded to ``ComposableT.build``."""
+        previous_reconciler = Reconciler.active()
+        Reconciler.__active.reconciler = self
+        self._cursors = [[[self.graph] if self.graph else [], 0]]
+        self._kept.clear()
+        try:
+            self.graph = composable.build(*args, **kwargs)
+        finally:
+            Reconciler.__active.reconciler = previous_reconciler
+            self._cursors = []
+            self._layouts = []
+
+        return self.graph
+
+    def render(self, composable: ComposableT, *args: Any,
+               batch: bool = True, **kwargs: Any) -> ComposableGraph:
+        """Builds ``composable`` like ``build`` and renders the subtrees that
+        changed since the previous frame. See ``ComposableGraph.render`` for
+        ``batch``."""
+        previous = self.graph
+        graph = self.build(composable, *args, **kwargs)
+        try:
+            vacated = self.__vacated(previous, graph)
+        finally:
+            self._kept.clear()
+        self.flushes = graph.render(only_dirty=True, batch=batch,
+                                    doupdate=self.doupdate, erase=vacated)
+        return graph
+
+    def __vacated(self, previous: Optional[ComposableGraph],
+                  graph: ComposableGraph) -> List[Rect]:
+        """Returns the rectangles of the windows of ``previous`` that are not
+        part of the new frame, ``graph``, leaving out the ones a window of
+        ``graph`` is about to be drawn over exactly."""
+        vacated: List[Rect] = []
+        if previous is None:
+            return vacated
+
+        kept, prune = self._kept, Visit.PRUNE
+
+        def enter(node: ComposableGraph) -> Optional[Visit]:
+            if id(node) in kept:
+                return prune
+            if (window := node.node) is not None:
+                vacated.append(_window_rect(window))
+            return None
+
+        previous.visit(enter)
+        if not vacated:
+            return vacated
+
+        redrawn = set()
+
+        def enter_dirty(node: ComposableGraph) -> Optional[Visit]:
+            if not node.dirty:
+                return prune
+            if (window := node.node) is not None:
+                redrawn.add(_window_rect(window))
+            elif node.ops:
+                redrawn.add(node.ops.bounds)
+            return None
+
+        graph.visit(enter_dirty)
+        return [rect for rect in vacated if rect not in redrawn]
+
+    def reset(self) -> None:
+        """Forgets the previous frame, forcing the next one to be rebuilt
+        entirely. Use this whenever the screen was cleared."""
+        self.graph = None
+
+    def keep(self, graph: ComposableGraph) -> ComposableGraph:
+        """Records that ``graph``, a node of the previous frame, is part of
+        the new one and returns it."""
+        self.stats.hits += 1
+        self._kept.add(id(graph))
+        return graph
+
+    def previous(self) -> Optional[ComposableGraph]:
+        """Returns the node of the previous frame in the position of the
+        ``build`` call being made and advances to the next sibling."""
+        if not self._cursors:
+            return None
+
+        cursor = self._cursors[-1]
+        siblings, index = cursor
+        cursor[1] += 1
+        return siblings[index] if index < len(siblings) else None
+
+    def descend(self, previous: Optional[ComposableGraph]) -> None:
+        self._cursors.append(
+            [previous.children if previous is not None else [], 0])
+        layout = NodeLayout()
+        self._layouts.append((layout, MEASUREMENT_CACHE.reference(layout)))
+
+    def ascend(self) -> NodeLayout:
+        """Returns the layout of the node built since the matching
+        ``descend``."""
+        self._cursors.pop()
+        return self._layouts.pop()[0]
 
-    def render(self):
-        def _render_tree(window):
-            if window:
-                window.refresh()
-        self.__ds_tree.apply(_render_tree)
+    def record(self, key: Hashable, measurement: Measurement) -> None:
+        """Records a measurement in the layout of the node being built,
+        which retains it."""
+        if self._layouts:
+            layout, ref = self._layouts[-1]
+            layout.measurements[key] = measurement
+            MEASUREMENT_CACHE.retain(key, ref)
@@ -1,11 +1,17 @@
 #!/usr/bin/env python
 
+import threading
 from abc import abstractmethod, ABC
-from dataclasses import dataclass, field
-from typing import Callable, Generic, List, Any, Optional, TypeVar
+from array import array
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Generic, Iterator, List, Any, Optional, Tuple, \
+    TypeVar
 
 
 class Tree(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def apply(self, predicate: Callable[[Any], Any]) -> 'Tree':
         """Traverses through the tree applying the callable."""
@@ -13,20 +19,269 @@ class Tree(ABC):
 
 TreeNode = TypeVar('TreeNode')
 
-@dataclass
+
+class Visit(IntEnum):
+    """What a visitor of a tree returns to steer the walk, ``None`` standing
+    for ``CONTINUE``.
+
+    ``CONTINUE`` goes on with the children of the visited tree, ``PRUNE``
+    skips them and ``STOP`` ends the walk.
+    """
+    CONTINUE = 0
+    PRUNE = 1
+    STOP = 2
+
+
+# Marks the point of a walk where a tree is left, its subtree being done.
+_LEAVE = object()
+
+
 class GeneralTree(Tree, Generic[TreeNode]):
-    node: TreeNode
-    children: List[Tree] = field(default_factory=lambda: [])
+    """A tree whose every node holds a value, ``node``, and a list of
+    ``children`` trees. Trees compare equal when their nodes and children
+    do.
+
+    Trees are walked without recursion, so their depth is not bounded by the
+    recursion limit, and without being copied, by ``preorder``,
+    ``postorder`` and ``visit``. A tree walked many times can be
+    ``flatten``-ed first.
+    """
+    __slots__ = ('node', 'children')
+
+    def __init__(self, node: TreeNode,
+                 children: Optional[List['GeneralTree']] = None) -> None:
+        self.node = node
+        self.children = children if children is not None else []
+
+    def apply(self, predicate: Callable[[TreeNode], Any]) -> 'GeneralTree':
+        """Returns a tree of the results of ``predicate`` for every node,
+        which is called in pre-order."""
+        applied: List[GeneralTree] = []
+        stack: List[Tuple[GeneralTree, List[GeneralTree]]] = [(self, applied)]
+        while stack:
+            tree, siblings = stack.pop()
+            new_tree = GeneralTree(predicate(tree.node))
+            siblings.append(new_tree)
+            stack.extend((child, new_tree.children)
+                         for child in reversed(tree.children))
+        return applied[0]
 
-    def apply(self, predicate: Callable[[TreeNode], Any]) -> 'Tree':
-        """DFS traverses through the tree applying the callable."""
-        new_tree = GeneralTree(
-            predicate(self.node),
-            [c.apply(predicate) for c in self.children]
-        )
+    def preorder(self, prune: Optional[Callable[['GeneralTree'], bool]] = None
+                 ) -> Iterator['GeneralTree[TreeNode]']:
+        """Yields every subtree of the tree, itself first, every tree
+        before its children. The children of the trees ``prune`` returns
+        ``True`` for are skipped."""
+        stack = [self]
+        while stack:
+            tree = stack.pop()
+            yield tree
+            if tree.children and (prune is None or not prune(tree)):
+                stack.extend(reversed(tree.children))
 
-        return new_tree
+    def postorder(self,
+                  prune: Optional[Callable[['GeneralTree'], bool]] = None
+                  ) -> Iterator['GeneralTree[TreeNode]']:
+        """Yields every subtree of the tree, itself last, every tree after
+        its children. The children of the trees ``prune`` returns ``True``
+        for are skipped."""
+        stack: List[Any] = [self]
+        while stack:
+            tree = stack.pop()
+            if tree is _LEAVE:
+                yield stack.pop()
+            elif not tree.children or (prune is not None and prune(tree)):
+                yield tree
+            else:
+                stack += (tree, _LEAVE)
+                stack.extend(reversed(tree.children))
+
+    def visit(self, enter: Callable[['GeneralTree'], Optional[Visit]],
+              leave: Optional[Callable[['GeneralTree'], None]] = None
+              ) -> bool:
+        """Walks the tree in place, calling ``enter`` with every subtree in
+        pre-order, which steers the walk with a ``Visit``. Unless the walk
+        is stopped, ``leave`` is called with every entered tree once its
+        subtree is done.
+
+        The walk keeps its own stack rather than recursing, so trees of any
+        depth can be walked, but the stack is allocated on every call.
+        ``FlatTree.visit`` walks a flattened tree without allocating.
+
+        Returns:
+            bool: ``False`` if the walk was stopped, ``True`` otherwise.
+        """
+        # Enum members are slow to look up.
+        stop, prune = Visit.STOP, Visit.PRUNE
+        stack: List[Any] = [self]
+        while stack:
+            tree = stack.pop()
+            if tree is _LEAVE:
+                leave(stack.pop())
+                continue
+
+            visit = enter(tree)
+            if visit is stop:
+                return False
+            if leave is not None:
+                stack += (tree, _LEAVE)
+            if visit is not prune and tree.children:
+                stack.extend(reversed(tree.children))
+        return True
+
+    def flatten(self) -> 'FlatTree':
+        """Returns the tree flattened into a ``FlatTree``."""
+        return FlatTree(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.node, self.children) == (other.node, other.children)
+
+    def __repr__(self) -> str:
+        return f'GeneralTree(node={self.node!r}, children={self.children!r})'
 
     def __str__(self) -> str:
         return (f'GTree<node={self.node}, '
                 f'children={[str(c) for c in self.children]}>')
+
+
+class FlatTree:
+    """A ``GeneralTree`` flattened into arrays, which are walked faster than
+    the tree, for trees walked many times.
+
+    The subtrees are numbered in pre-order and ``trees[i]`` is the subtree
+    numbered ``i``, the first being the whole tree. ``parent``,
+    ``first_child`` and ``next_sibling`` hold the numbers of the parent, the
+    first child and the next sibling of every subtree, ``-1`` if it has
+    none. The subtrees are not copied, but later changes to their children
+    are not reflected.
+    """
+    __slots__ = ('trees', 'parent', 'first_child', 'next_sibling')
+
+    def __init__(self, tree: GeneralTree) -> None:
+        self.trees: List[GeneralTree] = []
+        self.parent = array('l')
+        self.first_child = array('l')
+        self.next_sibling = array('l')
+        last_child = array('l')
+
+        stack = [(tree, -1)]
+        while stack:
+            subtree, parent = stack.pop()
+            i = len(self.trees)
+            self.trees.append(subtree)
+            self.parent.append(parent)
+            self.first_child.append(-1)
+            self.next_sibling.append(-1)
+            last_child.append(-1)
+            if parent >= 0:
+                if self.first_child[parent] < 0:
+                    self.first_child[parent] = i
+                else:
+                    self.next_sibling[last_child[parent]] = i
+                last_child[parent] = i
+            stack.extend((child, i) for child in reversed(subtree.children))
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+    def children(self, i: int) -> Iterator[int]:
+        """Yields the numbers of the children of the subtree ``i``."""
+        child = self.first_child[i]
+        while child >= 0:
+            yield child
+            child = self.next_sibling[child]
+
+    def skip(self, i: int) -> int:
+        """Returns the number of the first subtree after the subtree ``i``
+        in pre-order, not counting its descendants, or ``len(self)``."""
+        while i >= 0 and self.next_sibling[i] < 0:
+            i = self.parent[i]
+        return self.next_sibling[i] if i >= 0 else len(self.trees)
+
+    def visit(self, enter: Callable[[GeneralTree], Optional[Visit]]) -> bool:
+        """Calls ``enter`` with every subtree in pre-order, like
+        ``GeneralTree.visit``, without allocating anything.
+
+        Returns:
+            bool: ``False`` if the walk was stopped, ``True`` otherwise.
+        """
+        trees = self.trees
+        stop, prune = Visit.STOP, Visit.PRUNE
+        i = 0
+        while i < len(trees):
+            visit = enter(trees[i])
+            if visit is stop:
+                return False
+            i = self.skip(i) if visit is prune else i + 1
+        return True
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how well a cache is doing.
+
+    ``hits`` and ``misses`` count lookups, ``bypasses`` counts lookups that
+    could not be cached at all (usually because an argument was unhashable)
+    and ``evictions`` counts entries dropped to respect the cache size.
+    """
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset(self) -> None:
+        self.hits = self.misses = self.bypasses = self.evictions = 0
+
+
+MailboxValue = TypeVar('MailboxValue')
+
+
+class Mailbox(Generic[MailboxValue]):
+    """A thread-safe, single-slot mailbox where the latest value wins.
+
+    ``put`` never blocks: a value that was not taken yet is replaced, which
+    is counted in ``coalesced``. ``take`` blocks until a value was put since
+    the previous ``take`` and returns the latest one. ``redeliver`` makes the
+    last value available again, eg. to render it once more after a resize.
+    Once ``close`` is called, ``take`` returns the value that was not taken
+    yet, if any, and raises ``EOFError`` from then on.
+    """
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._value: Optional[MailboxValue] = None
+        self._fresh = False
+        self._has_value = False
+        self.closed = False
+        self.coalesced = 0
+
+    def put(self, value: MailboxValue) -> None:
+        with self._condition:
+            if self._fresh:
+                self.coalesced += 1
+            self._value, self._fresh, self._has_value = value, True, True
+            self._condition.notify()
+
+    def redeliver(self) -> None:
+        with self._condition:
+            if self._has_value:
+                self._fresh = True
+                self._condition.notify()
+
+    def take(self) -> MailboxValue:
+        with self._condition:
+            self._condition.wait_for(lambda: self._fresh or self.closed)
+            if not self._fresh:
+                raise EOFError('The mailbox is closed.')
+            self._fresh = False
+            return self._value
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
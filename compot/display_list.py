@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""This module defines the display list, the intermediate representation
+between building and rendering a ``ComposableGraph``.
+
+Instead of drawing straight into curses windows, widgets describe what they
+want on the screen as a flat list of ``DrawOp`` objects. The display list can
+then be cached, moved around with ``DisplayList.translate`` and replayed onto
+any window-like target with ``execute``.
+"""
+
+import curses
+from typing import Any, Iterable, NamedTuple
+
+
+class Rect(NamedTuple):
+    """A rectangle on the screen, in characters."""
+    x: int
+    y: int
+    w: int
+    h: int
+
+    def translate(self, dx: int, dy: int) -> 'Rect':
+        return Rect(self.x + dx, self.y + dy, self.w, self.h)
+
+    def union(self, other: 'Rect') -> 'Rect':
+        x, y = min(self.x, other.x), min(self.y, other.y)
+        return Rect(x, y,
+                    max(self.x + self.w, other.x + other.w) - x,
+                    max(self.y + self.h, other.y + other.h) - y)
+
+
+class DrawOp(NamedTuple):
+    """Draws ``text`` with the curses attribute ``attr`` starting at ``(x,
+    y)``. Nothing outside of ``clip`` is drawn."""
+    x: int
+    y: int
+    text: str
+    attr: int
+    clip: Rect
+
+    def translate(self, dx: int, dy: int) -> 'DrawOp':
+        return DrawOp(self.x + dx, self.y + dy, self.text, self.attr,
+                      self.clip.translate(dx, dy))
+
+
+class DisplayList(tuple):
+    """An immutable sequence of ``DrawOp`` objects, in drawing order."""
+    def __new__(cls, ops: Iterable[DrawOp] = ()) -> 'DisplayList':
+        return super().__new__(cls, ops)
+
+    def __add__(self, other: Iterable[DrawOp]) -> 'DisplayList':
+        return DisplayList(tuple.__add__(self, tuple(other)))
+
+    @property
+    def bounds(self) -> Rect:
+        """The smallest rectangle containing the clip of every op."""
+        if not self:
+            return Rect(0, 0, 0, 0)
+
+        bounds = self[0].clip
+        for op in self[1:]:
+            bounds = bounds.union(op.clip)
+        return bounds
+
+    def translate(self, dx: int, dy: int) -> 'DisplayList':
+        """Returns the display list moved by ``dx`` columns and ``dy``
+        rows."""
+        if dx == 0 and dy == 0:
+            return self
+        return DisplayList(op.translate(dx, dy) for op in self)
+
+
+def execute(ops: Iterable[DrawOp], target: Any,
+            dx: int = 0, dy: int = 0) -> None:
+    """Replays ``ops`` onto ``target``, any object with the curses
+    ``addnstr(y, x, str, n, attr)`` method, eg. ``stdscr``, a window or a
+    ``BufferWindow``. Every op is moved by ``dx`` and ``dy`` first, which is
+    useful to draw into a window that does not start at the origin."""
+    for x, y, text, attr, clip in ops:
+        if not clip.y <= y < clip.y + clip.h:
+            continue
+        if x < clip.x:
+            text, x = text[clip.x - x:], clip.x
+        if (n := clip.x + clip.w - x) <= 0 or not text:
+            continue
+
+        try:
+            target.addnstr(y + dy, x + dx, text, n, attr)
+        except curses.error:
+            # Filling the last cell of a window moves the cursor out of it,
+            # which curses reports as an error even though the text was
+            # drawn.
+            pass
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+
+"""This module implements an off-screen, double-buffered cell framebuffer.
+
+Rather than giving every widget its own curses window, widgets can draw into
+``BufferWindow`` objects which are cheap, pure-Python stand-ins for curses
+windows. Refreshing a ``BufferWindow`` copies its contents into the back
+buffer of its ``FrameBuffer``. ``FrameBuffer.present`` then compares the back
+buffer to what is already on the terminal (the front buffer) and only writes
+the cells that changed.
+"""
+
+import curses
+from array import array
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+from compot.text_width import char_width, is_narrow
+
+# A cell holding this character is the right half of a wide character.
+CONTINUATION = 0
+# Front buffer cells holding this value never match the back buffer, which
+# forces them to be written out on the next present.
+_UNKNOWN = 0xFFFFFFFF
+
+Run = Tuple[int, int, str, int]
+
+
+class FrameBuffer:
+    """A grid of ``h`` by ``w`` cells. Every cell holds the code point of a
+    character and a curses attribute, stored in flat ``array`` objects.
+
+    Parameters:
+        h (int): The height of the buffer.
+        w (int): The width of the buffer.
+        screen: The curses window ``present`` writes to by default, usually
+            ``stdscr``.
+    """
+    # Unchanged cells shorter than this are written anyway if that avoids
+    # splitting a run in two.
+    RUN_GAP = 4
+
+    def __init__(self, h: int, w: int, screen: Any = None) -> None:
+        self.screen = screen
+        self.cells_written = 0
+        self.runs_written = 0
+        self.resize(h, w)
+
+    def resize(self, h: int, w: int) -> None:
+        """Resizes the buffer. The contents are cleared and the whole
+        terminal is repainted on the next ``present``."""
+        self.h, self.w = h, w
+        self.chars = array('L', [ord(' ')]) * (h * w)
+        self.attrs = array('L', [0]) * (h * w)
+        self._front_chars = array('L', [_UNKNOWN]) * (h * w)
+        self._front_attrs = array('L', [0]) * (h * w)
+        self._dirty_rows: Set[int] = set(range(h))
+
+    def newwin(self, h: int, w: int, y: int, x: int) -> 'BufferWindow':
+        """Creates a window drawing into this buffer. This mirrors
+        ``curses.newwin``."""
+        return BufferWindow(self, h, w, y, x)
+
+    def draw(self, y: int, x: int, text: str, attr: int = 0,
+             max_x: Optional[int] = None) -> int:
+        """Draws ``text`` starting at ``(y, x)`` into the back buffer, clipped
+        to the buffer and to ``max_x``. Returns the column after the last
+        drawn cell."""
+        max_x = self.w if max_x is None else min(max_x, self.w)
+        if not 0 <= y < self.h or x >= max_x or not text:
+            return x
+
+        row = y * self.w
+        if is_narrow(text):
+            text = text[:max_x - x]
+            start, end = row + x, row + x + len(text)
+            self.chars[start:end] = array('L', map(ord, text))
+            self.attrs[start:end] = array('L', [attr]) * len(text)
+            self._dirty_rows.add(y)
+            return x + len(text)
+
+        for char in text:
+            if (width := char_width(char)) == 0:
+                continue
+            if x + width > max_x:
+                break
+            self.chars[row + x] = ord(char)
+            self.attrs[row + x] = attr
+            if width == 2:
+                self.chars[row + x + 1] = CONTINUATION
+                self.attrs[row + x + 1] = attr
+            x += width
+
+        self._dirty_rows.add(y)
+        return x
+
+    def fill(self, y: int, x: int, h: int, w: int, attr: int = 0) -> None:
+        """Clears a rectangle of the back buffer to blanks."""
+        for row in range(max(y, 0), min(y + h, self.h)):
+            self.draw(row, x, ' ' * w, attr)
+
+    def diff(self) -> Iterator[Run]:
+        """Yields the ``(y, x, text, attr)`` runs of the back buffer that
+        differ from the front buffer and marks them as presented."""
+        chars, attrs = self.chars, self.attrs
+        front_chars, front_attrs = self._front_chars, self._front_attrs
+        w = self.w
+
+        for y in sorted(self._dirty_rows):
+            start, end = y * w, (y + 1) * w
+            if chars[start:end] == front_chars[start:end] and \
+                    attrs[start:end] == front_attrs[start:end]:
+                continue
+
+            yield from self.__row_runs(y)
+            front_chars[start:end] = chars[start:end]
+            front_attrs[start:end] = attrs[start:end]
+
+        self._dirty_rows.clear()
+
+    def __row_runs(self, y: int) -> Iterator[Run]:
+        chars, attrs = self.chars, self.attrs
+        front_chars, front_attrs = self._front_chars, self._front_attrs
+        row = y * self.w
+
+        run_x: Optional[int] = None
+        run_attr = 0
+        run_chars: List[str] = []
+        gap: List[str] = []
+        for x in range(self.w):
+            i = row + x
+            char, attr = chars[i], attrs[i]
+            changed = char != front_chars[i] or attr != front_attrs[i]
+            if changed and char == CONTINUATION and run_x is None and x > 0:
+                # Never start a run in the middle of a wide character.
+                run_x, run_attr, run_chars = x - 1, attrs[i - 1], \
+                    [chr(chars[i - 1])]
+                continue
+
+            text = '' if char == CONTINUATION else chr(char)
+            if run_x is not None and attr == run_attr:
+                if changed:
+                    run_chars += gap
+                    run_chars.append(text)
+                    gap = []
+                    continue
+                if len(gap) < self.RUN_GAP:
+                    gap.append(text)
+                    continue
+
+            if run_x is not None:
+                yield (y, run_x, ''.join(run_chars), run_attr)
+                run_x, gap = None, []
+            if changed:
+                run_x, run_attr, run_chars = x, attr, [text]
+
+        if run_x is not None:
+            yield (y, run_x, ''.join(run_chars), run_attr)
+
+    def present(self, screen: Any = None) -> int:
+        """Writes the changed cells to ``screen`` and updates the terminal
+        once. Without any screen the changes are only marked as presented.
+        Returns the number of runs that were written."""
+        screen = self.screen if screen is None else screen
+        runs = cells = 0
+        for y, x, text, attr in self.diff():
+            runs += 1
+            cells += len(text)
+            if screen is None:
+                continue
+            try:
+                screen.addstr(y, x, text, attr)
+            except curses.error:
+                # Writing the bottom-right cell moves the cursor off the
+                # screen, which curses reports as an error after drawing.
+                pass
+
+        self.runs_written, self.cells_written = runs, cells
+        if runs and screen is not None:
+            screen.noutrefresh()
+            curses.doupdate()
+        return runs
+
+    def doupdate(self) -> None:
+        """Presents the buffer. This mirrors ``curses.doupdate``."""
+        self.present()
+
+    def rows(self) -> List[str]:
+        """Returns the contents of the back buffer as one string per row."""
+        w = self.w
+        return [
+            ''.join(chr(c) for c in self.chars[y * w:(y + 1) * w]
+                    if c != CONTINUATION)
+            for y in range(self.h)
+        ]
+
+
+class BufferWindow:
+    """A lightweight stand-in for a curses window that draws into a
+    ``FrameBuffer``. Only the parts of the curses window API that compot
+    uses are implemented."""
+    __slots__ = ('_buffer', '_h', '_w', '_y', '_x', '_cursor', '_runs')
+
+    def __init__(self, buffer: FrameBuffer,
+                 h: int, w: int, y: int, x: int) -> None:
+        self._buffer = buffer
+        self._h, self._w, self._y, self._x = h, w, y, x
+        self._cursor = (0, 0)
+        self._runs: List[Run] = []
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return (self._h, self._w)
+
+    def getbegyx(self) -> Tuple[int, int]:
+        return (self._y, self._x)
+
+    def resize(self, h: int, w: int) -> None:
+        self._h, self._w = h, w
+
+    def mvwin(self, y: int, x: int) -> None:
+        self._y, self._x = y, x
+
+    def erase(self) -> None:
+        self._runs.clear()
+        self._cursor = (0, 0)
+
+    def addnstr(self, *args: Any) -> None:
+        """Supports both the ``(str, n[, attr])`` and the ``(y, x, str, n[,
+        attr])`` forms of ``window.addnstr``."""
+        if isinstance(args[0], str):
+            (y, x), (text, n, *attr) = self._cursor, args
+        else:
+            y, x, text, n, *attr = args
+        text = text[:n]
+        self._runs.append((y, x, text, attr[0] if attr else 0))
+        self._cursor = (y, x + len(text))
+
+    def addstr(self, *args: Any) -> None:
+        if isinstance(args[0], str):
+            self.addnstr(args[0], len(args[0]), *args[1:])
+        else:
+            self.addnstr(*args[:3], len(args[2]), *args[3:])
+
+    def touchwin(self) -> None:
+        # Every refresh copies the whole window, so there is nothing to do.
+        pass
+
+    def noutrefresh(self) -> None:
+        buffer = self._buffer
+        buffer.fill(self._y, self._x, self._h, self._w)
+        max_x = self._x + self._w
+        for y, x, text, attr in self._runs:
+            if 0 <= y < self._h:
+                buffer.draw(self._y + y, self._x + x, text, attr, max_x)
+
+    def refresh(self) -> None:
+        self.noutrefresh()
+        self._buffer.doupdate()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+"""This module lays out containers in two passes: constraints go down and
+sizes go up.
+
+Every child is measured with the ``Constraints`` its parent gives it, the
+smallest and largest size it may take, and answers with its size. The parent
+then places its children and builds every one of them with the constraints
+it was measured with, and the place it was given, which may cut it. Built
+children lay their own children out with the same constraints they were
+measured with, so their measurements come from ``MEASUREMENT_CACHE`` and
+every node is measured once per layout, which is then linear in the number
+of nodes.
+
+Children of a ``Row`` or a ``Column`` can be given a ``Flex`` with the
+``flex`` keyword argument of any composable:
+
+.. code-block:: python
+
+   Row((
+       Text('Name'),
+       ProgressBar(0.3, flex=Flex(weight=2)),
+       ProgressBar(0.7, flex=Flex(weight=1, max_size=20)),
+   ), layout=LayoutSpec.FILL)
+"""
+
+from enum import IntEnum
+from typing import Any, Dict, Hashable, Iterator, List, NamedTuple, \
+    Optional, Sequence, Tuple, Union
+from compot import Measurement
+
+# The size of unbounded constraints.
+INF = Measurement.inf().w
+
+
+class Constraints(NamedTuple):
+    """The smallest and largest width and height a composable may take."""
+    min_w: int
+    max_w: int
+    min_h: int
+    max_h: int
+
+    @staticmethod
+    def loose(offered: Measurement) -> 'Constraints':
+        """Returns constraints allowing any size up to ``offered``."""
+        return Constraints(0, offered.w, 0, offered.h)
+
+    @staticmethod
+    def tight(w: int, h: int) -> 'Constraints':
+        """Returns constraints allowing no other size than ``w`` by ``h``."""
+        return Constraints(w, w, h, h)
+
+    @property
+    def is_tight(self) -> bool:
+        return self.min_w == self.max_w and self.min_h == self.max_h
+
+    @property
+    def biggest(self) -> Measurement:
+        return Measurement(self.max_w, self.max_h)
+
+    def constrain(self, measurement: Measurement) -> Measurement:
+        """Returns the size closest to ``measurement`` the constraints
+        allow."""
+        return Measurement(min(max(measurement.w, self.min_w), self.max_w),
+                           min(max(measurement.h, self.min_h), self.max_h))
+
+
+class Flex(NamedTuple):
+    """How a child is sized along the main axis of its ``Row`` or
+    ``Column``.
+
+    Children with a positive ``weight`` share the space the other children
+    leave, in proportion to their weights. Every child is at least
+    ``min_size`` and at most ``max_size`` cells long along the main axis.
+    """
+    weight: int = 0
+    min_size: int = 0
+    max_size: int = INF
+
+
+NO_FLEX = Flex()
+
+
+def as_flex(flex: Union[Flex, int, None]) -> Flex:
+    """Returns ``flex`` as a ``Flex``, integers being weights."""
+    if flex is None:
+        return NO_FLEX
+    if isinstance(flex, int):
+        return Flex(weight=flex)
+    return flex
+
+
+class NodeLayout:
+    """The layout of a built node: the ``constraints`` it was built with,
+    the ``size`` it measured and every measurement made while building it,
+    by ``(ComposableT.key, Constraints)``, ie. the sizes of its children.
+
+    A ``Reconciler`` keeps the layouts of the nodes it built and measures
+    the composables of the next frame that did not change from them.
+    """
+    __slots__ = ('constraints', 'size', 'measurements', '__weakref__')
+
+    def __init__(self) -> None:
+        self.constraints: Optional[Constraints] = None
+        self.size: Optional[Measurement] = None
+        self.measurements: Dict[Hashable, Measurement] = {}
+
+    def __repr__(self) -> str:
+        return (f'NodeLayout<constraints={self.constraints}, '
+                f'size={self.size}, '
+                f'measurements={len(self.measurements)}>')
+
+
+class Axis(IntEnum):
+    HORIZONTAL = 0
+    VERTICAL = 1
+
+
+class LinearLayout(NamedTuple):
+    """The size of the content of a container, the ``(x, y, w, h)``
+    placement of every child, relative to the container, and the
+    ``Constraints`` every child was measured with."""
+    size: Measurement
+    placements: Tuple[Tuple[int, int, int, int], ...]
+    constraints: Tuple[Constraints, ...]
+
+    def clipped(self, children: Sequence[Any], w: int, h: int
+                ) -> Iterator[Tuple[Any, int, int, int, int, Constraints]]:
+        """Yields every one of ``children`` that is visible in a container
+        of ``w`` by ``h`` cells with its placement, its size cut to the
+        container, and its constraints."""
+        for child, (x, y, child_w, child_h), constraints in zip(
+                children, self.placements, self.constraints):
+            child_w, child_h = min(child_w, w - x), min(child_h, h - y)
+            if child_w > 0 and child_h > 0:
+                yield child, x, y, child_w, child_h, constraints
+
+
+def distribute(space: int, flexes: Sequence[Flex]) -> List[int]:
+    """Shares ``space`` cells between children in proportion to the weights
+    of their ``flexes``, within their minimum and maximum sizes. The shares
+    add up to ``space`` unless the bounds prevent it."""
+    sizes: List[Optional[int]] = [None] * len(flexes)
+    while True:
+        unsized = [i for i, size in enumerate(sizes) if size is None]
+        if not unsized:
+            return sizes
+
+        left = max(space - sum(s for s in sizes if s is not None), 0)
+        weights = sum(flexes[i].weight for i in unsized)
+        shares = {i: left * flexes[i].weight / weights for i in unsized}
+        clamped = {
+            i: min(max(share, flexes[i].min_size), flexes[i].max_size)
+            for i, share in shares.items()
+            if not flexes[i].min_size <= share <= flexes[i].max_size
+        }
+        if clamped:
+            for i, size in clamped.items():
+                sizes[i] = int(size)
+            continue
+
+        # The cells left by rounding go to the largest remainders.
+        for i in unsized:
+            sizes[i] = int(shares[i])
+        extra = left - sum(sizes[i] for i in unsized)
+        for i in sorted(unsized, key=lambda i: sizes[i] - shares[i])[:extra]:
+            sizes[i] += 1
+
+
+def _constraints(axis: Axis, min_main: int, max_main: int,
+                 max_cross: int) -> Constraints:
+    if axis == Axis.HORIZONTAL:
+        return Constraints(min_main, max_main, 0, max_cross)
+    return Constraints(0, max_cross, min_main, max_main)
+
+
+def layout_linear(children: Sequence[Any], constraints: Constraints,
+                  axis: Axis, fill: bool = False,
+                  space_between: bool = False) -> LinearLayout:
+    """Lays ``children`` out one after the other along ``axis``.
+
+    Inflexible children are measured first, unbounded along the main axis
+    but for their ``Flex`` bounds. The flexible ones then share what is left
+    of the largest main size of ``constraints``, unless it is unbounded, in
+    which case they are measured like the others. Every child is measured
+    exactly once.
+
+    The content spans the largest main size if ``fill`` is set or if any
+    child is flexible and is as long as its children otherwise. With
+    ``space_between`` set, the space the children leave is spread evenly
+    between them, the cells that cannot be spread evenly being left at the
+    end.
+    """
+    horizontal = axis == Axis.HORIZONTAL
+    min_main, max_main, max_cross = \
+        (constraints.min_w, constraints.max_w, constraints.max_h) \
+        if horizontal \
+        else (constraints.min_h, constraints.max_h, constraints.max_w)
+    inflexible = _constraints(axis, 0, INF, max_cross)
+
+    sizes: List[Any] = [None] * len(children)
+    child_constraints: List[Any] = [None] * len(children)
+    flexible = []
+    used = 0
+    for i, child in enumerate(children):
+        if (flex := child.flex) is NO_FLEX:
+            child_constraints[i] = inflexible
+        elif flex.weight > 0 and max_main < INF:
+            flexible.append(i)
+            continue
+        else:
+            child_constraints[i] = _constraints(
+                axis, flex.min_size, flex.max_size, max_cross)
+        size = sizes[i] = child.measure(child_constraints[i])
+        used += size.w if horizontal else size.h
+
+    if flexible:
+        shares = distribute(max_main - used,
+                            [children[i].flex for i in flexible])
+        for i, share in zip(flexible, shares):
+            child_constraints[i] = _constraints(axis, share, share, max_cross)
+            sizes[i] = children[i].measure(child_constraints[i])
+            used += share
+
+    main_size = max_main if fill or flexible \
+        else min(max(used, min_main), max_main)
+    gaps = len(children) - 1
+    gap = max(main_size - used, 0) // gaps \
+        if space_between and gaps > 0 \
+        else 0
+
+    placements = []
+    position = 0
+    cross_size = 0
+    for size in sizes:
+        if horizontal:
+            placements.append((position, 0, size.w, size.h))
+            cross_size = max(cross_size, size.h)
+            position += size.w + gap
+        else:
+            placements.append((0, position, size.w, size.h))
+            cross_size = max(cross_size, size.w)
+            position += size.h + gap
+
+    return LinearLayout(
+        Measurement(main_size, cross_size) if horizontal
+        else Measurement(cross_size, main_size),
+        tuple(placements), tuple(child_constraints))
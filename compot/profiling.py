@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+"""This module implements the opt-in instrumentation of compot.
+
+When ``PROFILER`` is enabled, every call of a ``Composable``, every build of
+a ``ComposableCursed``, every call of a measurement strategy and every node
+rendered by a ``ComposableGraph`` is timed. The time is accounted per phase
+(``compose``, ``measure``, ``build`` and ``render``) and per composable name,
+both cumulatively and exclusively of the nested calls (the self time). When
+disabled, the only cost is checking ``PROFILER.enabled``.
+
+Example:
+
+.. code-block:: python
+
+   from compot.profiling import PROFILER
+
+   PROFILER.enable(report_interval=5, report=logging.info)
+   ...
+   print(PROFILER.summary())
+"""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+PHASES = ('compose', 'measure', 'build', 'render')
+
+
+class _Calls(threading.local):
+    """The calls being timed on a thread."""
+    def __init__(self) -> None:
+        # The time spent in the nested calls of every call being timed.
+        self.children: List[float] = []
+
+
+@dataclass
+class ProfileEntry:
+    """The statistics of one composable in one phase. Times are in
+    seconds."""
+    calls: int = 0
+    total_time: float = 0.0
+    self_time: float = 0.0
+
+
+class Profiler:
+    """Collects ``ProfileEntry`` objects keyed on ``(phase, name)``.
+
+    Frames are delimited by ``end_frame``, which ``ComposableGraph.render``
+    calls at the end of every render. ``last_frame`` then holds the self time
+    spent in each phase during that frame.
+
+    Calls are nested per thread, so threads building at once do not account
+    their time to one another.
+    """
+    def __init__(self) -> None:
+        self.enabled = False
+        self.entries: Dict[Tuple[str, str], ProfileEntry] = {}
+        self.frames = 0
+        self.last_frame: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.report_interval: Optional[float] = None
+        self.report: Callable[[str], None] = print
+        self._frame = dict.fromkeys(PHASES, 0.0)
+        self._calls = _Calls()
+        self._last_report = time.perf_counter()
+
+    def enable(self, report_interval: Optional[float] = None,
+               report: Callable[[str], None] = print) -> None:
+        """Starts profiling.
+
+        Parameters:
+            report_interval (float): If set, ``summary`` is passed to
+                ``report`` at the end of the first frame after every
+                ``report_interval`` seconds.
+            report: The function receiving the periodic summaries.
+        """
+        self.report_interval = report_interval
+        self.report = report
+        self._last_report = time.perf_counter()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self._calls.children.clear()
+
+    def reset(self) -> None:
+        """Forgets everything recorded so far."""
+        self.entries.clear()
+        self.frames = 0
+        self.last_frame = dict.fromkeys(PHASES, 0.0)
+        self._frame = dict.fromkeys(PHASES, 0.0)
+
+    def start(self) -> float:
+        """Starts timing a call. Pass the result to ``stop``."""
+        self._calls.children.append(0.0)
+        return time.perf_counter()
+
+    def stop(self, phase: str, name: str, started: float) -> None:
+        """Stops timing the call started at ``started``."""
+        elapsed = time.perf_counter() - started
+        children = self._calls.children
+        own = elapsed - children.pop()
+        if children:
+            children[-1] += elapsed
+
+        if (entry := self.entries.get((phase, name))) is None:
+            entry = self.entries[(phase, name)] = ProfileEntry()
+        entry.calls += 1
+        entry.total_time += elapsed
+        entry.self_time += own
+        self._frame[phase] += own
+
+    def end_frame(self) -> None:
+        """Closes the current frame, reporting a summary if one is due."""
+        self.frames += 1
+        self.last_frame, self._frame = self._frame, dict.fromkeys(PHASES, 0.0)
+
+        if self.report_interval is None:
+            return
+        if (now := time.perf_counter()) - self._last_report \
+                >= self.report_interval:
+            self._last_report = now
+            self.report(self.summary())
+
+    def stats(self) -> Dict[Tuple[str, str], ProfileEntry]:
+        """Returns a copy of the entries recorded so far."""
+        return {key: replace(entry) for key, entry in self.entries.items()}
+
+    def summary(self, limit: int = 20) -> str:
+        """Returns a table of the ``limit`` entries with the largest self
+        time."""
+        lines = [
+            f'compot profile over {self.frames} frames, last frame: ' +
+            ', '.join(f'{phase} {self.last_frame[phase] * 1e3:.3f} ms'
+                      for phase in PHASES),
+            f'{"phase":<8} {"name":<24} {"calls":>8} {"total ms":>10} '
+            f'{"self ms":>10} {"us/call":>9}',
+        ]
+        entries = sorted(self.entries.items(),
+                         key=lambda item: item[1].self_time, reverse=True)
+        for (phase, name), entry in entries[:limit]:
+            lines.append(
+                f'{phase:<8} {name:<24} {entry.calls:>8} '
+                f'{entry.total_time * 1e3:>10.3f} '
+                f'{entry.self_time * 1e3:>10.3f} '
+                f'{entry.total_time * 1e6 / entry.calls:>9.1f}')
+        return '\n'.join(lines)
+
+
+PROFILER = Profiler()
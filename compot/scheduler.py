@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+"""This module implements the frame scheduler of the main windows.
+
+Rather than rendering in a loop, a ``FrameScheduler`` renders a frame only
+once something ``invalidate``-d the screen (a key press, new data, a resize)
+and never more often than its ``framerate`` allows. While nothing changes
+the main window sleeps, so an idle interface uses next to no CPU.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class FrameScheduler:
+    """Keeps track of whether a frame must be rendered and when.
+
+    Example:
+
+    .. code-block:: python
+
+       scheduler = FrameScheduler(framerate=30)
+       while True:
+           if scheduler.wait(timeout=0.1):
+               with scheduler.frame():
+                   render()
+
+    Any thread may call ``invalidate``. Every frame has a deadline of one
+    frame interval. ``missed_deadlines`` counts the frames that took longer
+    than that and ``last_frame_time`` holds the duration of the last frame in
+    seconds.
+
+    Parameters:
+        framerate (float): The maximum number of frames per second. ``None``
+            or ``0`` renders as soon as the screen is invalidated.
+    """
+    def __init__(self, framerate: Optional[float] = 60) -> None:
+        self.framerate = framerate
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.last_frame_time = 0.0
+        self._invalidated = threading.Event()
+        self._invalidated.set()
+        self._last_frame: Optional[float] = None
+
+    @property
+    def interval(self) -> float:
+        """The shortest time between two frames, in seconds."""
+        return 1 / self.framerate if self.framerate else 0.0
+
+    @property
+    def invalidated(self) -> bool:
+        return self._invalidated.is_set()
+
+    def invalidate(self) -> None:
+        """Requests a frame. Requests made before the frame starts are
+        coalesced into it."""
+        self._invalidated.set()
+
+    def time_until_due(self) -> Optional[float]:
+        """Returns the seconds left before the next frame may be rendered,
+        ``0`` if it is due now and ``None`` if no frame was requested."""
+        if not self._invalidated.is_set():
+            return None
+        if self._last_frame is None:
+            return 0.0
+        return max(0.0, self._last_frame + self.interval - time.monotonic())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until a frame is due, or at most ``timeout`` seconds.
+        Returns whether a frame is due."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._invalidated.wait(timeout):
+            return False
+
+        delay = self.time_until_due() or 0.0
+        if deadline is not None:
+            delay = min(delay, max(0.0, deadline - time.monotonic()))
+        if delay > 0:
+            time.sleep(delay)
+        return self.time_until_due() == 0
+
+    @contextmanager
+    def frame(self) -> Iterator[None]:
+        """Wraps the rendering of a frame. The screen counts as valid from
+        the start of the frame on, so invalidating it while rendering
+        requests another frame."""
+        self._invalidated.clear()
+        start = self._last_frame = time.monotonic()
+        try:
+            yield
+        finally:
+            self.frames += 1
+            self.last_frame_time = time.monotonic() - start
+            if self.interval and self.last_frame_time > self.interval:
+                self.missed_deadlines += 1
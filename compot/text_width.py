@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+"""This module computes how many terminal cells strings take.
+
+``wcwidth`` is exact but slow, so it is only called once per code point:
+the width of every code point is stored in a table the first time it is
+needed. Printable ASCII strings, by far the most common, never reach the
+table as their width is their length. The widths of other strings are kept
+in a LRU cache.
+
+Unlike ``wcswidth``, which returns ``-1`` for strings holding control
+characters, control characters are counted as ``0`` cells wide.
+"""
+
+from functools import lru_cache
+from typing import Iterable, List
+from wcwidth import wcwidth
+
+# Table entries holding this value were not computed yet.
+_UNKNOWN = 0xFF
+_WIDTHS = bytearray([_UNKNOWN]) * 0x110000
+_WIDTHS[0x20:0x7F] = bytes([1]) * (0x7F - 0x20)
+_WIDTHS[0x00:0x20] = bytes(0x20)
+_WIDTHS[0x7F] = 0
+
+WIDTH_CACHE_SIZE = 4096
+
+
+def char_width(char: str) -> int:
+    """Returns the number of cells ``char`` takes, ``0``, ``1`` or ``2``."""
+    code_point = ord(char)
+    if (width := _WIDTHS[code_point]) == _UNKNOWN:
+        width = _WIDTHS[code_point] = max(wcwidth(char), 0)
+    return width
+
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def _cached_text_width(text: str) -> int:
+    widths = _WIDTHS
+    width = 0
+    for char in text:
+        if (char_cells := widths[ord(char)]) == _UNKNOWN:
+            char_cells = char_width(char)
+        width += char_cells
+    return width
+
+
+def text_width(text: str) -> int:
+    """Returns the number of cells ``text`` takes."""
+    if text.isascii() and text.isprintable():
+        return len(text)
+    return _cached_text_width(text)
+
+
+def text_widths(texts: Iterable[str]) -> List[int]:
+    """Returns the widths of many strings at once, like ``text_width``."""
+    cached = _cached_text_width
+    return [len(text) if text.isascii() and text.isprintable()
+            else cached(text)
+            for text in texts]
+
+
+def truncate(text: str, width: int) -> str:
+    """Returns the longest prefix of ``text`` at most ``width`` cells
+    wide."""
+    if text.isascii() and text.isprintable():
+        return text[:max(width, 0)]
+    if text_width(text) <= width:
+        return text
+
+    cells = 0
+    for end, char in enumerate(text):
+        if (cells := cells + char_width(char)) > width:
+            return text[:end]
+    return text
+
+
+def fit_to_width(text: str, width: int) -> str:
+    """Truncates or pads ``text`` with spaces to exactly ``width`` cells.
+    Wide characters that do not fit are replaced by spaces."""
+    text = truncate(text, width)
+    return text + ' ' * (width - text_width(text))
+
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def _cached_is_narrow(text: str) -> bool:
+    return all(char_width(char) == 1 for char in text)
+
+
+def is_narrow(text: str) -> bool:
+    """Returns whether every character of ``text`` takes exactly one cell,
+    in which case ``text`` can be drawn one character per cell."""
+    if text.isascii():
+        return text.isprintable()
+    return _cached_is_narrow(text)
+
+
+def cache_info():
+    """Returns the ``functools`` statistics of the string width cache."""
+    return _cached_text_width.cache_info()
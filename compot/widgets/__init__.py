@@ -10,9 +10,24 @@ from .row import _RowSpacing as RowSpacing
 from .statusbar import _StatusBar as StatusBar
 
 from .progressbar import _ProgressBar as ProgressBar
+from .progressbar import _ProgressBarGrid as ProgressBarGrid
 from .progressbar import _ProgressBarStyle as ProgressBarStyle
 
 from .column import _Column as Column
 
+from .lazy_column import _LazyColumn as LazyColumn
+from .lazy_column import _LazyColumnState as LazyColumnState
+
+from .table import _Table as Table
+from .table import _TableData as TableData
+
+from .log_view import _LogView as LogView
+from .log_view import _LogBuffer as LogBuffer
+
+from .sparkline import _Sparkline as Sparkline
+from .sparkline import _SparklineGlyphs as SparklineGlyphs
+from .sparkline import _SeriesBuffer as SeriesBuffer
+
 from .main_window import _MainWindow as MainWindow, \
-    _ObserverMainWindow as ObserverMainWindow
+    _ObserverMainWindow as ObserverMainWindow, \
+    _AsyncMainWindow as AsyncMainWindow
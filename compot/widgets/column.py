@@ -1,13 +1,21 @@
 #!/usr/bin/env python
 
-from typing import Iterable
-from compot import LayoutSpec, Measurement, MeasurementSpec
+from typing import Any, Iterable, Optional, Sequence
+from compot import Measurement, MeasurementSpec
 
-from compot.composable import ComposableCursed, ComposableGraph, ComposableT
+from compot.composable import ComposableCursed, ComposableGraph, \
+    ComposableT, MEASUREMENT_CACHE
+from compot.layout import Axis, Constraints, LinearLayout
+
+
+def _column_layout(children: Sequence[ComposableT], w: int,
+                   h: int) -> LinearLayout:
+    return MEASUREMENT_CACHE.layout_linear(children, Constraints(0, w, 0, h),
+                                           Axis.VERTICAL)
 
 
 def __column_measurement_strategy(
-    children: Iterable[ComposableT],
+    children: Sequence[ComposableT],
     offered: Measurement = Measurement.inf(),
     **kwargs
 ):
@@ -16,47 +24,48 @@ def __column_measurement_strategy(
 
     return Measurement(
         offered.w,
-        min(sum(c.measurement_strategy(*c.args, **c.kwargs).h \
-                for c in children), offered.h),
+        _column_layout(children, offered.w, offered.h).size.h,
     )
 
-@ComposableCursed(measurement_strategy=__column_measurement_strategy)
-def _Column(
-    children: Iterable[ComposableT],
+@ComposableCursed(measurement_strategy=__column_measurement_strategy,
+                  memo=True)
+def __Column(
+    children: Sequence[ComposableT],
     measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
+    constraints: Optional[Constraints] = None,
 ):
     ms = measurement
-
-    total_children_height = 0
-    children_heights = []
-    renderable_children = []
-    for child in children:
-        offered_h = ms.h - total_children_height
-        if offered_h == 0:
-            break
-
-        child_height = child.measurement_strategy(
-            *child.args,
-            offered=Measurement(ms.w, ms.h - total_children_height),
-            **child.kwargs
-        ).h
-        children_heights.append(child_height)
-        renderable_children.append(child)
-        total_children_height += child_height
+    w, h = (constraints.max_w, constraints.max_h) \
+        if constraints is not None \
+        else (ms.w, ms.h)
 
     children_windows = []
-    y_pos = 0
-    for child, child_height in zip(renderable_children, children_heights):
-        child_window = child.build(
+    for child, x, y, child_w, child_h, child_constraints in _column_layout(
+            children, w, h).clipped(children, ms.w, ms.h):
+        children_windows.append(child.build(
             measurement=MeasurementSpec.xywh(
-                ms.x,
-                ms.y + y_pos,
-                ms.w,
-                child_height
-            )
-        )
-        y_pos += child_height
-        children_windows.append(child_window)
+                ms.x + x, ms.y + y, child_w, child_h),
+            constraints=child_constraints))
 
     return ComposableGraph(None, children_windows)
 
+
+def _Column(children: Iterable[ComposableT], *args: Any,
+            **kwargs: Any) -> ComposableT:
+    """A ``Column`` stacks its children from top to bottom, filling its
+    width. Children that do not fit its height are cut or left out.
+
+    Children are laid out once per frame, see
+    ``compot.layout.layout_linear``. Children with a ``flex`` weight share the
+    height the others leave, which makes the ``Column`` fill its height.
+    ``constraints`` are injected like the measurement. Like with a ``Row``,
+    children that are not a sequence, like a generator, are made into a
+    tuple.
+
+    Like a ``Row``, a ``Column`` is memoized, so objects changed in place in
+    the arguments of its children must be ``Versioned`` to be drawn again.
+    """
+    if not isinstance(children, Sequence):
+        # The children are measured and built more than once.
+        children = tuple(children)
+    return __Column(children, *args, **kwargs)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+from compot import Measurement, MeasurementSpec
+
+from compot.composable import ComposableCursed, ComposableGraph, \
+    ComposableT, Versioned
+
+ItemFactory = Callable[[int], ComposableT]
+
+
+class _LazyColumnState(Versioned):
+    """The scroll position of a ``LazyColumn``, in items. Keep the same
+    object around between frames to scroll, a ``LazyColumn`` holding it is
+    built again whenever it scrolls.
+
+    ``viewport`` and ``count`` hold the number of items the column showed
+    and had the last time it was built. Scrolling stops at the end of the
+    column and ``scroll_to_index`` and ``scroll_by_page`` scroll by the
+    viewport.
+    """
+    def __init__(self, offset: int = 0) -> None:
+        self._offset = max(0, offset)
+        self.viewport = 0
+        self.count: Optional[int] = None
+        self._source = None
+        self._items = None
+
+    def __repr__(self) -> str:
+        return f'LazyColumnState(offset={self.offset})'
+
+    @property
+    def offset(self) -> int:
+        return self.clamp(self._offset)
+
+    @offset.setter
+    def offset(self, offset: int) -> None:
+        if (offset := self.clamp(offset)) != self._offset:
+            self._offset = offset
+            self.version += 1
+
+    def clamp(self, offset: int) -> int:
+        """Returns the closest offset to ``offset`` the column can scroll
+        to."""
+        if self.count is not None:
+            offset = min(offset, self.count - self.viewport)
+        return max(0, offset)
+
+    def scroll_by(self, items: int) -> None:
+        self.offset += items
+
+    def scroll_by_page(self, pages: int = 1) -> None:
+        self.scroll_by(pages * max(self.viewport, 1))
+
+    def scroll_to_index(self, index: int) -> None:
+        """Scrolls as little as possible for the item at ``index`` to be
+        visible."""
+        if index < self.offset or self.viewport == 0:
+            self.offset = index
+        elif index >= self.offset + self.viewport:
+            self.offset = index - self.viewport + 1
+
+    def _item(self, source: Tuple[Any, int], factory: ItemFactory,
+              index: int, keep: range) -> ComposableT:
+        """Returns the item at ``index``, calling ``factory`` only for items
+        that were not in ``keep`` the previous time."""
+        if self._source != source:
+            self._source, self._items = source, {}
+        if (item := self._items.get(index)) is None:
+            item = self._items[index] = factory(index)
+        if len(self._items) > 2 * len(keep):
+            self._items = {i: c for i, c in self._items.items() if i in keep}
+        return item
+
+
+class _SequenceItems:
+    """Makes ``sequence[index]`` the factory of a ``LazyColumn``. Two of
+    these are equal when they wrap the same sequence object, which avoids
+    hashing every item of the sequence on every frame."""
+    __slots__ = ('sequence', )
+
+    def __init__(self, sequence: Sequence[ComposableT]) -> None:
+        self.sequence = sequence
+
+    def __call__(self, index: int) -> ComposableT:
+        return self.sequence[index]
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _SequenceItems) \
+            and other.sequence is self.sequence
+
+    def __hash__(self) -> int:
+        return id(self.sequence)
+
+
+def __lazy_column_measurement_strategy(
+    count: int,
+    factory: ItemFactory,
+    state: _LazyColumnState,
+    item_height: int,
+    overscan: int,
+    offered: Measurement = Measurement.inf(),
+    **kwargs
+):
+    if offered.h < 1:
+        raise ValueError('A lazy column requires 1 character of height.')
+
+    return Measurement(offered.w, min(count * item_height, offered.h))
+
+
+@ComposableCursed(measurement_strategy=__lazy_column_measurement_strategy,
+                  memo=True)
+def __LazyColumn(
+    count: int,
+    factory: ItemFactory,
+    state: _LazyColumnState,
+    item_height: int,
+    overscan: int,
+    measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
+):
+    ms = measurement
+
+    viewport = -(-ms.h // item_height)
+    # The scroll limits are recorded, which does not change the state.
+    state.viewport, state.count = ms.h // item_height, count
+    offset = state.offset
+    visible = range(offset, min(offset + viewport, count))
+    keep = range(max(0, offset - overscan),
+                 min(offset + viewport + overscan, count))
+
+    children_windows = []
+    for index in visible:
+        child = state._item((factory, count), factory, index, keep)
+        children_windows.append(child.build(
+            measurement=MeasurementSpec.xywh(
+                ms.x,
+                ms.y + (index - offset) * item_height,
+                ms.w,
+                min(item_height, ms.h - (index - offset) * item_height)
+            )
+        ))
+
+    return ComposableGraph(None, children_windows)
+
+
+def _LazyColumn(
+    items: Union[Sequence[ComposableT], ItemFactory],
+    count: Optional[int] = None,
+    state: Optional[_LazyColumnState] = None,
+    item_height: int = 1,
+    overscan: int = 4,
+    **kwargs
+) -> ComposableT:
+    """A ``LazyColumn`` is a ``Column`` for very long lists. Only the items
+    inside its viewport are created and built, so a frame costs the same
+    with a hundred items as with millions of them.
+
+    Parameters:
+        items: Either a sequence of ``ComposableT`` objects or a factory
+            returning the ``ComposableT`` of an index.
+        count (int): The number of items. Required with a factory.
+        state (LazyColumnState): The scroll position.
+        item_height (int): The height of every item.
+        overscan (int): The number of items around the viewport whose
+            ``ComposableT`` objects are kept in ``state``, so that scrolling
+            by less than that does not call the factory for them again.
+
+    The column is only rebuilt when the factory, the count or the offset
+    change, so pass the same factory every frame. Likewise, changing items of
+    a sequence in place without changing its length is not noticed.
+
+    .. code-block:: python
+
+       def log_line(index):
+           return Text(LOG[index])
+
+       state = LazyColumnState()
+       LazyColumn(log_line, count=len(LOG), state=state)
+       ...
+       state.scroll_to_index(len(LOG) - 1)
+    """
+    if callable(items):
+        if count is None:
+            raise ValueError('A lazy column factory requires a count.')
+        factory = items
+    else:
+        factory = _SequenceItems(items)
+        count = len(items) if count is None else count
+    if item_height < 1:
+        raise ValueError('The items of a lazy column need a height.')
+
+    return __LazyColumn(count, factory, state or _LazyColumnState(),
+                        item_height, overscan, **kwargs)
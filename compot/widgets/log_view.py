@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+import reactivex as rx
+import reactivex.operators as rxops
+from compot import ColorPairs, Measurement, MeasurementSpec
+
+from compot.composable import ComposableCursed, ComposableGraph, ComposableT
+from compot.display_list import DisplayList, DrawOp, Rect
+from compot.text_width import fit_to_width
+
+
+class _LogBuffer:
+    """A thread-safe ring buffer holding the last ``capacity`` lines of a
+    log. Older lines are dropped, so memory stays bounded however many lines
+    are appended.
+
+    ``total`` counts every line ever appended and identifies the contents of
+    the buffer. ``on_change`` is called, on the appending thread, after every
+    append, eg. to invalidate a ``FrameScheduler``.
+    """
+    def __init__(self, capacity: int = 10_000,
+                 on_change: Optional[Callable[[], None]] = None) -> None:
+        if capacity < 1:
+            raise ValueError('A log buffer needs room for a line.')
+        self.capacity = capacity
+        self.on_change = on_change
+        self.total = 0
+        self._lines: List[str] = [''] * capacity
+        self._len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, line: str) -> None:
+        self.extend((line, ))
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """Appends many lines at once, taking the lock only once."""
+        lines = list(lines)
+        if not lines:
+            return
+
+        with self._lock:
+            kept = lines[-self.capacity:]
+            start = (self.total + len(lines) - len(kept)) % self.capacity
+            head = min(len(kept), self.capacity - start)
+            self._lines[start:start + head] = kept[:head]
+            self._lines[:len(kept) - head] = kept[head:]
+            self.total += len(lines)
+            self._len = min(self._len + len(lines), self.capacity)
+
+        if self.on_change is not None:
+            self.on_change()
+
+    def tail(self, count: int, skip: int = 0) -> List[str]:
+        """Returns the last ``count`` lines, oldest first, after leaving out
+        the ``skip`` most recent ones."""
+        with self._lock:
+            end = max(self._len - skip, 0)
+            begin = max(end - count, 0)
+            first = self.total - self._len
+            return [self._lines[(first + i) % self.capacity]
+                    for i in range(begin, end)]
+
+    def follow(self, lines: rx.Observable,
+               interval: float = 1 / 60) -> rx.abc.DisposableBase:
+        """Appends the lines emitted by ``lines``, in batches of
+        ``interval`` seconds."""
+        return lines.pipe(rxops.buffer_with_time(interval)).subscribe(
+            self.extend)
+
+
+def __log_lines_measurement_strategy(
+    lines: Tuple[str, ...],
+    offered: Measurement = Measurement.inf(),
+    **kwargs
+):
+    return Measurement(offered.w, min(len(lines), offered.h))
+
+
+@ComposableCursed(measurement_strategy=__log_lines_measurement_strategy)
+def __LogLines(
+    lines: Tuple[str, ...],
+    measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
+):
+    ms = measurement
+    if ms.w < 1:
+        return ComposableGraph(None)
+
+    clip = Rect(ms.x, ms.y, ms.w, ms.h)
+    attr = ColorPairs.get(ColorPairs.INFO)
+    return ComposableGraph(None, ops=DisplayList(
+        DrawOp(ms.x, ms.y + y, line, attr, clip)
+        for y, line in enumerate(lines[:ms.h])))
+
+
+def __log_view_measurement_strategy(
+    buffer: _LogBuffer,
+    total: int,
+    scroll: int,
+    offered: Measurement = Measurement.inf(),
+    **kwargs
+):
+    return Measurement(offered.w, min(len(buffer), offered.h))
+
+
+@ComposableCursed(measurement_strategy=__log_view_measurement_strategy)
+def __LogView(
+    buffer: _LogBuffer,
+    total: int,
+    scroll: int,
+    measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
+):
+    ms = measurement
+
+    # Rows past the start of the log are drawn empty, clearing what they
+    # showed before.
+    lines = buffer.tail(ms.h, scroll)
+    lines += [''] * (ms.h - len(lines))
+
+    # The lines are keyed on what they show, so that they are only drawn
+    # again when that changes.
+    return ComposableGraph(None, [__LogLines(
+        tuple(fit_to_width(line, ms.w) for line in lines)
+    ).build(measurement=ms)])
+
+
+def _LogView(buffer: _LogBuffer, scroll: int = 0, **kwargs) -> ComposableT:
+    """A ``LogView`` shows the tail of a ``LogBuffer``, every line truncated
+    or padded to the width of the view.
+
+    ``scroll`` is the number of lines scrolled back from the most recent
+    one, ``0`` following the log. The lines are drawn by a single node,
+    whatever the height of the view, so appending to the log redraws one
+    window. Rendered with a ``Reconciler``, a log scrolled back is not
+    redrawn at all.
+
+    .. code-block:: python
+
+       log = LogBuffer(capacity=50_000)
+       log.follow(log_lines_observable)
+       ObserverMainWindow(lambda _, **kwargs: LogView(log, **kwargs),
+                          rx.interval(1 / 30))
+    """
+    return __LogView(buffer, buffer.total, max(scroll, 0), **kwargs)
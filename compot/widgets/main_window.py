@@ -2,19 +2,52 @@
 
 from compot import CompotProgram, MeasurementSpec, wrapper
 import reactivex as rx
-import reactivex.operators as rxops
+from reactivex.disposable import SerialDisposable
 import _curses
+import asyncio
+import curses
+import math
+import os
+import select
+import signal
+import threading
+import time
 
-from compot.composable import ComposableT
+from typing import Any, Callable, Optional, Sequence, Union
 
-def _MainWindow(child, framerate=60) -> rx.Observable:
+from compot.backends import Backend, CursesBackend
+from compot.composable import ComposableT, MEASUREMENT_CACHE, Reconciler
+from compot.datastructures import Mailbox
+from compot.scheduler import FrameScheduler
+
+def _MainWindow(child, framerate=60, framebuffer=False,
+                backend: Optional[Backend] = None,
+                scheduler: Optional[FrameScheduler] = None,
+                idle_timeout: float = 0.1) -> rx.Observable:
     """The ``MainWindow`` class returns a ``reactivex.Observable`` stream that
     you can hook into to register for inputs. To use this class successfully,
     you can look at the following example:
 
     Parameters:
-        child (Composable): The child to attempt to render
-        framerate (float): The target framerate. Keep it reasonable.
+        child (Composable): The child to attempt to render, or a function
+            returning it, which is called for every frame.
+        framerate (float): The maximum framerate. Keep it reasonable.
+        framebuffer (bool): If set, widgets draw into an off-screen
+            ``FrameBuffer`` and only the cells that changed since the previous
+            frame are written to the terminal.
+        backend (Backend): The backend to render with. Overrides
+            ``framebuffer``.
+        scheduler (FrameScheduler): The scheduler deciding when to render.
+            Call its ``invalidate`` whenever something ``child`` shows
+            changed. Overrides ``framerate``.
+        idle_timeout (float): How long, in seconds, to wait for keys while
+            nothing is invalidated. This bounds how late an ``invalidate``
+            from another thread is noticed.
+
+    A frame is only rendered after a key press, a resize or a call to
+    ``scheduler.invalidate``, so an idle window sleeps. Only the parts of
+    ``child`` that changed between frames are redrawn and each frame is
+    flushed to the terminal with a single ``curses.doupdate``.
 
     .. code-block:: python
 
@@ -22,22 +55,49 @@ def _MainWindow(child, framerate=60) -> rx.Observable:
        input_obserable = MainWindow(my_composable)
        input_obserable.subscribe(on_next=lambda key: logging.info(key))
 
-    """
+    A ``ComposableT`` holds the values it was created with, so a window
+    showing data that changes must be given a function creating its child:
 
+    .. code-block:: python
 
-    def _curses_function(stdscr: '_curses._CursesWindow'):
-        height, width = stdscr.getmaxyx()
-        child.build(
-            measurement=MeasurementSpec.xywh(0, 0, width, height)).render()
+       scheduler = FrameScheduler()
+       log = LogBuffer(on_change=scheduler.invalidate)
+       MainWindow(lambda: LogView(log), scheduler=scheduler)
+    """
+    scheduler = scheduler or FrameScheduler(framerate)
+    reconciler = Reconciler()
+
+    def render(prog: CompotProgram):
+        height, width = prog.stdscr.getmaxyx()
+        with scheduler.frame():
+            MEASUREMENT_CACHE.new_frame()
+            reconciler.render(
+                child if isinstance(child, ComposableT) else child(),
+                measurement=MeasurementSpec.xywh(0, 0, width, height))
 
-        return stdscr.getch()
+    def read_key(prog: CompotProgram) -> int:
+        # Sleep in getch until a key is pressed or the next frame is due.
+        if (timeout := scheduler.time_until_due()) is None:
+            timeout = idle_timeout
+        prog.stdscr.timeout(math.ceil(timeout * 1000))
+        return prog.stdscr.getch()
 
-    def reactive_window(observer, scheduler):
-        with CompotProgram() as prog:
+    def reactive_window(observer, _):
+        with CompotProgram(
+                backend or CursesBackend(framebuffer=framebuffer)) as prog:
             try:
                 while True:
-                    if (key := _curses_function(prog.stdscr)) != -1:
+                    if scheduler.time_until_due() == 0:
+                        render(prog)
+                    if (key := read_key(prog)) == -1:
+                        continue
+
+                    if key == curses.KEY_RESIZE:
+                        prog.backend.resize()
+                        reconciler.reset()
+                    else:
                         observer.on_next(chr(key))
+                    scheduler.invalidate()
             except Exception as ex:
                 observer.on_error(ex)
             finally:
@@ -46,7 +106,13 @@ def _MainWindow(child, framerate=60) -> rx.Observable:
     return rx.create(reactive_window)
 
 
-def _ObserverMainWindow(child, data: rx.Observable):
+def _ObserverMainWindow(child, data: rx.Observable, framebuffer=False,
+                        backend: Optional[Backend] = None,
+                        framerate: Optional[float] = 60,
+                        idle_timeout: float = 0.1,
+                        distinct: Union[str, Callable, None] = None,
+                        selectors: Sequence[Callable[[Any], Any]] = ()
+                        ) -> rx.Observable:
     """The ``ObserverMainWindow`` subscribes to data and renders its children
     based on data changes.
 
@@ -54,37 +120,328 @@ def _ObserverMainWindow(child, data: rx.Observable):
 
     .. code-block:: python
 
-       ObserverMainWindow(MyCustomWidget, my_data_to_subscribe_to)
+       keys = ObserverMainWindow(MyCustomWidget, my_data_to_subscribe_to)
+       keys.subscribe(on_next=lambda key: logging.info(key))
+
+    ``framebuffer`` and ``backend`` behave like in ``MainWindow``.
+
+    States emitted by ``data`` are dropped into a single-slot mailbox and
+    rendered by a dedicated render thread, so ``on_next`` never blocks the
+    producer. States emitted faster than ``framerate`` are coalesced, the
+    latest one winning. Keys are read on a separate input thread, which
+    checks for resizes every ``idle_timeout`` seconds, and are emitted by the
+    returned observable.
+
+    If rendering fails, the window stops, the subscription to ``data`` is
+    disposed and the error is passed to the observers of the keys. When
+    nothing observes the keys, the error is raised on the render thread
+    instead, so it is reported by ``threading.excepthook``.
+
+    States that would render the same as the previous one are skipped,
+    without calling ``child``:
+
+    * ``distinct='identity'`` skips a state that is the previous state.
+    * ``distinct='equality'`` skips a state equal to the previous state.
+    * ``distinct=key`` skips a state whose ``key(state)`` equals the one of the
+      previous state.
+    * With ``selectors``, ``child`` is called with ``selector(state)`` for
+      every selector instead of the state, and the state is skipped if all
+      those values equal the previous ones. Passing every part of the state
+      as its own argument lets the ``Reconciler`` reuse the parts of the view
+      whose selected values did not change.
+
+    .. code-block:: python
+
+       @Composable
+       def Dashboard(header, rows, measurement=MeasurementSpec.INJECTED()):
+           ...
+
+       ObserverMainWindow(Dashboard, states,
+                          selectors=(lambda s: s.header, lambda s: s.rows))
 
     Note:
         The ``CompotProgram`` will not be closed until you call
         ``on_completed`` on the observable. This means that if you abruptly
         exit the program, your terminal **will be ruined**. Make sure you call
         ``on_completed``.
-
-    Todo:
-        Support key events.
     """
-    prog = CompotProgram()
+    if isinstance(distinct, str) and distinct not in ('identity', 'equality'):
+        raise ValueError(f'Unknown distinct mode {distinct!r}.')
+    prog = CompotProgram(backend or CursesBackend(framebuffer=framebuffer))
+    reconciler = Reconciler()
+    scheduler = FrameScheduler(framerate)
+    mailbox = Mailbox()
+    keys = rx.Subject()
+    # curses is not thread-safe, so the threads take turns using it.
+    curses_lock = threading.Lock()
+    resized = threading.Event()
+    subscription = SerialDisposable()
 
-    def rerender_window(state):
-        max_h, max_w = prog.stdscr.getmaxyx()
+    def unchanged(previous, current) -> bool:
+        if previous is None:
+            return False
+        (previous_state, previous_key, previous_args), (state, key, args) = \
+            previous, current
+        if distinct == 'identity':
+            return previous_state is state
+        if distinct == 'equality':
+            return previous_state == state
+        if distinct is not None:
+            return previous_key == key
+        return bool(selectors) and previous_args == args
 
+    def render_loop():
+        previous = None
+        error = None
         try:
-            child(
-                state,
-                measurement=MeasurementSpec.xywh(0, 0, max_w, max_h)
-            ).build().render()
-            prog.stdscr.getch()
+            while True:
+                state = mailbox.take()
+                args = tuple(selector(state) for selector in selectors) \
+                    if selectors else (state, )
+                current = (state,
+                           distinct(state) if callable(distinct) else None,
+                           args)
+                if resized.is_set():
+                    resized.clear()
+                    prog.backend.resize()
+                    reconciler.reset()
+                elif unchanged(previous, current):
+                    continue
+                previous = current
+
+                max_h, max_w = prog.stdscr.getmaxyx()
+                with curses_lock, scheduler.frame():
+                    MEASUREMENT_CACHE.new_frame()
+                    reconciler.render(child(
+                        *args,
+                        measurement=MeasurementSpec.xywh(0, 0, max_w, max_h)
+                    ))
+                # States arriving meanwhile are coalesced into the next frame.
+                time.sleep(scheduler.time_until_due() or 0)
+        except EOFError:
+            pass
         except Exception as err:
+            error = err
+        finally:
+            mailbox.close()
+            subscription.dispose()
+            input_thread.join()
             prog.close()
-            raise err
 
-    def close():
-        prog.close()
+        # The terminal is only handed back once it was restored.
+        if error is None:
+            keys.on_completed()
+        elif keys.observers:
+            keys.on_error(error)
+        else:
+            raise error
+
+    def input_loop():
+        fd = prog.backend.fileno()
+        prog.stdscr.timeout(0)
+        while not mailbox.closed:
+            if fd is None:
+                time.sleep(idle_timeout)
+            else:
+                select.select([fd], [], [], idle_timeout)
+
+            with curses_lock:
+                pressed = list(iter(prog.stdscr.getch, -1))
+            for key in pressed:
+                if key == curses.KEY_RESIZE:
+                    resized.set()
+                    mailbox.redeliver()
+                else:
+                    keys.on_next(chr(key))
+
+    def on_next(state):
+        mailbox.put(state)
+        scheduler.invalidate()
+
+    def on_error(error):
+        keys.on_error(error)
+        mailbox.close()
+
+    input_thread = threading.Thread(target=input_loop, daemon=True,
+                                    name='compot-input')
+    render_thread = threading.Thread(target=render_loop,
+                                     name='compot-render')
+    input_thread.start()
+    render_thread.start()
+    subscription.disposable = data.subscribe(on_next, on_error,
+                                             mailbox.close)
+    return keys
+
+
+class _AsyncMainWindow:
+    """The ``AsyncMainWindow`` renders ``child`` on the running ``asyncio``
+    event loop, so that the interface and the coroutines feeding it share one
+    thread.
+
+    Keys are read with ``loop.add_reader`` as soon as the terminal has input,
+    rather than by polling ``getch``, and can be consumed with ``async for``.
+    Frames are rendered by a task of the same loop, only once something was
+    invalidated and at most ``framerate`` times per second. Assigning
+    ``child`` invalidates the window. If rendering a frame fails, the
+    rendering stops and ``async for`` raises the error.
+
+    Example:
+
+    .. code-block:: python
+
+       async def main():
+           async with AsyncMainWindow(MyView(state)) as window:
+               async for key in window:
+                   if key == 'q':
+                       break
+                   window.child = MyView(state)
+
+    Parameters:
+        child (Composable): The child to render.
+        framerate (float): The maximum framerate.
+        framebuffer (bool): See ``MainWindow``.
+        backend (Backend): See ``MainWindow``. Backends without a ``fileno``
+            are polled for keys every ``idle_timeout`` seconds.
+        idle_timeout (float): See above.
+    """
+    def __init__(self, child: ComposableT, framerate: Optional[float] = 60,
+                 framebuffer: bool = False,
+                 backend: Optional[Backend] = None,
+                 idle_timeout: float = 0.1) -> None:
+        self._child = child
+        self.backend = backend or CursesBackend(framebuffer=framebuffer)
+        self.scheduler = FrameScheduler(framerate)
+        self.idle_timeout = idle_timeout
+        self.reconciler = Reconciler()
+        self.prog: Optional[CompotProgram] = None
+        # Both are made on entering, as they are bound to the running loop
+        # on Python 3.8 and 3.9.
+        self._keys: Optional['asyncio.Queue[Optional[str]]'] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._fd: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._renderer: Optional[asyncio.Task] = None
+        self._poller: Optional[asyncio.TimerHandle] = None
+        self._error: Optional[Exception] = None
+
+    @property
+    def child(self) -> ComposableT:
+        return self._child
+
+    @child.setter
+    def child(self, child: ComposableT) -> None:
+        self._child = child
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Requests a frame. This must be called on the event loop, use
+        ``loop.call_soon_threadsafe`` from other threads."""
+        self.scheduler.invalidate()
+        if self._wake is not None:
+            self._wake.set()
+
+    async def __aenter__(self) -> '_AsyncMainWindow':
+        self._loop = asyncio.get_running_loop()
+        self._keys = asyncio.Queue()
+        self._wake = asyncio.Event()
+        self._error = None
+        self.prog = CompotProgram(self.backend)
+        try:
+            self.prog.stdscr.timeout(0)
+            if (fd := self.backend.fileno()) is not None:
+                self._fd = fd
+                self._loop.add_reader(fd, self._read_keys)
+                if hasattr(signal, 'SIGWINCH'):
+                    self._loop.add_signal_handler(signal.SIGWINCH,
+                                                  self._on_sigwinch)
+            else:
+                self._poll_keys()
+            self._renderer = self._loop.create_task(self._render_loop())
+        except BaseException:
+            # The terminal is restored even if the window cannot start.
+            await self._close()
+            raise
+        return self
+
+    async def __aexit__(self, err_type, err_class, err_obj) -> None:
+        await self._close()
+
+    async def _close(self) -> None:
+        try:
+            if self._fd is not None:
+                self._loop.remove_reader(self._fd)
+                if hasattr(signal, 'SIGWINCH'):
+                    self._loop.remove_signal_handler(signal.SIGWINCH)
+                self._fd = None
+            if self._poller is not None:
+                self._poller.cancel()
+                self._poller = None
+
+            if self._renderer is not None:
+                self._renderer.cancel()
+                try:
+                    await self._renderer
+                except asyncio.CancelledError:
+                    pass
+                self._renderer = None
+        finally:
+            self.prog.close()
+            self._keys.put_nowait(None)
+
+    def __aiter__(self) -> '_AsyncMainWindow':
+        return self
+
+    async def __anext__(self) -> str:
+        if (key := await self._keys.get()) is None:
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        return key
+
+    async def _render_loop(self) -> None:
+        try:
+            while True:
+                if (delay := self.scheduler.time_until_due()) is None:
+                    self._wake.clear()
+                    await self._wake.wait()
+                elif delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    self._render()
+                    # Let the producers run between two frames.
+                    await asyncio.sleep(0)
+        except Exception as err:
+            # The keys are consumed by the task that can handle the error.
+            self._error = err
+            self._keys.put_nowait(None)
+
+    def _render(self) -> None:
+        height, width = self.prog.stdscr.getmaxyx()
+        with self.scheduler.frame():
+            MEASUREMENT_CACHE.new_frame()
+            self.reconciler.render(
+                self._child,
+                measurement=MeasurementSpec.xywh(0, 0, width, height))
+
+    def _read_keys(self) -> None:
+        while (key := self.prog.stdscr.getch()) != -1:
+            if key == curses.KEY_RESIZE:
+                self._resize()
+            else:
+                self._keys.put_nowait(chr(key))
+                self.invalidate()
+
+    def _poll_keys(self) -> None:
+        self._read_keys()
+        self._poller = self._loop.call_later(self.idle_timeout,
+                                             self._poll_keys)
 
-    def on_err(error):
-        prog.close()
+    def _on_sigwinch(self) -> None:
+        columns, lines = os.get_terminal_size(self.backend.fileno())
+        curses.resizeterm(lines, columns)
+        self._resize()
 
-    data.pipe(rxops.sample(1 / 60)).subscribe(
-        rerender_window, on_err, close)
+    def _resize(self) -> None:
+        self.backend.resize()
+        self.reconciler.reset()
+        self.invalidate()
@@ -1,11 +1,18 @@
 #!/usr/bin/env python
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
+from functools import lru_cache
 from math import floor
-from typing import Dict
-from compot import ColorPairs, LayoutSpec, MeasurementSpec
-from compot.composable import Composable
-from compot.widgets import Row, RowSpacing, Text, TextStyleSpec
+from typing import Dict, Iterable, Sequence, Tuple
+from compot import ColorPairs, Measurement, MeasurementSpec
+from compot.composable import ComposableCursed, ComposableGraph, ComposableT
+from compot.display_list import DisplayList, DrawOp, Rect
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 BLOCK_MAP = {
     0/8: ' ',
@@ -19,8 +26,13 @@ BLOCK_MAP = {
     8/8: '█'
 }
 
-def _round_to_eighth(x: float) -> float:
-    return round(x * 8) / 8
+# The thresholds and colors of the segments of a bar.
+Segments = Tuple[Tuple[float, ColorPairs], ...]
+# The number of full segments, full blocks and eighths of a block of the
+# partially filled segment of a bar.
+Fill = Tuple[int, int, int]
+# The relative column, text and color of every run of a bar.
+Runs = Tuple[Tuple[int, str, ColorPairs], ...]
 
 @dataclass
 class _ProgressBarStyle:
@@ -31,49 +43,173 @@ class _ProgressBarStyle:
             3/3: {'color': ColorPairs.OK}
         })
 
-@Composable
-def _ProgressBar(
+    @property
+    def segments_key(self) -> Segments:
+        return tuple((threshold, s_style['color'])
+                     for threshold, s_style in self.segments.items())
+
+
+def _fill(progress: float, segments: Segments, avail_space: int) -> Fill:
+    """Returns how much of a bar of ``avail_space`` cells ``progress``
+    fills."""
+    progress = min(max(progress, 0.0), 1.0)
+    full_segments = bisect_right([t for t, _ in segments], progress)
+    last_threshold = segments[full_segments - 1][0] if full_segments else 0
+    # The full segments cover whole cells, see ``_bar_runs``, so the partial
+    # one fills whatever they leave of the progress.
+    remaining_progress = progress * avail_space \
+        - int(last_threshold * avail_space)
+    partial_size = int(floor(remaining_progress))
+    eighths = round((remaining_progress - partial_size) * 8)
+    return (full_segments, partial_size, eighths)
+
+
+def _fills(progresses: Sequence[float], segments: Segments,
+           avail_space: int) -> Iterable[Fill]:
+    """Computes ``_fill`` of every progress at once, with ``numpy`` if it is
+    installed."""
+    if numpy is None:
+        return (_fill(p, segments, avail_space) for p in progresses)
+
+    thresholds = numpy.array([t for t, _ in segments], dtype=float)
+    progress = numpy.clip(numpy.asarray(progresses, dtype=float), 0.0, 1.0)
+    full_segments = numpy.searchsorted(thresholds, progress, side='right')
+    last_threshold = numpy.concatenate(([0.0], thresholds))[full_segments]
+    remaining_progress = progress * avail_space \
+        - numpy.floor(last_threshold * avail_space)
+    partial_size = numpy.floor(remaining_progress)
+    eighths = numpy.round((remaining_progress - partial_size) * 8)
+    return zip(full_segments.tolist(),
+               partial_size.astype(int).tolist(),
+               eighths.astype(int).tolist())
+
+
+@lru_cache(maxsize=4096)
+def _bar_runs(w: int, segments: Segments, fill: Fill) -> Runs:
+    """Returns the runs drawing a bar ``w`` cells wide. Bars with the same
+    fill share their runs, glyph strings included."""
+    avail_space = w - 2
+    full_segments, partial_size, eighths = fill
+
+    runs = [(0, '[', ColorPairs.INFO)]
+    x = 1
+    for threshold, color in segments[:full_segments]:
+        # Segments end where their threshold does, so that rounding errors
+        # do not add up and a full bar is full.
+        txt_size = 1 + int(threshold * avail_space) - x
+        runs.append((x, BLOCK_MAP[1.0] * txt_size, color))
+        x += txt_size
+
+    color = segments[min(full_segments, len(segments) - 1)][1]
+    runs.append((x, BLOCK_MAP[1.0] * partial_size + BLOCK_MAP[eighths / 8],
+                 color))
+    x = min(x + partial_size + 1, w - 1)
+    runs.append((x, ' ' * (w - 1 - x) + ']', ColorPairs.INFO))
+
+    # Nothing but the closing bracket may be drawn past the inside of the
+    # bar.
+    return tuple(
+        (rx, text if color is ColorPairs.INFO else text[:max(w - 1 - rx, 0)],
+         color)
+        for rx, text, color in runs
+        if text and (color is ColorPairs.INFO or rx < w - 1))
+
+
+def _bar_ops(x: int, y: int, w: int, runs: Runs) -> Iterable[DrawOp]:
+    clip = Rect(x, y, w, 1)
+    return (DrawOp(x + rx, y, text, ColorPairs.get(color), clip)
+            for rx, text, color in runs)
+
+
+def __progressbar_measurement_strategy(
     progress,
     *args,
+    offered: Measurement = Measurement.inf(),
+    **kwargs
+):
+    if offered.h < 1:
+        raise ValueError('A progress bar requires 1 character of height.')
+
+    return Measurement(offered.w, 1)
+
+
+@ComposableCursed(__progressbar_measurement_strategy, memo=True)
+def _ProgressBar(
+    progress: float,
+    *args,
     measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
     style: _ProgressBarStyle = _ProgressBarStyle(),
     **kwargs
 ):
-    avail_space = measurement.w - 2
-
-    last_threshold = 0
-    threshold_up = 0
-
-    # Create a list of segments that are fully filled out.
-    full_segments = []
-    for threshold, s_style in style.segments.items():
-        if progress < threshold:
-            threshold_up = threshold
-            break
-        txt_size = int((threshold - last_threshold) * avail_space)
-        full_segments.append(
-            Text(BLOCK_MAP[1.0] * txt_size,
-                 style=TextStyleSpec(color=s_style['color']))
-        )
-        last_threshold = threshold
-
-    # Create a partial segment then.
-    remaining_progress = (progress - last_threshold) * avail_space
-    partial_size = int(floor(remaining_progress))
-    rounded = _round_to_eighth(remaining_progress - partial_size)
-    partial_segment = Text(
-        BLOCK_MAP[1.0] * partial_size + BLOCK_MAP[rounded],
-        style=TextStyleSpec(color=style.segments[threshold_up]['color'])
-    )
-
-    return Row(
-        (
-            Row((Text('['), Row(full_segments + [partial_segment]))),
-            Row((Text(']'), ))
-        ),
-        *args,
-        measurement=measurement,
-        layout=LayoutSpec.FILL,
-        spacing=RowSpacing.SPACE_BETWEEN,
-        **kwargs,
-    )
+    """A ``ProgressBar`` fills the width it is given with a bar showing
+    ``progress``, a number between ``0`` and ``1``, colored by the segment of
+    ``style`` it reached.
+
+    The bar is drawn directly as one attributed run per color. It is no
+    longer a ``Row``, so the other arguments, such as ``layout`` or
+    ``spacing``, are accepted but ignored: the bar always fills its
+    measurement.
+    """
+    ms = measurement
+    if ms.w < 1:
+        return ComposableGraph(None)
+
+    segments = style.segments_key
+    runs = _bar_runs(ms.w, segments, _fill(progress, segments, ms.w - 2))
+    return ComposableGraph(None, ops=DisplayList(
+        _bar_ops(ms.x, ms.y, ms.w, runs)))
+
+
+def __progressbar_grid_measurement_strategy(
+    progresses,
+    columns: int = 1,
+    offered: Measurement = Measurement.inf(),
+    **kwargs
+):
+    if offered.h < 1:
+        raise ValueError(
+            'A progress bar grid requires 1 character of height.')
+
+    return Measurement(offered.w, min(-(-len(progresses) // columns),
+                                      offered.h))
+
+
+@ComposableCursed(__progressbar_grid_measurement_strategy, memo=True)
+def __ProgressBarGrid(
+    progresses: Sequence[float],
+    columns: int = 1,
+    measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
+    style: _ProgressBarStyle = _ProgressBarStyle(),
+):
+    ms = measurement
+    bar_w = ms.w // columns
+    if bar_w < 1:
+        return ComposableGraph(None)
+
+    segments = style.segments_key
+    visible = progresses[:columns * ms.h]
+    ops = []
+    for i, fill in enumerate(_fills(visible, segments, bar_w - 2)):
+        ops.extend(_bar_ops(ms.x + (i % columns) * bar_w,
+                            ms.y + i // columns, bar_w,
+                            _bar_runs(bar_w, segments, fill)))
+    return ComposableGraph(None, ops=DisplayList(ops))
+
+
+def _ProgressBarGrid(
+    progresses: Sequence[float],
+    columns: int = 1,
+    **kwargs
+) -> ComposableT:
+    """A ``ProgressBarGrid`` draws a ``ProgressBar`` for every value of
+    ``progresses``, ``columns`` bars per line, as a single widget. The fill
+    of every bar is computed in one pass, vectorized if ``numpy`` is
+    installed, and bars with the same fill share their glyph strings.
+
+    ``progresses`` may be any sequence of numbers, including a ``numpy``
+    array. Bars that do not fit the measurement are not drawn.
+    """
+    if columns < 1:
+        raise ValueError('A progress bar grid needs a column.')
+
+    return __ProgressBarGrid(progresses, columns, **kwargs)
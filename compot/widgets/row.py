@@ -2,11 +2,12 @@
 
 from enum import IntEnum
 
-from typing import Iterable
+from typing import Any, Iterable, Optional, Sequence
 
 from compot.composable import ComposableGraph, Measurement, ComposableCursed, \
-    ComposableT
+    ComposableT, MEASUREMENT_CACHE
 from compot import LayoutSpec, MeasurementSpec
+from compot.layout import Axis, Constraints, LinearLayout
 
 
 class _RowSpacing(IntEnum):
@@ -16,7 +17,8 @@ class _RowSpacing(IntEnum):
     If set to ``NONE`` then the children will have no spacing between them and
     will be placed all on the left of the row.
     If set to ``SPACE_BETWEEN`` then all the children will be placed in such a
-    manner such that the space between them is maximized.
+    manner such that the space between them is maximized. A single child is
+    placed on the left.
 
     An example diagram is:
 
@@ -30,36 +32,69 @@ class _RowSpacing(IntEnum):
     SPACE_BETWEEN = 1
 
 
+def _row_layout(children: Sequence[ComposableT], w: int,
+                layout: LayoutSpec, spacing: _RowSpacing) -> LinearLayout:
+    return MEASUREMENT_CACHE.layout_linear(
+        children, Constraints(0, w, 0, 1), Axis.HORIZONTAL,
+        fill=layout == LayoutSpec.FILL,
+        space_between=spacing == _RowSpacing.SPACE_BETWEEN)
+
+
 def __row_measurement_strategy(
-        children: Iterable[ComposableT],
+        children: Sequence[ComposableT],
         layout: LayoutSpec = LayoutSpec.FIT_CONTENT,
+        spacing: _RowSpacing = _RowSpacing.NONE,
         offered: Measurement = Measurement.inf(),
         **kwargs
 ):
     if offered.h < 1:
         raise ValueError('Row requires 1 character of height.')
-
-    if layout == LayoutSpec.FIT_CONTENT:
-        return Measurement(
-            min(sum(c.measurement_strategy(*c.args, **c.kwargs).w \
-                    for c in children), offered.w), 1)
     if layout == LayoutSpec.FILL:
         return Measurement(offered.w, 1)
 
-    return Measurement(offered.w, 1)
+    return Measurement(
+        _row_layout(children, offered.w, layout, spacing).size.w, 1)
 
-@ComposableCursed(measurement_strategy=__row_measurement_strategy)
-def _Row(
-    children: Iterable[ComposableT],
+@ComposableCursed(measurement_strategy=__row_measurement_strategy,
+                  memo=True)
+def __Row(
+    children: Sequence[ComposableT],
     measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
     layout: LayoutSpec = LayoutSpec.FIT_CONTENT,
-    spacing: _RowSpacing = _RowSpacing.NONE
+    spacing: _RowSpacing = _RowSpacing.NONE,
+    constraints: Optional[Constraints] = None,
 ):
+    ms = measurement
+    w = constraints.max_w if constraints is not None else ms.w
+
+    children_windows = []
+    for child, x, y, child_w, child_h, child_constraints in _row_layout(
+            children, w, layout, spacing).clipped(children, ms.w, ms.h):
+        children_windows.append(child.build(
+            measurement=MeasurementSpec.xywh(
+                ms.x + x, ms.y + y, child_w, child_h),
+            constraints=child_constraints))
+
+    return ComposableGraph(None, children_windows)
+
+
+def _Row(children: Iterable[ComposableT], *args: Any,
+         **kwargs: Any) -> ComposableT:
     """A Row is a fundamental ``Composable`` widget that displays its elements
     in a single 1-character-high row.
 
+    Children are laid out once per frame, see
+    ``compot.layout.layout_linear``. Children with a ``flex`` weight share the
+    width the others leave, which makes the ``Row`` fill its width.
+
+    A ``Row`` is memoized: built again with children whose arguments are
+    equal, it reuses its previous graph. Arguments that are not hashable by
+    value, other than containers and dataclasses, are compared by identity,
+    so objects changed in place must be ``Versioned`` to be drawn again.
+
     Parameters:
-        children (Iterable[ComposableT]): The children to render.
+        children (Iterable[ComposableT]): The children to render. Iterables
+            that are not sequences, like generators, are made into a tuple.
         measurement (MeasurementSpec): The measurement specification the
             ``Row`` should adhere to. Usually, this is unnecessary as the
             parent will inject its ``MeasurementSpec`` into the ``Row``.
@@ -69,38 +104,10 @@ def _Row(
             will adhere to whatever dimensions the parent requested.
         spacing (RowSpacing): The spacing strategy the ``Row`` should adhere
             to. This is only relevant if layout is set to ``LayoutSpec.FILL``.
+        constraints (Constraints): The constraints the ``Row`` was measured
+            with, injected like the measurement.
     """
-    ms = measurement
-
-    # Let us first measure the children.
-    total_children_width = 0
-    children_widths = []
-    child_count = 0
-    for child in children:
-        child_width = child.measurement_strategy(
-            *child.args,
-            offered=Measurement(ms.w - total_children_width, 1),
-            **child.kwargs
-        ).w
-        children_widths.append(child_width)
-        total_children_width += child_width
-        child_count += 1
-
-    padding = (ms.w - total_children_width) // (child_count - 1) \
-        if spacing == _RowSpacing.SPACE_BETWEEN \
-        else 0
-
-    children_windows = []
-    x_pos = 0
-    for child, child_width in zip(children, children_widths):
-        child_window = child.build(
-            measurement=MeasurementSpec.xywh(
-                ms.x + x_pos, measurement.y,
-                child_width,
-        1))
-
-        x_pos += child_width + padding
-        children_windows += [child_window]
-
-
-    return ComposableGraph(None, children_windows)
+    if not isinstance(children, Sequence):
+        # The children are measured and built more than once.
+        children = tuple(children)
+    return __Row(children, *args, **kwargs)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+
+import threading
+from enum import IntEnum
+from typing import Iterable, Optional, Tuple
+from compot import ColorPairs, Measurement, MeasurementSpec
+
+from compot.composable import ComposableCursed, ComposableGraph, ComposableT
+from compot.display_list import DisplayList, DrawOp, Rect
+from compot.widgets.progressbar import BLOCK_MAP
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The glyphs of a column filled up to every eighth of a cell.
+VERTICAL_BLOCK_MAP = {
+    0/8: ' ',
+    1/8: '▁',
+    2/8: '▂',
+    3/8: '▃',
+    4/8: '▄',
+    5/8: '▅',
+    6/8: '▆',
+    7/8: '▇',
+    8/8: BLOCK_MAP[1.0],
+}
+
+# The bit of every dot of a braille character, by dot row, from the top,
+# and dot column.
+BRAILLE_DOTS = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+BRAILLE_BASE = 0x2800
+
+
+class _SparklineGlyphs(IntEnum):
+    # Every column is filled up to its maximum, in eighths of a cell.
+    BLOCKS = 0
+    # Every cell holds two columns of four dots, each drawing the range
+    # between the minimum and the maximum of its column.
+    BRAILLE = 1
+
+
+class _SeriesBuffer:
+    """A thread-safe ring buffer holding the last ``capacity`` samples of a
+    time series in a ``numpy`` array.
+
+    The samples are grouped in chunks of ``chunk`` samples, whose minimum
+    and maximum are kept up to date as samples are appended, so that a
+    series can be downsampled without reading its samples. ``total`` counts
+    every sample ever appended.
+    """
+    def __init__(self, capacity: int = 1_000_000,
+                 chunk: Optional[int] = None) -> None:
+        if numpy is None:
+            raise ImportError('A SeriesBuffer requires numpy, install '
+                              'compot[numpy].')
+        if capacity < 1:
+            raise ValueError('A series buffer needs room for a sample.')
+
+        self.chunk = chunk or max(1, capacity // 4096)
+        # The capacity is rounded up to whole chunks.
+        self.capacity = -(-capacity // self.chunk) * self.chunk
+        self.total = 0
+        self._values = numpy.zeros(self.capacity)
+        self._mins = numpy.full(self.capacity // self.chunk, numpy.inf)
+        self._maxs = numpy.full(self.capacity // self.chunk, -numpy.inf)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append(self, sample: float) -> None:
+        self.extend((sample, ))
+
+    def extend(self, samples: Iterable[float]) -> None:
+        """Appends many samples at once, updating only the chunks they fall
+        in."""
+        samples = numpy.asarray(
+            samples if hasattr(samples, '__len__') else list(samples),
+            dtype=float).ravel()
+        if not len(samples):
+            return
+
+        with self._lock:
+            kept = samples[-self.capacity:]
+            start = (self.total + len(samples) - len(kept)) % self.capacity
+            self._values[(start + numpy.arange(len(kept))) % self.capacity] \
+                = kept
+            self.total += len(samples)
+
+            chunks = len(self._mins)
+            first = start // self.chunk
+            last = (start + len(kept) - 1) // self.chunk
+            touched = numpy.arange(first, last + 1) % chunks \
+                if last - first < chunks else numpy.arange(chunks)
+            blocks = self._values.reshape(chunks, self.chunk)[touched]
+            self._mins[touched] = blocks.min(axis=1)
+            self._maxs[touched] = blocks.max(axis=1)
+
+    def values(self) -> 'numpy.ndarray':
+        """Returns a copy of the samples, oldest first."""
+        with self._lock:
+            head = self.total % self.capacity
+            if self.total <= self.capacity:
+                return self._values[:head].copy()
+            return numpy.concatenate((self._values[head:],
+                                      self._values[:head]))
+
+    def downsample(self, columns: int
+                   ) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+        """Returns the minimum and the maximum of the samples of at most
+        ``columns`` consecutive buckets, oldest first.
+
+        Series much longer than ``columns`` are bucketed by whole chunks, in
+        time independent of their length. The oldest samples of a full
+        buffer may then be left out, at most a chunk of them.
+        """
+        if len(self) <= 2 * columns * self.chunk:
+            values = self.values()
+            return self.__bucket(values, values, columns)
+
+        with self._lock:
+            head = self.total % self.capacity
+            head_chunk, partial = divmod(head, self.chunk)
+            chunks = len(self._mins)
+            if self.total <= self.capacity:
+                order = numpy.arange(head_chunk)
+            else:
+                order = (head_chunk + (partial > 0)
+                         + numpy.arange(chunks - (partial > 0))) % chunks
+            mins, maxs = self._mins[order], self._maxs[order]
+            if partial:
+                newest = self._values[head - partial:head]
+                mins = numpy.append(mins, newest.min())
+                maxs = numpy.append(maxs, newest.max())
+        return self.__bucket(mins, maxs, columns)
+
+    @staticmethod
+    def __bucket(mins: 'numpy.ndarray', maxs: 'numpy.ndarray', columns: int
+                 ) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+        if len(mins) <= columns:
+            return mins, maxs
+        starts = numpy.linspace(0, len(mins), columns,
+                                endpoint=False).astype(int)
+        return (numpy.minimum.reduceat(mins, starts),
+                numpy.maximum.reduceat(maxs, starts))
+
+
+def _scale(values: 'numpy.ndarray', low: float, high: float,
+           levels: int) -> 'numpy.ndarray':
+    """Maps ``values`` between ``low`` and ``high`` to levels between ``0``
+    and ``levels``. A flat series, without a range to map, is drawn half way
+    up rather than hidden at level ``0``."""
+    if high == low:
+        return numpy.full(len(values), levels // 2)
+    return numpy.clip(numpy.round((values - low) / (high - low) * levels),
+                      0, levels).astype(int)
+
+
+def _block_lines(maxs: 'numpy.ndarray', low: float, high: float,
+                 h: int) -> Iterable[str]:
+    glyphs = numpy.array(list(VERTICAL_BLOCK_MAP.values()))
+    levels = _scale(maxs, low, high, 8 * h)
+    for row in range(h - 1, -1, -1):
+        yield ''.join(glyphs[numpy.clip(levels - 8 * row, 0, 8)])
+
+
+def _braille_lines(mins: 'numpy.ndarray', maxs: 'numpy.ndarray',
+                   low: float, high: float, h: int) -> Iterable[str]:
+    bottoms = _scale(mins, low, high, 4 * h - 1)
+    tops = _scale(maxs, low, high, 4 * h - 1)
+    if len(bottoms) % 2:
+        # An odd last column leaves the right dots of its cell blank.
+        bottoms, tops = numpy.append(bottoms, 1), numpy.append(tops, 0)
+
+    # The dots lit in every dot row, from the bottom, and dot column.
+    dots = numpy.arange(4 * h)[:, None]
+    lit = (dots >= bottoms) & (dots <= tops)
+    cells = lit[::-1].reshape(h, 4, -1, 2) * numpy.array(BRAILLE_DOTS)[
+        None, :, None, :]
+    for codes in cells.sum(axis=(1, 3)) + BRAILLE_BASE:
+        yield ''.join(map(chr, codes.tolist()))
+
+
+def __sparkline_measurement_strategy(
+    series: _SeriesBuffer,
+    total: int,
+    height: int,
+    glyphs: _SparklineGlyphs,
+    low: Optional[float],
+    high: Optional[float],
+    color: ColorPairs,
+    offered: Measurement = Measurement.inf(),
+    **kwargs
+):
+    if offered.h < 1:
+        raise ValueError('A sparkline requires 1 character of height.')
+
+    return Measurement(offered.w, min(height, offered.h))
+
+
+@ComposableCursed(measurement_strategy=__sparkline_measurement_strategy)
+def __Sparkline(
+    series: _SeriesBuffer,
+    total: int,
+    height: int,
+    glyphs: _SparklineGlyphs,
+    low: Optional[float],
+    high: Optional[float],
+    color: ColorPairs,
+    measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
+):
+    ms = measurement
+    if ms.w < 1 or not len(series):
+        return ComposableGraph(None)
+
+    columns = ms.w * (2 if glyphs == _SparklineGlyphs.BRAILLE else 1)
+    mins, maxs = series.downsample(columns)
+    low = float(mins.min()) if low is None else low
+    high = float(maxs.max()) if high is None else high
+    lines = _braille_lines(mins, maxs, low, high, ms.h) \
+        if glyphs == _SparklineGlyphs.BRAILLE \
+        else _block_lines(maxs, low, high, ms.h)
+
+    # The most recent samples are drawn against the right edge.
+    x = ms.x + ms.w - -(-len(mins) * ms.w // columns)
+    clip = Rect(ms.x, ms.y, ms.w, ms.h)
+    attr = ColorPairs.get(color)
+    return ComposableGraph(None, ops=DisplayList(tuple(
+        DrawOp(x, ms.y + y, line, attr, clip)
+        for y, line in enumerate(lines)
+    )))
+
+
+def _Sparkline(
+    series: _SeriesBuffer,
+    height: int = 1,
+    glyphs: _SparklineGlyphs = _SparklineGlyphs.BLOCKS,
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+    color: ColorPairs = ColorPairs.INFO,
+    **kwargs
+) -> ComposableT:
+    """A ``Sparkline`` charts the samples of ``series`` over the width it is
+    given and ``height`` lines, the most recent samples on the right.
+
+    Series longer than the chart is wide are downsampled, every column
+    showing the minimum and maximum of its samples, from the chunks of
+    ``series``, so the cost of a frame does not depend on the length of the
+    series. The vertical axis spans ``low`` to ``high``, by default the
+    range of the shown samples.
+
+    .. code-block:: python
+
+       latencies = SeriesBuffer(capacity=1_000_000)
+       latencies.extend(new_latencies)
+       Sparkline(latencies, height=4, glyphs=SparklineGlyphs.BRAILLE)
+    """
+    return __Sparkline(series, series.total, height, glyphs, low, high,
+                       color, **kwargs)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+
+import curses
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+from compot import ColorPairs, Measurement, MeasurementSpec
+
+from compot.composable import ComposableCursed, ComposableGraph, ComposableT
+from compot.display_list import DisplayList, DrawOp, Rect
+from compot.text_width import fit_to_width, text_widths
+from compot.widgets.lazy_column import _LazyColumnState
+
+
+class _TableData:
+    """The columnar data shown by a ``Table``.
+
+    Every column is stored as a list of values and a list of the strings
+    they are shown as. The width of every column is maintained as rows are
+    added. Sorting and filtering never move rows around, they compute an
+    index array of the rows to show, in order, which is cached until the
+    sort or the filter change. Appended rows are filtered on their own and
+    inserted into the cached index.
+
+    ``version`` changes whenever anything shown by the table does, which is
+    what the ``Table`` is keyed on.
+
+    Example:
+
+    .. code-block:: python
+
+       data = TableData(('PID', 'Name', 'CPU %'))
+       data.extend((p.pid, p.name, p.cpu) for p in processes)
+       data.sort_by('CPU %', reverse=True)
+       data.filter(lambda row: row[1].startswith('python'))
+    """
+    def __init__(self, headers: Sequence[str],
+                 formatter: Callable[[Any], str] = str) -> None:
+        self.headers = tuple(headers)
+        self.formatter = formatter
+        self.version = 0
+        self._values: List[List[Any]] = [[] for _ in self.headers]
+        self._cells: List[List[str]] = [[] for _ in self.headers]
+        self._widths = text_widths(self.headers)
+        self._sort: Optional[Tuple[int, bool]] = None
+        self._filter: Optional[Callable[[Tuple[Any, ...]], bool]] = None
+        self._index: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        """Returns the number of rows, filtered out ones included."""
+        return len(self._values[0]) if self._values else 0
+
+    @property
+    def widths(self) -> Tuple[int, ...]:
+        """The width of the widest cell of every column, header included."""
+        return tuple(self._widths)
+
+    def row(self, index: int) -> Tuple[Any, ...]:
+        """Returns the values of the row ``index``."""
+        return tuple(values[index] for values in self._values)
+
+    def cells(self, index: int) -> Tuple[str, ...]:
+        """Returns the strings shown for the row ``index``."""
+        return tuple(cells[index] for cells in self._cells)
+
+    def append(self, row: Sequence[Any]) -> None:
+        self.extend((row, ))
+
+    def extend(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Appends rows, measuring only the new cells."""
+        new_rows = [tuple(row) for row in rows]
+        if not new_rows:
+            return
+        if any(len(row) != len(self.headers) for row in new_rows):
+            raise ValueError('Every row needs one value per column.')
+
+        for column, values in enumerate(zip(*new_rows)):
+            cells = [self.formatter(value) for value in values]
+            self._values[column].extend(values)
+            self._cells[column].extend(cells)
+            self._widths[column] = max(self._widths[column],
+                                       *text_widths(cells))
+        self.__appended(len(self) - len(new_rows))
+
+    def clear(self) -> None:
+        for column in range(len(self.headers)):
+            self._values[column].clear()
+            self._cells[column].clear()
+        self._widths = text_widths(self.headers)
+        self.__changed()
+
+    def sort_by(self, column: Optional[Any], reverse: bool = False) -> None:
+        """Sorts the shown rows by the values of ``column``, a header or an
+        index. ``None`` restores the order the rows were added in."""
+        if column is not None and not isinstance(column, int):
+            column = self.headers.index(column)
+        self._sort = None if column is None else (column, reverse)
+        self.__changed()
+
+    def filter(self, predicate: Optional[Callable[[Tuple[Any, ...]], bool]]
+               ) -> None:
+        """Only shows the rows whose values ``predicate`` is true for.
+        ``None`` shows every row."""
+        self._filter = predicate
+        self.__changed()
+
+    def index(self) -> Sequence[int]:
+        """Returns the indices of the shown rows, in order."""
+        if self._index is not None:
+            return self._index
+        if self._sort is None and self._filter is None:
+            return range(len(self))
+
+        index: Iterable[int] = range(len(self))
+        if self._filter is not None:
+            index = [i for i in index if self._filter(self.row(i))]
+        if self._sort is not None:
+            column, reverse = self._sort
+            index = sorted(index, key=self._values[column].__getitem__,
+                           reverse=reverse)
+        self._index = list(index)
+        return self._index
+
+    def __appended(self, start: int) -> None:
+        """Adds the rows from ``start`` on to the cached index. Batches
+        larger than the index are cheaper to sort along with it."""
+        index = self._index
+        if index is None or len(self) - start > len(index):
+            self.__changed()
+            return
+
+        new: Iterable[int] = range(start, len(self))
+        if self._filter is not None:
+            new = [i for i in new if self._filter(self.row(i))]
+        if self._sort is None:
+            index.extend(new)
+        else:
+            column, reverse = self._sort
+            for i in new:
+                _insort(index, i, self._values[column], reverse)
+        self.version += 1
+
+    def __changed(self) -> None:
+        self._index = None
+        self.version += 1
+
+
+def _insort(index: List[int], i: int, values: Sequence[Any],
+            reverse: bool) -> None:
+    """Inserts the row ``i`` into ``index``, sorted by ``values``, after
+    the rows with an equal value, as ``sorted`` would have placed it."""
+    value = values[i]
+    lo, hi = 0, len(index)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        other = values[index[mid]]
+        if (other < value) if reverse else (value < other):
+            hi = mid
+        else:
+            lo = mid + 1
+    index.insert(lo, i)
+
+
+def _fit_widths(widths: Sequence[int], w: int, gap: int) -> List[int]:
+    """Shrinks the widest columns to a common width, as little as needed for
+    the columns and the gaps between them to fit in ``w`` cells. The last of
+    the shrunk columns get the cells left over."""
+    widths = list(widths)
+    space = w - gap * (len(widths) - 1)
+    if sum(widths) <= space:
+        return widths
+    if space <= 0:
+        return [0] * len(widths)
+
+    # The narrowest columns are kept as long as the others can be at least
+    # as wide in the space they leave.
+    rest = space
+    for i, width in enumerate(sorted(widths)):
+        shrunk = len(widths) - i
+        if width * shrunk > rest:
+            break
+        rest -= width
+    cap, left_over = divmod(rest, shrunk)
+    columns = [column for column, width in enumerate(widths) if width > cap]
+    for position, column in enumerate(columns):
+        widths[column] = cap + (position >= len(columns) - left_over)
+    return widths
+
+
+def __table_measurement_strategy(
+    data: _TableData,
+    version: int,
+    state: _LazyColumnState,
+    gap: int,
+    offered: Measurement = Measurement.inf(),
+    **kwargs
+):
+    if offered.h < 1:
+        raise ValueError('A table requires 1 character of height.')
+
+    return Measurement(offered.w, min(len(data.index()) + 1, offered.h))
+
+
+@ComposableCursed(measurement_strategy=__table_measurement_strategy,
+                  memo=True)
+def __Table(
+    data: _TableData,
+    version: int,
+    state: _LazyColumnState,
+    gap: int,
+    measurement: MeasurementSpec = MeasurementSpec.INJECTED(),
+):
+    ms = measurement
+    if ms.w < 1:
+        return ComposableGraph(None)
+
+    widths = _fit_widths(data.widths, ms.w, gap)
+    separator = ' ' * gap
+
+    def line(cells: Sequence[str]) -> str:
+        return fit_to_width(separator.join(
+            fit_to_width(cell, width) for cell, width in zip(cells, widths)
+        ), ms.w)
+
+    index = data.index()
+    # The scroll limits are recorded, which does not change the state.
+    state.viewport, state.count = ms.h - 1, len(index)
+    offset = state.offset
+
+    clip = Rect(ms.x, ms.y, ms.w, ms.h)
+    ops = [DrawOp(ms.x, ms.y, line(data.headers),
+                  ColorPairs.get(ColorPairs.INFO) | curses.A_BOLD, clip)]
+    attr = ColorPairs.get(ColorPairs.INFO)
+    for y, row in enumerate(index[offset:offset + state.viewport], 1):
+        ops.append(DrawOp(ms.x, ms.y + y, line(data.cells(row)), attr, clip))
+
+    return ComposableGraph(None, ops=DisplayList(ops))
+
+
+def _Table(
+    data: _TableData,
+    state: Optional[_LazyColumnState] = None,
+    gap: int = 2,
+    **kwargs
+) -> ComposableT:
+    """A ``Table`` shows ``data`` under a bold header line, ``gap`` spaces
+    between its columns. Only the rows inside its height are drawn, starting
+    from the offset of ``state``, so the cost of a frame does not depend on
+    the number of rows.
+
+    Columns are as wide as their widest cell. If they do not fit, the widest
+    ones are narrowed and their cells truncated.
+
+    .. code-block:: python
+
+       state = LazyColumnState()
+       Table(data, state=state)
+       ...
+       state.scroll_by_page()
+    """
+    return __Table(data, data.version, state or _LazyColumnState(), gap,
+                   **kwargs)
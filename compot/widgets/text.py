@@ -5,11 +5,13 @@ from dataclasses import dataclass
 from enum import IntEnum
 from functools import reduce
 import operator
-from typing import Tuple
+from typing import Dict, Tuple
 
 from compot import LayoutSpec, MeasurementSpec, ColorPairs
+from compot.backends import on_backend_change
 from compot.composable import ComposableGraph, Measurement, ComposableCursed
-from wcwidth import wcswidth
+from compot.display_list import DisplayList, DrawOp, Rect
+from compot.text_width import text_width
 
 class _TextAlignment(IntEnum):
     LEFT = 0
@@ -17,14 +19,32 @@ class _TextAlignment(IntEnum):
     RIGHT = 2
 
 
-@dataclass
+ATTRIB_MAP = {
+    'color': lambda c: ColorPairs.get(c),
+    'bold': lambda b: curses.A_BOLD if b else 0,
+    'italic': lambda i: curses.A_ITALIC if i else 0,
+    'underline': lambda u: curses.A_UNDERLINE if u else 0
+}
+
+
+@dataclass(frozen=True)
 class _TextStyleSpec:
+    """The style of a ``Text``. Styles are immutable and hashable, so they
+    can be shared between widgets and used in cache keys.
+
+    The curses attribute of a style is computed once per backend and
+    interned, every equal style returning the same integer.
+    """
     color: ColorPairs = ColorPairs.INFO
     align: '_TextAlignment' = _TextAlignment.LEFT
     bold: bool = False
     italic: bool = False
     underline: bool = False
 
+    # The generation of _STYLE_ATTRS and the attribute it held for this
+    # style. This is not a field, so it is not compared nor hashed.
+    _curses = (-1, 0)
+
     def __repr__(self) -> str:
         return \
             '<' + ', '.join(x for x in (
@@ -36,13 +56,6 @@ class _TextStyleSpec:
             ) if x != '') + '>'
 
     def attrib_to_int(self, attrib: str) -> int:
-        ATTRIB_MAP = {
-            'color': lambda c: ColorPairs.get(c),
-            'bold': lambda b: curses.A_BOLD if b else 0,
-            'italic': lambda i: curses.A_ITALIC if i else 0,
-            'underline': lambda u: curses.A_UNDERLINE if u else 0
-        }
-
         return ATTRIB_MAP[attrib](getattr(self, attrib))
 
     def get_curses_of_attribs(self, attribs: Tuple[str, ...]) -> int:
@@ -57,8 +70,38 @@ class _TextStyleSpec:
 
     @property
     def curses(self) -> int:
-        return self.get_curses_of_attribs((
-            'color', 'bold', 'italic', 'underline'))
+        generation, attr = self._curses
+        if generation != _STYLE_ATTRS.generation:
+            attr = _STYLE_ATTRS.get(self)
+            object.__setattr__(self, '_curses',
+                               (_STYLE_ATTRS.generation, attr))
+        return attr
+
+
+class _StyleAttrs:
+    """Interns the curses attributes of ``_TextStyleSpec`` objects. The
+    attributes depend on the backend, so they are dropped whenever it
+    changes, which bumps ``generation``."""
+    def __init__(self) -> None:
+        self._attrs: Dict[_TextStyleSpec, int] = {}
+        self.generation = 0
+
+    def get(self, style: _TextStyleSpec) -> int:
+        try:
+            return self._attrs[style]
+        except KeyError:
+            attr = self._attrs[style] = style.get_curses_of_attribs((
+                'color', 'bold', 'italic', 'underline'))
+            return attr
+
+    def clear(self) -> None:
+        self._attrs.clear()
+        self.generation += 1
+
+
+_STYLE_ATTRS = _StyleAttrs()
+on_backend_change(lambda backend: _STYLE_ATTRS.clear())
+
 
 def __text_measurement_strategy(
     text: str,
@@ -70,7 +113,7 @@ def __text_measurement_strategy(
         raise ValueError('Text requires at least 1 character of height.')
 
     if layout == LayoutSpec.FIT_CONTENT:
-        return Measurement(min(offered.w, wcswidth(text)), 1)
+        return Measurement(min(offered.w, text_width(text)), 1)
     if layout == LayoutSpec.FILL:
         return offered
 
@@ -84,13 +127,12 @@ def _Text(
     style: '_TextStyleSpec' = _TextStyleSpec(),
 ):
     ms = measurement
-
-    window = curses.newwin(
-        *MeasurementSpec.xywh(ms.x, ms.y, ms.w + 1, 1))
+    if ms.w < 1:
+        return ComposableGraph(None)
 
     # Now we need to do the left and right character padding
     renderable = text
-    pad_count = (ms.w - wcswidth(text))
+    pad_count = (ms.w - text_width(text))
 
     if style.align == _TextAlignment.RIGHT:
         renderable = ' ' * pad_count + renderable
@@ -101,6 +143,7 @@ def _Text(
     if style.align == _TextAlignment.LEFT:
         renderable += ' ' * pad_count
 
-    window.addnstr(renderable, ms.w, style.curses)
-
-    return ComposableGraph(window)
+    return ComposableGraph(None, ops=DisplayList((
+        DrawOp(ms.x, ms.y, renderable, style.curses,
+               Rect(ms.x, ms.y, ms.w, 1)),
+    )))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+"""This module manages the lifecycle of the curses windows that widgets draw
+into. Creating a window for every widget on every frame is expensive, so
+windows are handed out by a ``WindowPool`` and recycled once the
+``ComposableGraph`` that owned them is gone."""
+
+import curses
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, List, Tuple
+
+from compot.datastructures import CacheStats
+
+Geometry = Tuple[int, int, int, int]
+
+
+class WindowPool:
+    """A pool of curses windows keyed by their geometry, ie. the ``(h, w, y,
+    x)`` tuple that ``curses.newwin`` expects.
+
+    ``acquire`` prefers a free window with the exact requested geometry, then
+    any free window (which gets resized and moved) and only creates a new
+    window as a last resort. Windows are always returned erased.
+
+    A window is given back to the pool when the ``ComposableGraph`` it was
+    ``bind``-ed to is garbage collected. At most ``max_free`` windows are kept
+    around, the rest are deleted.
+
+    ``stats.hits`` counts reused windows, ``stats.misses`` counts created
+    windows and ``stats.evictions`` counts deleted windows.
+    """
+    DEFAULT_MAX_FREE = 256
+
+    def __init__(self,
+                 max_free: int = DEFAULT_MAX_FREE,
+                 newwin: Callable[..., Any] = curses.newwin) -> None:
+        self.max_free = max_free
+        self.stats = CacheStats()
+        self._newwin = newwin
+        self._free: 'OrderedDict[Geometry, List[Any]]' = OrderedDict()
+        self._free_count = 0
+        self._live = 0
+        # Bumped by ``use``, windows made before are never reused.
+        self._generation = 0
+        # Windows are released from finalizers which may run at any point,
+        # so they are only queued here and put back by the pool itself.
+        self._released: List[Tuple[int, Geometry, Any]] = []
+
+    @property
+    def live(self) -> int:
+        """The number of windows currently in use."""
+        return self._live - len(self._released)
+
+    @property
+    def free(self) -> int:
+        """The number of windows waiting to be reused."""
+        return self._free_count + len(self._released)
+
+    def acquire(self, h: int, w: int, y: int, x: int) -> Any:
+        """Returns an erased window with the given geometry."""
+        self._collect()
+        geometry = (h, w, y, x)
+
+        window = self._pop_free(geometry)
+        if window is None and self._free:
+            window = self._pop_free(next(iter(self._free)))
+            try:
+                window.resize(h, w)
+                window.mvwin(y, x)
+            except curses.error:
+                self.stats.evictions += 1
+                window = None
+
+        if window is None:
+            self.stats.misses += 1
+            window = self._newwin(h, w, y, x)
+        else:
+            self.stats.hits += 1
+            window.erase()
+
+        self._live += 1
+        return window
+
+    def use(self, newwin: Callable[..., Any]) -> None:
+        """Switches the function used to create windows, eg. to
+        ``FrameBuffer.newwin``. Free windows made by the old one are
+        deleted, so are the windows in use once they are released."""
+        self.clear()
+        self._newwin = newwin
+        self._generation += 1
+
+    def bind(self, owner: Any, window: Any) -> None:
+        """Gives ``window`` back to the pool once ``owner`` is garbage
+        collected."""
+        geometry = (*window.getmaxyx(), *window.getbegyx())
+        finalizer = weakref.finalize(
+            owner, self._released.append,
+            (self._generation, geometry, window))
+        finalizer.atexit = False
+
+    def release(self, window: Any) -> None:
+        """Gives ``window`` back to the pool right away."""
+        geometry = (*window.getmaxyx(), *window.getbegyx())
+        self._released.append((self._generation, geometry, window))
+
+    def clear(self) -> None:
+        """Deletes all the free windows."""
+        self._collect()
+        self.stats.evictions += self._free_count
+        self._free.clear()
+        self._free_count = 0
+
+    def _pop_free(self, geometry: Geometry) -> Any:
+        try:
+            windows = self._free[geometry]
+        except KeyError:
+            return None
+
+        window = windows.pop()
+        if not windows:
+            del self._free[geometry]
+        self._free_count -= 1
+        return window
+
+    def _collect(self) -> None:
+        while self._released:
+            generation, geometry, window = self._released.pop()
+            self._live -= 1
+            if generation != self._generation \
+                    or self._free_count >= self.max_free:
+                self.stats.evictions += 1
+                continue
+
+            self._free.setdefault(geometry, []).append(window)
+            self._free_count += 1
+
+
+WINDOW_POOL = WindowPool()
@@ -28,7 +28,9 @@ setup(
         'Programming Language :: Python :: 3.10',
         'Topic :: Software Development :: Libraries'
     ],
-    packages=find_packages(exclude='tests/'),
+    packages=find_packages(
+        exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*']),
     include_package_data=False,
-    install_requires=['wcwidth']
+    install_requires=['wcwidth'],
+    extras_require={'numpy': ['numpy']}
 )
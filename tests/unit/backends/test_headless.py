@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import CompotProgram, ColorPairs, LayoutSpec, MeasurementSpec
+from compot.backends import HeadlessBackend, active_backend
+from compot.composable import Reconciler
+from compot.widgets import Column, ProgressBar, Row, StatusBar, Text, \
+    TextAlignment, TextStyleSpec
+
+
+class TestHeadlessBackend(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(3, 20))
+        self.backend = self.prog.backend
+
+    def tearDown(self):
+        self.prog.close()
+
+    def test_active(self):
+        """Tests whether the program makes its backend the active one."""
+        self.assertIs(active_backend(), self.backend)
+
+    def test_text(self):
+        """Tests whether text and its style reach the screen."""
+        Text('Hello', layout=LayoutSpec.FILL, style=TextStyleSpec(
+            color=ColorPairs.OK, align=TextAlignment.RIGHT
+        ), measurement=MeasurementSpec.xywh(0, 1, 20, 1)).build().render()
+        self.assertEqual(self.backend.rows()[1], ' ' * 15 + 'Hello')
+        self.assertEqual(self.backend.attrs(1)[-1],
+                         ColorPairs.get(ColorPairs.OK))
+
+    def test_column_of_rows(self):
+        """Tests whether rows and columns lay their children out."""
+        Column((
+            Row((Text('Hello '), Text('World'))),
+            StatusBar((Text('L'), Text('C'), Text('R'))),
+            Text('Cut off'),
+        ), measurement=MeasurementSpec.xywh(0, 0, 20, 2)).build().render()
+        self.assertEqual(self.backend.rows(), [
+            'Hello World         ',
+            'L        C        R ',
+            ' ' * 20,
+        ])
+
+    def test_progressbar(self):
+        """Tests whether a progress bar fills its measurement."""
+        ProgressBar(
+            0.5, measurement=MeasurementSpec.xywh(0, 0, 20, 1)
+        ).build().render()
+        self.assertEqual(self.backend.rows()[0], '[█████████         ]')
+
+    def test_reconciled_frames(self):
+        """Tests whether only changed cells are written after a frame."""
+        reconciler = Reconciler()
+        for i in (1, 2):
+            reconciler.render(Row(
+                (Text('Count: '), Text(str(i))),
+                measurement=MeasurementSpec.xywh(0, 0, 20, 1)))
+        self.assertEqual(self.backend.rows()[0], 'Count: 2            ')
+        self.assertEqual(self.backend.frames, 2)
+        self.assertEqual(self.backend.buffer.cells_written, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import Measurement, MeasurementSpec
+from compot.composable import ComposableCursed, ComposableGraph, \
+    COMPOSABLE_MEMOS
+from compot.display_list import DisplayList, DrawOp, Rect, execute
+
+
+def _measure_label(text, offered=Measurement.inf(), **kwargs):
+    return Measurement(min(len(text), offered.w), 1)
+
+
+def _measure_pair(children, offered=Measurement.inf(), **kwargs):
+    return Measurement(sum(c.measure().w for c in children), 1)
+
+
+@ComposableCursed(_measure_label, memo=True)
+def _Label(text, measurement=MeasurementSpec.INJECTED()):
+    ms = measurement
+    return ComposableGraph(None, ops=DisplayList((
+        DrawOp(ms.x, ms.y, text, 0, Rect(ms.x, ms.y, ms.w, 1)), )))
+
+
+@ComposableCursed(_measure_pair, memo=True)
+def _Pair(children, measurement=MeasurementSpec.INJECTED()):
+    x = measurement.x
+    graphs = []
+    for child in children:
+        w = child.measure().w
+        graphs.append(child.build(
+            measurement=MeasurementSpec.xywh(x, measurement.y, w, 1)))
+        x += w
+    return ComposableGraph(None, graphs)
+
+
+class FakeTarget:
+    def __init__(self):
+        self.calls = []
+
+    def addnstr(self, y, x, text, n, attr):
+        self.calls.append((y, x, text[:n]))
+
+
+class TestDisplayList(unittest.TestCase):
+    def setUp(self):
+        COMPOSABLE_MEMOS.clear()
+
+    def test_flatten(self):
+        """Tests whether a graph flattens into ops in drawing order."""
+        graph = _Pair((_Label('ab'), _Label('cde'))).build(
+            measurement=MeasurementSpec.xywh(1, 2, 10, 1))
+        self.assertEqual(
+            [(op.x, op.y, op.text) for op in graph.display_list()],
+            [(1, 2, 'ab'), (3, 2, 'cde')])
+
+    def test_relocate_subtree(self):
+        """Tests whether a memoized subtree is moved with its ops."""
+        pair = _Pair((_Label('ab'), _Label('cde')))
+        pair.build(measurement=MeasurementSpec.xywh(0, 0, 10, 1))
+        moved = _Pair((_Label('ab'), _Label('cde'))).build(
+            measurement=MeasurementSpec.xywh(5, 7, 10, 1))
+        self.assertEqual(
+            [(op.x, op.y) for op in moved.display_list()],
+            [(5, 7), (7, 7)])
+
+    def test_deep_graph(self):
+        """Tests whether graphs deeper than the recursion limit are
+        relocated and render."""
+        graph = ComposableGraph(None, ops=DisplayList((
+            DrawOp(0, 0, 'a', 0, Rect(0, 0, 1, 1)), )))
+        for _ in range(10000):
+            graph = ComposableGraph(None, [graph])
+        self.assertEqual(
+            [(op.x, op.y) for op in graph.relocated(2, 3).display_list()],
+            [(2, 3)])
+        graph = ComposableGraph(None)
+        for _ in range(10000):
+            graph = ComposableGraph(None, [graph])
+        self.assertEqual(graph.display_list(), DisplayList())
+        graph.touch()
+        self.assertEqual(graph.render(), 0)
+        self.assertFalse(graph.children[0].dirty)
+
+    def test_execute_clips(self):
+        """Tests whether the executor clips and offsets ops."""
+        target = FakeTarget()
+        execute((
+            DrawOp(2, 1, 'Hello', 0, Rect(3, 1, 2, 1)),
+            DrawOp(2, 2, 'Hidden', 0, Rect(0, 0, 10, 1)),
+        ), target, dx=-3, dy=-1)
+        self.assertEqual(target.calls, [(0, 0, 'el')])
+
+
+if __name__ == '__main__':
+    unittest.main()
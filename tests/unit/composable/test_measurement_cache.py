@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import Measurement, MeasurementSpec
+from compot.composable import ComposableCursed, ComposableGraph, \
+    MeasurementCache, MEASUREMENT_CACHE
+
+MEASURE_COUNT = 0
+WIDTHS = []
+
+
+def _measure(text, offered=Measurement.inf(), **kwargs):
+    global MEASURE_COUNT
+    MEASURE_COUNT += 1
+    return Measurement(min(len(text), offered.w), 1)
+
+
+@ComposableCursed(_measure)
+def _Label(text, measurement=None, tags=()):
+    return ComposableGraph(None)
+
+
+class _Message:
+    def __init__(self, text):
+        self.text = text
+
+
+def _measure_message(message, offered=Measurement.inf(), **kwargs):
+    return Measurement(min(len(message.text), offered.w), 1)
+
+
+@ComposableCursed(_measure_message)
+def _MessageLabel(message, measurement=None):
+    WIDTHS.append(measurement.w)
+    return ComposableGraph(None)
+
+
+class TestMeasurementCache(unittest.TestCase):
+    def setUp(self):
+        global MEASURE_COUNT
+        MEASURE_COUNT = 0
+        MEASUREMENT_CACHE.clear()
+        MEASUREMENT_CACHE.stats.reset()
+
+    def test_structural_hit(self):
+        """Tests whether structurally equal composables share a result."""
+        self.assertEqual(_Label('Hello').measure(), Measurement(5, 1))
+        self.assertEqual(_Label('Hello').measure(), Measurement(5, 1))
+        self.assertEqual(_Label('Hello').measure(Measurement(3, 1)),
+                         Measurement(3, 1))
+        self.assertEqual(MEASURE_COUNT, 2)
+        self.assertEqual(MEASUREMENT_CACHE.stats.hits, 1)
+
+    def test_identity_fallback(self):
+        """Tests whether unhashable composables are cached per frame."""
+        label = _Label('Hello', tags=[bytearray(b'a')])
+        label.measure()
+        label.measure()
+        _Label('Hello', tags=[bytearray(b'a')]).measure()
+        self.assertEqual(MEASURE_COUNT, 2)
+
+        MEASUREMENT_CACHE.new_frame()
+        label.measure()
+        self.assertEqual(MEASURE_COUNT, 3)
+
+    def test_cross_frame(self):
+        """Tests whether cross frame caches survive new frames."""
+        cache = MeasurementCache(cross_frame=True)
+        cache.measure(_Label('Hello'), Measurement.inf())
+        cache.new_frame()
+        cache.measure(_Label('Hello'), Measurement.inf())
+        self.assertEqual(MEASURE_COUNT, 1)
+
+        MEASUREMENT_CACHE.new_frame()
+        _Label('Hello').measure()
+        MEASUREMENT_CACHE.new_frame()
+        _Label('Hello').measure()
+        self.assertEqual(MEASURE_COUNT, 3)
+
+    def test_identity_bounded(self):
+        """Tests whether frames built without ``new_frame`` do not pile up
+        identity keyed entries."""
+        for _ in range(100):
+            _Label('Hello', tags=[bytearray(b'a')],
+                   measurement=MeasurementSpec.xywh(0, 0, 10, 1)).build()
+        self.assertEqual(len(MEASUREMENT_CACHE), 1)
+
+    def test_changed_in_place(self):
+        """Tests whether an argument changed in place between two frames is
+        measured again."""
+        WIDTHS.clear()
+        message = _Message('Hello')
+        spec = MeasurementSpec.xywh(0, 0, 10, 1)
+        _MessageLabel(message, measurement=spec).build()
+        message.text = 'Hi'
+        _MessageLabel(message, measurement=spec).build()
+        self.assertEqual(WIDTHS, [5, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import Measurement, MeasurementSpec
+from compot.composable import ComposableCursed, ComposableGraph, \
+    ComposableMemos, COMPOSABLE_MEMOS, Versioned
+from compot.widgets import Row
+
+BUILD_COUNT = 0
+
+
+def _measure(text, offered=Measurement.inf(), **kwargs):
+    return Measurement(min(len(text), offered.w), 1)
+
+
+@ComposableCursed(_measure, memo=True)
+def _Label(text, measurement=MeasurementSpec.INJECTED(), tags=()):
+    global BUILD_COUNT
+    BUILD_COUNT += 1
+    return ComposableGraph(None)
+
+
+class _Tally(Versioned):
+    def __init__(self):
+        self.count = 0
+
+    def add(self):
+        self.count += 1
+        self.version += 1
+
+
+def _measure_tally(tally, offered=Measurement.inf(), **kwargs):
+    return Measurement(min(len(str(tally.count)), offered.w), 1)
+
+
+@ComposableCursed(_measure_tally, memo=True)
+def _TallyLabel(tally, measurement=MeasurementSpec.INJECTED()):
+    global BUILD_COUNT
+    BUILD_COUNT += 1
+    return ComposableGraph(None)
+
+
+class TestComposableMemos(unittest.TestCase):
+    def setUp(self):
+        global BUILD_COUNT
+        BUILD_COUNT = 0
+        COMPOSABLE_MEMOS.clear()
+        COMPOSABLE_MEMOS.stats.reset()
+
+    def test_hit(self):
+        """Tests whether identical builds reuse the memoized graph."""
+        spec = MeasurementSpec.xywh(0, 0, 10, 1)
+        first = _Label('Hello').build(measurement=spec)
+        second = _Label('Hello').build(measurement=spec)
+        self.assertIs(first, second)
+        self.assertEqual(BUILD_COUNT, 1)
+        self.assertEqual(COMPOSABLE_MEMOS.stats.hits, 1)
+        self.assertEqual(COMPOSABLE_MEMOS.stats.misses, 1)
+
+    def test_miss_on_value_and_measurement(self):
+        """Tests whether kwarg values and measurements are part of the key."""
+        spec = MeasurementSpec.xywh(0, 0, 10, 1)
+        _Label('Hello', tags=('a', )).build(measurement=spec)
+        _Label('Hello', tags=('b', )).build(measurement=spec)
+        _Label('Hello', tags=('b', )).build(
+            measurement=MeasurementSpec.xywh(0, 0, 10, 2))
+        self.assertEqual(BUILD_COUNT, 3)
+
+    def test_relocation(self):
+        """Tests whether a memoized graph is moved rather than rebuilt."""
+        first = _Label('Hello').build(
+            measurement=MeasurementSpec.xywh(0, 0, 10, 1))
+        moved = _Label('Hello').build(
+            measurement=MeasurementSpec.xywh(3, 4, 10, 1))
+        self.assertEqual(BUILD_COUNT, 1)
+        self.assertIsNot(first, moved)
+        self.assertEqual(moved.key[1], (3, 4))
+
+    def test_unhashable_bypass(self):
+        """Tests whether unhashable arguments fall back to plain builds."""
+        spec = MeasurementSpec.xywh(0, 0, 10, 1)
+        _Label('Hello', tags=[bytearray(b'a')]).build(measurement=spec)
+        _Label('Hello', tags=[['a']]).build(measurement=spec)
+        _Label('Hello', tags=[['a']]).build(measurement=spec)
+        self.assertEqual(BUILD_COUNT, 2)
+        self.assertEqual(COMPOSABLE_MEMOS.stats.hits, 1)
+        self.assertEqual(COMPOSABLE_MEMOS.stats.bypasses, 1)
+
+    def test_changed_in_place(self):
+        """Tests whether a memoized container is built again once a list or
+        a ``Versioned`` object in its arguments changed in place."""
+        spec = MeasurementSpec.xywh(0, 0, 10, 1)
+        children = [_Label('Hello')]
+        row = Row(children)
+        row.build(measurement=spec)
+        children.append(_Label('World'))
+        self.assertEqual(len(row.build(measurement=spec).children), 2)
+
+        tally = _Tally()
+        row = Row((_TallyLabel(tally), ))
+        row.build(measurement=spec)
+        row.build(measurement=spec)
+        self.assertEqual(BUILD_COUNT, 3)
+        tally.add()
+        row.build(measurement=spec)
+        self.assertEqual(BUILD_COUNT, 4)
+
+    def test_lru_eviction(self):
+        """Tests whether the least recently used entry is evicted first."""
+        memos = ComposableMemos(maxsize=2)
+        memos.put_memo('a', 1)
+        memos.put_memo('b', 2)
+        memos.get_memo('a')
+        memos.put_memo('c', 3)
+        self.assertEqual(memos.get_memo('a'), 1)
+        self.assertIsNone(memos.get_memo('b'))
+        self.assertEqual(memos.stats.evictions, 1)
+
+        memos.maxsize = 0
+        self.assertEqual(len(memos), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+import gc
+import unittest
+from collections import Counter
+from unittest import mock
+from compot import CompotProgram, Measurement, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import COMPOSABLE_MEMOS, ComposableCursed, \
+    ComposableGraph, MEASUREMENT_CACHE, Reconciler
+from compot.widgets import Column, Row, Text
+
+BUILT = []
+MEASURED = Counter()
+
+
+def _measure_label(text, offered=Measurement.inf(), **kwargs):
+    MEASURED[text] += 1
+    return Measurement(min(len(text), offered.w), 1)
+
+
+def _measure_stack(children, offered=Measurement.inf(), **kwargs):
+    return Measurement(offered.w, len(children))
+
+
+@ComposableCursed(_measure_label)
+def _Label(text, measurement=MeasurementSpec.INJECTED()):
+    BUILT.append(text)
+    return ComposableGraph(None)
+
+
+@ComposableCursed(_measure_stack)
+def _Stack(children, measurement=MeasurementSpec.INJECTED()):
+    BUILT.append('stack')
+    return ComposableGraph(None, [
+        child.build(measurement=MeasurementSpec.xywh(
+            measurement.x, measurement.y + i, measurement.w, 1))
+        for i, child in enumerate(children)
+    ])
+
+
+def _view(counter):
+    return _Stack((
+        _Label('Title'),
+        _Stack((_Label('a'), _Label('b'))),
+        _Label(f'Counter: {counter}'),
+    ), measurement=MeasurementSpec.xywh(0, 0, 20, 3))
+
+
+def _grid(text):
+    return Column(tuple(
+        Row((
+            _Label(f'{row}a'),
+            _Label(text if row == 1 else f'{row}b'),
+            _Label(f'{row}c'),
+        ))
+        for row in range(3)
+    ), measurement=MeasurementSpec.xywh(0, 0, 20, 3))
+
+
+class TestReconciler(unittest.TestCase):
+    def setUp(self):
+        BUILT.clear()
+        COMPOSABLE_MEMOS.clear()
+        MEASUREMENT_CACHE.clear()
+
+    def test_unchanged(self):
+        """Tests whether an unchanged frame reuses the whole graph."""
+        reconciler = Reconciler()
+        first = reconciler.render(_view(0))
+        BUILT.clear()
+        second = reconciler.render(_view(0))
+        self.assertIs(first, second)
+        self.assertEqual(BUILT, [])
+
+    def test_changed_leaf(self):
+        """Tests whether only the changed leaf and its ancestors rebuild."""
+        reconciler = Reconciler()
+        first = reconciler.render(_view(0))
+        BUILT.clear()
+        second = reconciler.render(_view(1))
+        self.assertEqual(BUILT, ['stack', 'Counter: 1'])
+        self.assertIs(first.children[0], second.children[0])
+        self.assertIs(first.children[1], second.children[1])
+        self.assertFalse(second.dirty)
+
+    def test_same_composable(self):
+        """Tests whether a composable rendered again is kept without
+        computing its key."""
+        reconciler = Reconciler()
+        view = _view(0)
+        first = reconciler.render(view)
+        with mock.patch('compot.composable._freeze') as freeze:
+            second = reconciler.render(view)
+        freeze.assert_not_called()
+        self.assertIs(first, second)
+
+    def test_vacated(self):
+        """Tests whether the cells of nodes that shrank or are gone are
+        blanked."""
+        spec = MeasurementSpec.xywh(0, 0, 8, 3)
+        with CompotProgram(HeadlessBackend(3, 8)) as prog:
+            reconciler = Reconciler()
+            reconciler.render(Row((Text('1000'), Text('|x'))),
+                              measurement=spec)
+            reconciler.render(Row((Text('99'), Text('|x'))),
+                              measurement=spec)
+            self.assertEqual(prog.backend.rows()[0], '99|x    ')
+
+            reconciler.render(Column((Text('a'), Text('b'), Text('c'))),
+                              measurement=spec)
+            reconciler.render(Column((Text('a'), )), measurement=spec)
+            self.assertEqual(prog.backend.rows(),
+                             ['a       ', '        ', '        '])
+
+    def test_reset(self):
+        """Tests whether a reset reconciler rebuilds everything."""
+        reconciler = Reconciler()
+        reconciler.render(_view(0))
+        reconciler.reset()
+        BUILT.clear()
+        reconciler.render(_view(0))
+        self.assertEqual(len(BUILT), 6)
+
+    def test_incremental_layout(self):
+        """Tests whether a changed leaf is the only one measured and, if its
+        size did not change, the only one built."""
+        reconciler = Reconciler()
+        first = reconciler.render(_grid('1b'))
+        BUILT.clear()
+        MEASURED.clear()
+        MEASUREMENT_CACHE.new_frame()
+        second = reconciler.render(_grid('1x'))
+        self.assertEqual(MEASURED, Counter(('1x', )))
+        self.assertEqual(BUILT, ['1x'])
+        self.assertIs(first.children[0], second.children[0])
+        self.assertIs(first.children[1].children[2],
+                      second.children[1].children[2])
+        self.assertEqual(second.children[1].layout.size, Measurement(6, 1))
+
+    def test_relocated(self):
+        """Tests whether siblings moved by a growing leaf are relocated
+        rather than built."""
+        reconciler = Reconciler()
+        reconciler.render(_grid('1b'))
+        BUILT.clear()
+        MEASURED.clear()
+        MEASUREMENT_CACHE.new_frame()
+        second = reconciler.render(_grid('1bbb'))
+        self.assertEqual(MEASURED, Counter(('1bbb', )))
+        self.assertEqual(BUILT, ['1bbb'])
+        self.assertEqual(second.children[1].children[2].key[1], (6, 1))
+
+    def test_no_cycles(self):
+        """Tests whether frames are freed without the cycle collector."""
+        reconciler = Reconciler()
+        reconciler.render(_grid('1b'))
+        gc.collect()
+        gc.disable()
+        try:
+            for text in ('1x', '1xx', '1b'):
+                MEASUREMENT_CACHE.new_frame()
+                reconciler.render(_grid(text))
+            self.assertEqual(gc.collect(), 0)
+        finally:
+            gc.enable()
+
+    def test_batched_flush(self):
+        """Tests whether batched renders update the screen only once."""
+        windows = [mock.Mock(), mock.Mock()]
+        graph = ComposableGraph(None, [ComposableGraph(w) for w in windows])
+        with mock.patch('curses.doupdate') as doupdate:
+            self.assertEqual(graph.render(batch=True), 1)
+            self.assertEqual(graph.render(only_dirty=True, batch=True), 0)
+        doupdate.assert_called_once()
+        for window in windows:
+            window.noutrefresh.assert_called_once()
+            window.refresh.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,15 @@
 #!/usr/bin/env python
 
 import unittest
-from compot.datastructures import GeneralTree
+from compot.datastructures import GeneralTree, Visit
+
+
+def _tree():
+    return GeneralTree(1, [
+        GeneralTree(2, [GeneralTree(3), GeneralTree(4)]),
+        GeneralTree(5, [GeneralTree(6)])
+    ])
+
 
 class TestGeneralTreeApply(unittest.TestCase):
     def test_node(self):
@@ -34,5 +42,71 @@ class TestGeneralTreeApply(unittest.TestCase):
         ])
         self.assertEqual(expected, actual)
 
+    def test_deep(self):
+        """Tests whether trees deeper than the recursion limit work."""
+        tree = GeneralTree(0)
+        for i in range(1, 10000):
+            tree = GeneralTree(i, [tree])
+        self.assertEqual(len(list(tree.apply(lambda i: -i).postorder())),
+                         10000)
+
+
+class TestGeneralTreeWalk(unittest.TestCase):
+    def test_orders(self):
+        """Tests whether walkers yield the trees in order."""
+        self.assertEqual([t.node for t in _tree().preorder()],
+                         [1, 2, 3, 4, 5, 6])
+        self.assertEqual([t.node for t in _tree().postorder()],
+                         [3, 4, 2, 6, 5, 1])
+
+    def test_prune(self):
+        """Tests whether pruned trees are walked without their children."""
+        def prune(tree):
+            return tree.node == 2
+
+        self.assertEqual([t.node for t in _tree().preorder(prune)],
+                         [1, 2, 5, 6])
+        self.assertEqual([t.node for t in _tree().postorder(prune)],
+                         [2, 6, 5, 1])
+
+    def test_visit(self):
+        """Tests whether visitors steer the walk and leave every tree."""
+        entered, left = [], []
+
+        def enter(tree):
+            entered.append(tree.node)
+            if tree.node == 2:
+                return Visit.PRUNE
+            return Visit.STOP if tree.node == 6 else None
+
+        self.assertFalse(_tree().visit(enter))
+        self.assertEqual(entered, [1, 2, 5, 6])
+
+        entered.clear()
+        self.assertTrue(_tree().visit(lambda t: entered.append(t.node),
+                                      lambda t: left.append(t.node)))
+        self.assertEqual(entered, [1, 2, 3, 4, 5, 6])
+        self.assertEqual(left, [3, 4, 2, 6, 5, 1])
+
+    def test_flatten(self):
+        """Tests whether flattened trees link their subtrees and walk like
+        the trees."""
+        flat = _tree().flatten()
+        self.assertEqual([t.node for t in flat.trees], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(flat.parent), [-1, 0, 1, 1, 0, 4])
+        self.assertEqual(list(flat.first_child), [1, 2, -1, -1, 5, -1])
+        self.assertEqual(list(flat.next_sibling), [-1, 4, 3, -1, -1, -1])
+        self.assertEqual(list(flat.children(0)), [1, 4])
+
+        entered = []
+
+        def enter(tree):
+            entered.append(tree.node)
+            return Visit.PRUNE if tree.node == 2 else None
+
+        self.assertTrue(flat.visit(enter))
+        self.assertEqual(entered, [1, 2, 5, 6])
+
+
 if __name__ == '__main__':
     unittest.main()
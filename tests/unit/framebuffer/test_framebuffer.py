@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+import unittest
+from compot.framebuffer import FrameBuffer
+
+
+class TestFrameBufferDiff(unittest.TestCase):
+    def test_first_frame(self):
+        """Tests whether the first frame writes every row."""
+        buffer = FrameBuffer(2, 4)
+        buffer.draw(0, 0, 'ab')
+        self.assertEqual(list(buffer.diff()),
+                         [(0, 0, 'ab  ', 0), (1, 0, '    ', 0)])
+        self.assertEqual(list(buffer.diff()), [])
+
+    def test_changed_cells(self):
+        """Tests whether only changed runs are emitted."""
+        buffer = FrameBuffer(1, 20)
+        buffer.draw(0, 0, 'counter: 1   total: 9')
+        list(buffer.diff())
+
+        buffer.draw(0, 0, 'counter: 2   total: 9')
+        self.assertEqual(list(buffer.diff()), [(0, 9, '2', 0)])
+
+        buffer.draw(0, 9, '3', 1)
+        buffer.draw(0, 19, '8')
+        self.assertEqual(list(buffer.diff()),
+                         [(0, 9, '3', 1), (0, 19, '8', 0)])
+
+    def test_bridged_gap(self):
+        """Tests whether short unchanged gaps are merged into one run."""
+        buffer = FrameBuffer(1, 10)
+        list(buffer.diff())
+        buffer.draw(0, 0, 'a  b')
+        self.assertEqual(list(buffer.diff()), [(0, 0, 'a  b', 0)])
+
+    def test_wide_characters(self):
+        """Tests whether wide characters take two cells."""
+        buffer = FrameBuffer(1, 5)
+        self.assertEqual(buffer.draw(0, 0, '日本x'), 5)
+        self.assertEqual(buffer.rows(), ['日本x'])
+        self.assertEqual(buffer.draw(0, 0, '日本', max_x=3), 2)
+
+
+class TestBufferWindow(unittest.TestCase):
+    def test_clipping(self):
+        """Tests whether windows are clipped and cleared when refreshed."""
+        buffer = FrameBuffer(2, 10)
+        window = buffer.newwin(1, 4, 1, 2)
+        window.addnstr('Hello', 5, 0)
+        window.noutrefresh()
+        self.assertEqual(buffer.rows(), [' ' * 10, '  Hell    '])
+
+        window.erase()
+        window.addnstr('Hi', 2, 0)
+        window.noutrefresh()
+        self.assertEqual(buffer.rows()[1], '  Hi      ')
+
+
+if __name__ == '__main__':
+    unittest.main()
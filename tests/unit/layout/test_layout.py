@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+import unittest
+from collections import Counter
+from compot import CompotProgram, Measurement, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import ComposableCursed, ComposableGraph, \
+    MEASUREMENT_CACHE
+from compot.layout import Flex, distribute
+from compot.widgets import Column, ProgressBar, Row, StatusBar, Text
+
+MEASURED = Counter()
+
+
+def _measure(text, offered=Measurement.inf(), **kwargs):
+    MEASURED[text] += 1
+    return Measurement(min(len(text), offered.w), 1)
+
+
+@ComposableCursed(_measure)
+def _Label(text, measurement=None):
+    return ComposableGraph(None)
+
+
+class TestDistribute(unittest.TestCase):
+    def test_weights(self):
+        """Tests whether space is shared by weight, remainders included."""
+        self.assertEqual(distribute(10, [Flex(1), Flex(2)]), [3, 7])
+        self.assertEqual(distribute(0, [Flex(1), Flex(1)]), [0, 0])
+
+    def test_bounds(self):
+        """Tests whether minimum and maximum sizes are respected."""
+        self.assertEqual(distribute(10, [Flex(1, max_size=2), Flex(1)]),
+                         [2, 8])
+        self.assertEqual(distribute(4, [Flex(1, min_size=3), Flex(1)]),
+                         [3, 1])
+
+
+class TestLayout(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(2, 20))
+        self.backend = self.prog.backend
+        MEASUREMENT_CACHE.clear()
+        MEASURED.clear()
+
+    def tearDown(self):
+        self.prog.close()
+
+    def test_flex(self):
+        """Tests whether flexible children fill what others leave."""
+        Row((
+            Text('ab'),
+            ProgressBar(1.0, flex=1),
+            Text('cd', flex=Flex(1, max_size=3)),
+        ), measurement=MeasurementSpec.xywh(0, 0, 20, 1)).build().render()
+        self.assertEqual(self.backend.rows()[0], 'ab[' + '█' * 13 + ']cd ')
+
+    def test_generator(self):
+        """Tests whether children may be given as a generator."""
+        Column((Row(Text(word) for word in line.split())
+                for line in ('ab cd', 'ef')),
+               measurement=MeasurementSpec.xywh(0, 0, 20, 2)
+               ).build().render()
+        self.assertEqual(self.backend.rows(),
+                         ['abcd' + ' ' * 16, 'ef' + ' ' * 18])
+
+    def test_space_between_single_child(self):
+        """Tests whether a single child is spaced without failing."""
+        StatusBar((Text('only'), ),
+                  measurement=MeasurementSpec.xywh(0, 0, 20, 1)
+                  ).build().render()
+        self.assertEqual(self.backend.rows()[0], 'only' + ' ' * 16)
+
+    def test_measured_once(self):
+        """Tests whether every node is measured once per layout."""
+        Column((
+            Row((_Label('a'), Column((_Label('b'), _Label('c'))))),
+            Column((Row((_Label('d'), _Label('e'))), _Label('f'))),
+            _Label('g', flex=1),
+        ), measurement=MeasurementSpec.xywh(0, 0, 20, 2)).build()
+        self.assertEqual(MEASURED, Counter('abcdefg'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+import asyncio
+import unittest
+from compot import Measurement, MeasurementSpec
+from compot.backends import HeadlessBackend, active_backend
+from compot.composable import ComposableCursed
+from compot.widgets import AsyncMainWindow, Text
+
+
+def _measure(offered=Measurement.inf(), **kwargs):
+    return offered
+
+
+@ComposableCursed(_measure)
+def _Broken(measurement=MeasurementSpec.INJECTED()):
+    raise RuntimeError('Broken.')
+
+
+class _NoTerminal(HeadlessBackend):
+    def fileno(self):
+        raise OSError('No terminal.')
+
+
+class TestAsyncMainWindow(unittest.TestCase):
+    def test_keys_and_renders(self):
+        backend = HeadlessBackend(1, 10)
+        backend.push_keys('ab')
+
+        async def main():
+            keys = []
+            async with AsyncMainWindow(Text('Hello'), backend=backend,
+                                       idle_timeout=0.01) as window:
+                async for key in window:
+                    keys.append(key)
+                    window.child = Text(key)
+                    if key == 'b':
+                        break
+                # Let the render task pick up the last change.
+                await asyncio.sleep(0.05)
+                self.assertEqual(backend.rows(), ['b         '])
+                self.assertLessEqual(window.scheduler.frames, 3)
+            return keys
+
+        self.assertEqual(asyncio.run(main()), ['a', 'b'])
+
+    def test_idle(self):
+        backend = HeadlessBackend(1, 10)
+
+        async def main():
+            async with AsyncMainWindow(Text('Hello'), backend=backend,
+                                       idle_timeout=0.01) as window:
+                await asyncio.sleep(0.05)
+                return window.scheduler.frames
+
+        self.assertEqual(asyncio.run(main()), 1)
+        self.assertEqual(backend.rows(), ['Hello     '])
+
+    def test_render_error(self):
+        """Tests whether a failed render ends the keys with its error and
+        still closes the program."""
+        backend = HeadlessBackend(1, 10)
+
+        async def main():
+            async with AsyncMainWindow(_Broken(), backend=backend,
+                                       idle_timeout=0.01) as window:
+                async for _ in window:
+                    pass
+
+        with self.assertRaisesRegex(RuntimeError, 'Broken.'):
+            asyncio.run(main())
+        self.assertIsNot(active_backend(), backend)
+
+    def test_setup_error(self):
+        """Tests whether the program is closed when the window cannot
+        start."""
+        backend = _NoTerminal(1, 10)
+
+        async def main():
+            async with AsyncMainWindow(Text('Hello'), backend=backend):
+                pass
+
+        with self.assertRaisesRegex(OSError, 'No terminal.'):
+            asyncio.run(main())
+        self.assertIsNot(active_backend(), backend)
+
+    def test_loops(self):
+        """Tests whether a window made outside of a loop can be entered on
+        several loops."""
+        backend = HeadlessBackend(1, 10)
+        window = AsyncMainWindow(Text('Hello'), backend=backend,
+                                 idle_timeout=0.01)
+
+        async def main(text):
+            async with window:
+                await asyncio.sleep(0.02)
+                window.child = Text(text)
+                await asyncio.sleep(0.02)
+                self.assertEqual(backend.rows(), [f'{text:<10}'])
+
+        asyncio.run(main('First'))
+        asyncio.run(main('Second'))
+
+
+if __name__ == '__main__':
+    unittest.main()
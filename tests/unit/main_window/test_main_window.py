@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+
+import unittest
+from compot.backends import HeadlessBackend
+from compot.scheduler import FrameScheduler
+from compot.widgets import LogBuffer, LogView, MainWindow
+
+
+class TestMainWindow(unittest.TestCase):
+    def test_child_factory(self):
+        """Tests whether invalidated frames show the data that changed."""
+        backend = HeadlessBackend(2, 10)
+        backend.push_keys('xy')
+        scheduler = FrameScheduler(None)
+        log = LogBuffer(on_change=scheduler.invalidate)
+        log.append('first')
+        errors = []
+
+        def view():
+            if log.total == 3:
+                raise EOFError
+            return LogView(log)
+
+        MainWindow(view, backend=backend, scheduler=scheduler,
+                   idle_timeout=0.01).subscribe(
+            on_next=log.append, on_error=errors.append)
+        self.assertIsInstance(errors[0], EOFError)
+        self.assertEqual(backend.rows(), ['first     ', 'x         '])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+import threading
+import time
+import unittest
+import reactivex as rx
+from unittest import mock
+from compot import Measurement, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import Composable, ComposableCursed
+from compot.widgets import ObserverMainWindow, Text
+
+
+@Composable
+def _Counter(count, measurement=MeasurementSpec.INJECTED()):
+    return Text(str(count), measurement=measurement)
+
+
+@Composable
+def _Pair(left, right, measurement=MeasurementSpec.INJECTED()):
+    return Text(f'{left}{right}', measurement=measurement)
+
+
+def _measure(*args, offered=Measurement.inf(), **kwargs):
+    return offered
+
+
+@ComposableCursed(_measure)
+def _Broken(state, measurement=MeasurementSpec.INJECTED()):
+    raise RuntimeError('Broken.')
+
+
+class TestObserverMainWindow(unittest.TestCase):
+    def _run(self, child, states, **kwargs):
+        backend = HeadlessBackend(1, 10)
+        data, done = rx.Subject(), threading.Event()
+        ObserverMainWindow(child, data, backend=backend, framerate=None,
+                           idle_timeout=0.01, **kwargs).subscribe(
+            on_completed=done.set)
+        for state in states:
+            data.on_next(state)
+            time.sleep(0.02)
+        data.on_completed()
+        self.assertTrue(done.wait(1))
+        return backend
+
+    def test_distinct(self):
+        calls = []
+
+        def child(state, measurement):
+            calls.append(state)
+            return _Counter(state[0], measurement=measurement)
+
+        self._run(child, [[1], [1], [2]], distinct='equality')
+        self.assertEqual(calls, [[1], [2]])
+
+        calls.clear()
+        self._run(child, [[1], [1], [2]], distinct='identity')
+        self.assertEqual(calls, [[1], [1], [2]])
+
+        calls.clear()
+        self._run(child, [[1, 'a'], [1, 'b'], [2, 'c']],
+                  distinct=lambda state: state[0])
+        self.assertEqual(calls, [[1, 'a'], [2, 'c']])
+
+    def test_selectors(self):
+        backend = self._run(
+            _Pair, [{'a': 1, 'b': 2, 'c': 0}, {'a': 1, 'b': 2, 'c': 1},
+                    {'a': 1, 'b': 3, 'c': 2}],
+            selectors=(lambda s: s['a'], lambda s: s['b']))
+        self.assertEqual(backend.rows(), ['13        '])
+        self.assertEqual(backend.frames, 2)
+
+    def test_coalescing(self):
+        backend = HeadlessBackend(1, 10)
+        backend.push_keys('x')
+        data = rx.Subject()
+        keys, done = [], threading.Event()
+
+        ObserverMainWindow(_Counter, data, backend=backend,
+                           idle_timeout=0.01).subscribe(
+            keys.append, on_completed=done.set)
+
+        start = time.monotonic()
+        for count in range(10000):
+            data.on_next(count)
+        # The producer is never held up by rendering.
+        self.assertLess(time.monotonic() - start, 1)
+        time.sleep(0.1)
+        data.on_completed()
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(backend.rows(), ['9999      '])
+        self.assertLess(backend.frames, 100)
+        self.assertEqual(keys, ['x'])
+
+    def test_completed(self):
+        """Tests whether the last state of a completed observable is
+        rendered."""
+        backend = HeadlessBackend(1, 10)
+        done = threading.Event()
+        ObserverMainWindow(_Counter, rx.of(1, 2, 3), backend=backend,
+                           idle_timeout=0.01).subscribe(
+            on_completed=done.set)
+        self.assertTrue(done.wait(1))
+        self.assertEqual(backend.rows(), ['3         '])
+
+    def test_render_error(self):
+        """Tests whether a failed render disposes the subscription to the
+        data and passes the error to the observers of the keys."""
+        data, errors, failed = rx.Subject(), [], threading.Event()
+        ObserverMainWindow(_Broken, data, backend=HeadlessBackend(1, 10),
+                           idle_timeout=0.01).subscribe(
+            on_error=lambda error: (errors.append(error), failed.set()))
+        data.on_next(1)
+
+        self.assertTrue(failed.wait(1))
+        self.assertEqual(str(errors[0]), 'Broken.')
+        self.assertEqual(data.observers, [])
+
+    def test_unobserved_render_error(self):
+        """Tests whether a failed render raises its error when nothing
+        observes the keys."""
+        data, errors, failed = rx.Subject(), [], threading.Event()
+
+        def excepthook(args):
+            errors.append(args.exc_value)
+            failed.set()
+
+        with mock.patch('threading.excepthook', excepthook):
+            ObserverMainWindow(_Broken, data, backend=HeadlessBackend(1, 10),
+                               idle_timeout=0.01)
+            data.on_next(1)
+            self.assertTrue(failed.wait(1))
+        self.assertEqual(str(errors[0]), 'Broken.')
+        self.assertEqual(data.observers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
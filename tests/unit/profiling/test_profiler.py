@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+import threading
+import time
+import unittest
+from compot import CompotProgram, Measurement, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import ComposableCursed, ComposableGraph, \
+    Composable, COMPOSABLE_MEMOS, MEASUREMENT_CACHE, Reconciler
+from compot.display_list import DisplayList, DrawOp, Rect
+from compot.profiling import PROFILER, Profiler
+
+
+def _measure_label(text, offered=Measurement.inf(), **kwargs):
+    return Measurement(min(len(text), offered.w), 1)
+
+
+def _measure_pair(children, offered=Measurement.inf(), **kwargs):
+    return Measurement(sum(c.measure().w for c in children), 1)
+
+
+@ComposableCursed(_measure_label)
+def _Label(text, measurement=MeasurementSpec.INJECTED()):
+    ms = measurement
+    return ComposableGraph(None, ops=DisplayList((
+        DrawOp(ms.x, ms.y, text, 0, Rect(ms.x, ms.y, ms.w, 1)), )))
+
+
+@ComposableCursed(_measure_pair)
+def _Pair(children, measurement=MeasurementSpec.INJECTED()):
+    x, graphs = measurement.x, []
+    for child in children:
+        w = child.measure().w
+        graphs.append(child.build(measurement=MeasurementSpec.xywh(
+            x, measurement.y, w, 1)))
+        x += w
+    return ComposableGraph(None, graphs)
+
+
+@Composable
+def _Greeting(name):
+    return _Pair([_Label('Hello '), _Label(name)])
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        COMPOSABLE_MEMOS.clear()
+        MEASUREMENT_CACHE.clear()
+        PROFILER.reset()
+        PROFILER.enable()
+        self.prog = CompotProgram(HeadlessBackend(1, 20))
+
+    def tearDown(self):
+        self.prog.close()
+        PROFILER.disable()
+        PROFILER.reset()
+
+    def test_phases(self):
+        reconciler = Reconciler()
+        reconciler.render(_Greeting('you'),
+                          measurement=MeasurementSpec.xywh(0, 0, 20, 1))
+
+        stats = PROFILER.stats()
+        self.assertEqual(stats[('compose', '_Greeting')].calls, 1)
+        self.assertEqual(stats[('build', '_Pair')].calls, 1)
+        self.assertEqual(stats[('build', '_Label')].calls, 2)
+        self.assertIn(('measure', '_Pair'), stats)
+        self.assertIn(('measure', '_Label'), stats)
+        self.assertEqual(stats[('render', '_Label')].calls, 2)
+        self.assertEqual(stats[('render', 'doupdate')].calls, 1)
+        self.assertEqual(PROFILER.frames, 1)
+
+        pair = stats[('build', '_Pair')]
+        self.assertLessEqual(pair.self_time, pair.total_time)
+        self.assertGreaterEqual(
+            pair.total_time,
+            stats[('build', '_Label')].total_time)
+        self.assertIn('_Label', PROFILER.summary())
+
+    def test_disabled(self):
+        PROFILER.disable()
+        _Greeting('you').build(measurement=MeasurementSpec.xywh(0, 0, 20, 1))
+        self.assertEqual(PROFILER.stats(), {})
+
+    def test_report(self):
+        reports = []
+        profiler = Profiler()
+        profiler.enable(report_interval=0, report=reports.append)
+        profiler.stop('render', 'x', profiler.start())
+        profiler.end_frame()
+
+        self.assertEqual(len(reports), 1)
+        self.assertGreater(profiler.last_frame['render'], 0)
+        self.assertEqual(profiler.last_frame['build'], 0)
+
+    def test_threads(self):
+        profiler = Profiler()
+        profiler.enable()
+        started = profiler.start()
+
+        def other():
+            started = profiler.start()
+            time.sleep(0.01)
+            profiler.stop('build', 'other', started)
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+        profiler.stop('build', 'main', started)
+
+        main = profiler.stats()[('build', 'main')]
+        self.assertEqual(main.self_time, main.total_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+import time
+import unittest
+from compot.backends import HeadlessBackend
+from compot.scheduler import FrameScheduler
+from compot.widgets import MainWindow, Text
+
+
+class _Stop(Exception):
+    pass
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def test_invalidation(self):
+        scheduler = FrameScheduler(framerate=None)
+        self.assertEqual(scheduler.time_until_due(), 0)
+        with scheduler.frame():
+            pass
+
+        self.assertIsNone(scheduler.time_until_due())
+        self.assertFalse(scheduler.wait(timeout=0))
+        scheduler.invalidate()
+        scheduler.invalidate()
+        self.assertTrue(scheduler.wait(timeout=0))
+        self.assertEqual(scheduler.frames, 1)
+
+    def test_framerate(self):
+        scheduler = FrameScheduler(framerate=20)
+        with scheduler.frame():
+            pass
+        scheduler.invalidate()
+        self.assertGreater(scheduler.time_until_due(), 0)
+
+        start = time.monotonic()
+        self.assertTrue(scheduler.wait())
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_missed_deadline(self):
+        scheduler = FrameScheduler(framerate=1000)
+        with scheduler.frame():
+            time.sleep(0.002)
+        self.assertEqual(scheduler.missed_deadlines, 1)
+        self.assertGreaterEqual(scheduler.last_frame_time, 0.002)
+
+    def test_main_window_renders_on_keys(self):
+        backend = HeadlessBackend(1, 10)
+        backend.push_keys('ab')
+        keys, errors = [], []
+        scheduler = FrameScheduler(framerate=None)
+
+        def on_next(key):
+            keys.append(key)
+            if key == 'b':
+                raise _Stop()
+
+        MainWindow(Text('Hello'), backend=backend, scheduler=scheduler,
+                   idle_timeout=0).subscribe(on_next, errors.append)
+
+        self.assertEqual(keys, ['a', 'b'])
+        self.assertIsInstance(errors[0], _Stop)
+        # The first frame and the one after 'a'. No frame is rendered while
+        # no key is pressed.
+        self.assertEqual(scheduler.frames, 2)
+        self.assertEqual(backend.rows(), ['Hello     '])
+
+
+if __name__ == '__main__':
+    unittest.main()
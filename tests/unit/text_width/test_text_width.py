@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+
+import unittest
+from wcwidth import wcswidth
+from compot.text_width import char_width, text_width, text_widths
+
+
+class TestTextWidth(unittest.TestCase):
+    def test_matches_wcswidth(self):
+        """Tests whether widths agree with wcswidth for printable text."""
+        for text in ('', 'Hello', '日本語', 'mixed 日本', 'é', '😀!'):
+            self.assertEqual(text_width(text), wcswidth(text), text)
+
+    def test_control_characters(self):
+        """Tests whether control characters take no cells."""
+        self.assertEqual(char_width('\x1b'), 0)
+        self.assertEqual(text_width('a\tb'), 2)
+        self.assertEqual(text_width('日\n'), 2)
+
+    def test_bulk(self):
+        """Tests whether the bulk API returns the width of every string."""
+        texts = ['abc', '日本', '', 'a\x00']
+        self.assertEqual(text_widths(texts), [text_width(t) for t in texts])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import CompotProgram, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import Reconciler
+from compot.widgets import Column, LazyColumn, LazyColumnState, Text
+
+
+class TestLazyColumn(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(3, 10))
+        self.backend = self.prog.backend
+        self.created = []
+
+    def tearDown(self):
+        self.prog.close()
+
+    def item(self, index):
+        self.created.append(index)
+        return Text(f'item {index}')
+
+    def render(self, reconciler, state, count=1_000_000):
+        reconciler.render(Column((
+            Text('Header'),
+            LazyColumn(self.item, count=count, state=state),
+        )), measurement=MeasurementSpec.xywh(0, 0, 10, 3))
+
+    def test_only_visible(self):
+        """Tests whether only the visible items of a huge list are created."""
+        state = LazyColumnState()
+        self.render(Reconciler(), state)
+        self.assertEqual(self.backend.rows(),
+                         ['Header    ', 'item 0    ', 'item 1    '])
+        self.assertEqual(self.created, [0, 1])
+        self.assertEqual(state.viewport, 2)
+
+    def test_scrolling(self):
+        """Tests whether scrolling only creates the items that appear."""
+        state, reconciler = LazyColumnState(), Reconciler()
+        self.render(reconciler, state)
+        state.scroll_by(1)
+        self.render(reconciler, state)
+        self.assertEqual(self.created, [0, 1, 2])
+
+        state.scroll_to_index(999_999)
+        self.render(reconciler, state)
+        self.assertEqual(state.offset, 999_998)
+        self.assertEqual(self.backend.rows()[1:],
+                         ['item 99999', 'item 99999'])
+
+        state.scroll_to_index(5)
+        state.scroll_by(100)
+        self.render(reconciler, state, count=10)
+        self.assertEqual(state.offset, 8)
+
+    def test_same_child(self):
+        """Tests whether a child rendered again shows where it scrolled."""
+        state, reconciler = LazyColumnState(), Reconciler()
+        child = Column((
+            Text('Header'),
+            LazyColumn(lambda index: Text(f'item {index:>2}'), count=100,
+                       state=state),
+        ))
+        for scroll in (0, 10, -5):
+            state.scroll_by(scroll)
+            reconciler.render(
+                child, measurement=MeasurementSpec.xywh(0, 0, 10, 3))
+        self.assertEqual(self.backend.rows(),
+                         ['Header    ', 'item  5   ', 'item  6   '])
+
+    def test_sequence(self):
+        """Tests whether a sequence of items can be shown."""
+        LazyColumn([Text(c) for c in 'abcde'],
+                   state=LazyColumnState(offset=1),
+                   measurement=MeasurementSpec.xywh(0, 0, 10, 3)
+                   ).build().render()
+        self.assertEqual(self.backend.rows(), ['b         ', 'c         ',
+                                               'd         '])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+import threading
+import unittest
+import reactivex as rx
+from compot import CompotProgram, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import Reconciler
+from compot.widgets import LogBuffer, LogView
+
+
+class TestLogBuffer(unittest.TestCase):
+    def test_ring(self):
+        """Tests whether only the last lines are kept, in order."""
+        log = LogBuffer(capacity=4)
+        log.extend(str(i) for i in range(3))
+        log.extend(str(i) for i in range(3, 10))
+        log.append('10')
+        self.assertEqual(len(log), 4)
+        self.assertEqual(log.total, 11)
+        self.assertEqual(log.tail(10), ['7', '8', '9', '10'])
+        self.assertEqual(log.tail(2, skip=1), ['8', '9'])
+        self.assertEqual(log.tail(2, skip=10), [])
+
+    def test_threads(self):
+        """Tests whether batches appended by many threads are all counted."""
+        changes = []
+        log = LogBuffer(capacity=100, on_change=lambda: changes.append(1))
+        threads = [threading.Thread(
+            target=lambda: [log.extend(['line'] * 10) for _ in range(100)])
+            for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(log.total, 4000)
+        self.assertEqual(len(changes), 400)
+
+    def test_follow(self):
+        """Tests whether the lines of an observable are appended."""
+        log = LogBuffer()
+        done = threading.Event()
+        log.on_change = lambda: log.total == 1000 and done.set()
+        log.follow(rx.from_iterable(str(i) for i in range(1000)),
+                   interval=0.01)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(log.tail(1), ['999'])
+
+
+class TestLogView(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(3, 8))
+        self.backend = self.prog.backend
+        self.log = LogBuffer(capacity=100)
+        self.reconciler = Reconciler()
+
+    def tearDown(self):
+        self.prog.close()
+
+    def render(self, scroll=0):
+        misses = self.reconciler.stats.misses
+        self.reconciler.render(LogView(self.log, scroll=scroll),
+                               measurement=MeasurementSpec.xywh(0, 0, 8, 3))
+        return self.reconciler.stats.misses - misses
+
+    def test_tail(self):
+        """Tests whether the most recent lines are shown, truncated."""
+        self.log.extend(['one', 'two', 'three', 'a rather long line'])
+        self.render()
+        self.assertEqual(self.backend.rows(),
+                         ['two     ', 'three   ', 'a rather'])
+
+        self.render(scroll=1)
+        self.assertEqual(self.backend.rows(),
+                         ['one     ', 'two     ', 'three   '])
+
+        self.render(scroll=3)
+        self.assertEqual(self.backend.rows(),
+                         ['one     ', '        ', '        '])
+
+    def test_incremental(self):
+        """Tests whether appending only builds the new lines."""
+        self.log.append('one')
+        self.render()
+        self.log.append('two')
+        # The view and its lines.
+        self.assertEqual(self.render(), 2)
+        self.assertEqual(self.backend.rows()[:2], ['one     ', 'two     '])
+
+        self.log.extend(['three', 'four'])
+        self.render(scroll=1)
+        self.log.append('five')
+        # Scrolled back, the lines shown do not change.
+        self.assertEqual(self.render(scroll=2), 1)
+        self.assertEqual(self.reconciler.flushes, 0)
+        self.assertEqual(self.backend.rows(),
+                         ['one     ', 'two     ', 'three   '])
+
+    def test_follow(self):
+        """Tests whether appending to a full view builds the same number of
+        nodes whatever its height."""
+        self.log.extend(str(i) for i in range(10))
+        self.render()
+        for i in range(10, 13):
+            self.log.append(str(i))
+            # The view and its lines.
+            self.assertEqual(self.render(), 2)
+        self.assertEqual(self.backend.rows(),
+                         ['10      ', '11      ', '12      '])
+
+
+if __name__ == '__main__':
+    unittest.main()
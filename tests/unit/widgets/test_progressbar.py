@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import CompotProgram, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.widgets import Column, ProgressBar, ProgressBarGrid
+from compot.widgets.progressbar import _fill, _fills, _ProgressBarStyle
+
+
+class TestProgressBar(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(2, 12))
+        self.backend = self.prog.backend
+
+    def tearDown(self):
+        self.prog.close()
+
+    def test_bounds(self):
+        """Tests whether empty and full bars are drawn."""
+        Column((ProgressBar(0.0), ProgressBar(1.0)),
+               measurement=MeasurementSpec.xywh(0, 0, 12, 2)).build().render()
+        self.assertEqual(self.backend.rows(),
+                         ['[          ]', '[██████████]'])
+
+    def test_almost_full(self):
+        """Tests whether a bar that is almost full fills all its cells but
+        the rounding of the last one."""
+        segments = _ProgressBarStyle().segments_key
+        for progress in (0.95, 0.99, 0.999):
+            full_segments, partial_size, eighths = \
+                _fill(progress, segments, 10)
+            self.assertEqual(int(segments[full_segments - 1][0] * 10)
+                             + partial_size + eighths / 8,
+                             round(progress * 80) / 8)
+
+        ProgressBar(0.999, measurement=MeasurementSpec.xywh(
+            0, 0, 12, 1)).build().render()
+        self.assertEqual(self.backend.rows()[0], '[██████████]')
+
+    def test_arguments(self):
+        """Tests whether the arguments a bar used to pass to its Row are
+        still accepted."""
+        ProgressBar(1.0, layout=None, spacing=None,
+                    measurement=MeasurementSpec.xywh(0, 0, 12, 1)
+                    ).build().render()
+        self.assertEqual(self.backend.rows()[0], '[██████████]')
+
+    def test_one_window(self):
+        """Tests whether a bar is a single node drawing one run per
+        color."""
+        graph = ProgressBar(
+            0.5, measurement=MeasurementSpec.xywh(0, 0, 12, 1)).build()
+        self.assertEqual(graph.children, [])
+        self.assertEqual(len(graph.ops), 4)
+
+    def test_grid(self):
+        """Tests whether a grid draws the same bars as ProgressBar does."""
+        progresses = [0.1, 0.5, 0.7, 0.95]
+        ProgressBarGrid(progresses, 2, measurement=MeasurementSpec.xywh(
+            0, 0, 12, 2)).build().render()
+        grid = self.backend.rows()
+
+        for i, progress in enumerate(progresses):
+            ProgressBar(progress, measurement=MeasurementSpec.xywh(
+                (i % 2) * 6, i // 2, 6, 1)).build().render()
+        self.assertEqual(self.backend.rows(), grid)
+
+    def test_grid_columns(self):
+        """Tests whether a grid without columns is refused."""
+        with self.assertRaises(ValueError):
+            ProgressBarGrid([0.5], 0)
+
+    def test_fills(self):
+        """Tests whether the bulk fills match the single ones."""
+        segments = _ProgressBarStyle().segments_key
+        progresses = [i / 50 for i in range(-5, 56)]
+        self.assertEqual(list(_fills(progresses, segments, 37)),
+                         [_fill(p, segments, 37) for p in progresses])
+
+
+if __name__ == '__main__':
+    unittest.main()
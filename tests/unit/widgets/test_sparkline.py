@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import CompotProgram, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import Reconciler
+from compot.widgets import SeriesBuffer, Sparkline, SparklineGlyphs
+from compot.widgets.sparkline import numpy
+
+
+@unittest.skipUnless(numpy, 'numpy is not installed')
+class TestSeriesBuffer(unittest.TestCase):
+    def test_ring(self):
+        """Tests whether only the last samples are kept, in order."""
+        series = SeriesBuffer(capacity=4, chunk=2)
+        series.extend(range(3))
+        series.extend(range(3, 10))
+        series.append(10)
+        self.assertEqual(series.total, 11)
+        self.assertEqual(series.values().tolist(), [7, 8, 9, 10])
+
+    def test_downsample(self):
+        """Tests whether buckets by chunks hold the extremes of the series."""
+        series = SeriesBuffer(capacity=10_000, chunk=10)
+        for _ in range(3):
+            series.extend(numpy.random.rand(7_001))
+        series.extend((-1.0, 2.0))
+        mins, maxs = series.downsample(8)
+        self.assertEqual(len(mins), 8)
+        self.assertEqual(mins[-1], -1.0)
+        self.assertEqual(maxs[-1], 2.0)
+        self.assertTrue((mins <= maxs).all())
+
+        values = series.values()
+        self.assertGreaterEqual(mins[0], values.min())
+        self.assertLessEqual(maxs[0], values.max())
+
+
+@unittest.skipUnless(numpy, 'numpy is not installed')
+class TestSparkline(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(2, 8))
+        self.backend = self.prog.backend
+
+    def tearDown(self):
+        self.prog.close()
+
+    def render(self, series, **kwargs):
+        Reconciler().render(Sparkline(series, height=2, **kwargs),
+                            measurement=MeasurementSpec.xywh(0, 0, 8, 2))
+
+    def test_blocks(self):
+        """Tests whether the most recent samples are charted on the right."""
+        series = SeriesBuffer(capacity=100)
+        series.extend((0, 4, 8, 12, 16))
+        self.render(series)
+        self.assertEqual(self.backend.rows(),
+                         ['      ▄█', '    ▄███'])
+
+    def test_flat(self):
+        """Tests whether a constant series is charted half way up."""
+        series = SeriesBuffer(capacity=100)
+        series.extend((5, 5, 5))
+        self.render(series)
+        self.assertEqual(self.backend.rows(), ['        ', '     ███'])
+        self.render(series, glyphs=SparklineGlyphs.BRAILLE)
+        self.assertEqual(self.backend.rows(), ['      ⠀⠀', '      ⠉⠁'])
+
+    def test_braille(self):
+        """Tests whether two columns are charted per cell."""
+        series = SeriesBuffer(capacity=100)
+        series.extend((0, 7))
+        self.render(series, glyphs=SparklineGlyphs.BRAILLE)
+        self.assertEqual(self.backend.rows(), ['       ⠈', '       ⡀'])
+
+
+if __name__ == '__main__':
+    unittest.main()
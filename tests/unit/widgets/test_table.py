@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+import unittest
+from compot import CompotProgram, MeasurementSpec
+from compot.backends import HeadlessBackend
+from compot.composable import Reconciler
+from compot.widgets import LazyColumnState, Table, TableData
+from compot.widgets.table import _fit_widths
+
+
+class TestTable(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(4, 16))
+        self.backend = self.prog.backend
+        self.data = TableData(('Name', 'CPU'))
+        self.data.extend((f'job{i}', (i * 7) % 10) for i in range(100_000))
+
+    def tearDown(self):
+        self.prog.close()
+
+    def render(self, reconciler, state):
+        reconciler.render(Table(self.data, state=state),
+                          measurement=MeasurementSpec.xywh(0, 0, 16, 4))
+
+    def test_visible_rows(self):
+        """Tests whether the header and the visible rows are drawn."""
+        state, reconciler = LazyColumnState(), Reconciler()
+        self.render(reconciler, state)
+        self.assertEqual(self.backend.rows(), [
+            'Name      CPU   ',
+            'job0      0     ',
+            'job1      7     ',
+            'job2      4     ',
+        ])
+
+        state.scroll_to_index(99_999)
+        self.render(reconciler, state)
+        self.assertEqual(self.backend.rows()[-1], 'job99999  3     ')
+
+    def test_scroll_past_end(self):
+        """Tests whether scrolling past the last row stops at it without
+        the builds changing the state."""
+        state, reconciler = LazyColumnState(), Reconciler()
+        self.render(reconciler, state)
+        self.assertEqual(state.count, 100_000)
+
+        state.scroll_by(200_000)
+        self.assertEqual(state.offset, 99_997)
+        version = state.version
+        self.render(reconciler, state)
+        self.render(reconciler, state)
+        self.assertEqual(state.version, version)
+        self.assertEqual(reconciler.stats.misses, 2)
+        self.assertEqual(self.backend.rows()[-1], 'job99999  3     ')
+
+        state.scroll_by_page(-1)
+        self.assertEqual(state.offset, 99_994)
+
+    def test_sort_and_filter(self):
+        """Tests whether sorting and filtering reorder the shown rows."""
+        self.data.filter(lambda row: row[1] > 7)
+        self.data.sort_by('CPU', reverse=True)
+        self.render(Reconciler(), LazyColumnState())
+        self.assertEqual(self.backend.rows()[1:], [
+            'job7      9     ',
+            'job17     9     ',
+            'job27     9     ',
+        ])
+        self.assertEqual(len(self.data.index()), 20_000)
+
+    def test_append(self):
+        """Tests whether appended rows are merged into the sorted index as
+        a full sort would have placed them."""
+        self.data.filter(lambda row: row[1] % 2)
+        self.data.sort_by('CPU', reverse=True)
+        index = self.data.index()
+        for i in range(100_000, 100_050):
+            self.data.append((f'job{i}', (i * 3) % 10))
+        self.assertIs(self.data.index(), index)
+
+        merged = list(index)
+        self.data.sort_by('CPU', reverse=True)
+        self.assertEqual(merged, self.data.index())
+
+    def test_narrow(self):
+        """Tests whether the widest columns are truncated to fit."""
+        data = TableData(('Description', 'N'))
+        data.append(('A rather long description', 1))
+        Table(data, measurement=MeasurementSpec.xywh(0, 0, 16, 2)
+              ).build().render()
+        self.assertEqual(self.backend.rows()[:2],
+                         ['Description    N', 'A rather long  1'])
+
+    def test_fit_widths(self):
+        """Tests whether the widest columns are shrunk to a common width."""
+        self.assertEqual(_fit_widths((3, 10, 8), 20, 1), [3, 7, 8])
+        self.assertEqual(_fit_widths((3, 10, 8), 17, 1), [3, 6, 6])
+        self.assertEqual(_fit_widths((3, 10, 8), 16, 1), [3, 5, 6])
+        self.assertEqual(_fit_widths((3, 10, 8), 2, 1), [0, 0, 0])
+        self.assertEqual(_fit_widths((3, 10, 8), 30, 1), [3, 10, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+import curses
+import dataclasses
+import unittest
+from compot import CompotProgram, ColorPairs
+from compot.backends import HeadlessBackend
+from compot.widgets import Text, TextStyleSpec
+
+
+class TestTextStyleSpec(unittest.TestCase):
+    def setUp(self):
+        self.prog = CompotProgram(HeadlessBackend(1, 10))
+
+    def tearDown(self):
+        self.prog.close()
+
+    def test_immutable(self):
+        """Tests whether styles are frozen and hashable by value."""
+        style = TextStyleSpec(color=ColorPairs.OK, bold=True)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            style.bold = False
+        self.assertEqual(hash(style),
+                         hash(TextStyleSpec(color=ColorPairs.OK, bold=True)))
+
+    def test_interned(self):
+        """Tests whether equal styles share one attribute."""
+        first = TextStyleSpec(color=ColorPairs.ERROR, underline=True)
+        second = TextStyleSpec(color=ColorPairs.ERROR, underline=True)
+        self.assertIs(first.curses, second.curses)
+        self.assertEqual(first.curses, ColorPairs.get(ColorPairs.ERROR)
+                         | curses.A_UNDERLINE)
+
+    def test_key(self):
+        """Tests whether texts with equal styles have equal keys."""
+        first = Text('a', style=TextStyleSpec(color=ColorPairs.OK))
+        second = Text('a', style=TextStyleSpec(color=ColorPairs.OK))
+        self.assertIsNotNone(first.key)
+        self.assertEqual(first.key, second.key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+import gc
+import unittest
+from compot.composable import ComposableGraph
+from compot.windows import WindowPool
+
+
+class FakeWindow:
+    def __init__(self, h, w, y, x):
+        self.geometry = (h, w, y, x)
+        self.erased = 0
+
+    def getmaxyx(self):
+        return self.geometry[:2]
+
+    def getbegyx(self):
+        return self.geometry[2:]
+
+    def resize(self, h, w):
+        self.geometry = (h, w, *self.geometry[2:])
+
+    def mvwin(self, y, x):
+        self.geometry = (*self.geometry[:2], y, x)
+
+    def erase(self):
+        self.erased += 1
+
+
+class TestWindowPool(unittest.TestCase):
+    def _graph(self, pool, *geometry):
+        window = pool.acquire(*geometry)
+        graph = ComposableGraph(window)
+        pool.bind(graph, window)
+        return graph
+
+    def test_release_on_collect(self):
+        """Tests whether windows return to the pool with their graph."""
+        pool = WindowPool(newwin=FakeWindow)
+        graph = self._graph(pool, 1, 10, 0, 0)
+        self.assertEqual((pool.live, pool.free), (1, 0))
+
+        del graph
+        gc.collect()
+        self.assertEqual((pool.live, pool.free), (0, 1))
+
+    def test_release(self):
+        """Tests whether released windows return to the pool right away."""
+        pool = WindowPool(newwin=FakeWindow)
+        window = pool.acquire(1, 10, 0, 0)
+        pool.release(window)
+        self.assertEqual((pool.live, pool.free), (0, 1))
+        self.assertIs(pool.acquire(1, 10, 0, 0), window)
+
+    def test_reuse(self):
+        """Tests whether exact geometries are preferred when reusing."""
+        pool = WindowPool(newwin=FakeWindow)
+        graphs = [self._graph(pool, 1, 10, y, 0) for y in range(3)]
+        windows = [g.window for g in graphs]
+        del graphs
+        gc.collect()
+
+        reused = pool.acquire(1, 10, 1, 0)
+        self.assertIs(reused, windows[1])
+        self.assertEqual(reused.erased, 1)
+
+        moved = pool.acquire(1, 5, 7, 3)
+        self.assertIn(moved, windows)
+        self.assertEqual(moved.geometry, (1, 5, 7, 3))
+        self.assertEqual(pool.stats.hits, 2)
+        self.assertEqual(pool.stats.misses, 3)
+
+    def test_max_free(self):
+        """Tests whether surplus free windows are deleted."""
+        pool = WindowPool(max_free=1, newwin=FakeWindow)
+        graphs = [self._graph(pool, 1, 10, y, 0) for y in range(3)]
+        del graphs
+        gc.collect()
+        pool.acquire(1, 1, 0, 0)
+        self.assertEqual(pool.free, 0)
+        self.assertEqual(pool.stats.evictions, 2)
+
+    def test_use(self):
+        """Tests whether windows released after switching ``newwin`` are
+        not reused."""
+        pool = WindowPool(newwin=FakeWindow)
+        graph = self._graph(pool, 1, 10, 0, 0)
+        old = graph.window
+        pool.use(FakeWindow)
+        del graph
+        gc.collect()
+        self.assertIsNot(pool.acquire(1, 10, 0, 0), old)
+        self.assertEqual(pool.stats.misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()